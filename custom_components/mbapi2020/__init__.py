@@ -13,10 +13,12 @@ import aiohttp
 import voluptuous as vol
 
 from custom_components.mbapi2020.car import Car, CarAttribute, RcpOptions
+from custom_components.mbapi2020.car_capabilities import CapabilityDiscovery
+from custom_components.mbapi2020.car_snapshot import CarSnapshotStore
+from custom_components.mbapi2020.client import CAR_VALUE_GROUPS
 from custom_components.mbapi2020.const import (
     ATTR_MB_MANUFACTURER,
     CONF_ENABLE_CHINA_GCJ_02,
-    CONF_OVERWRITE_PRECONDNOW,
     DOMAIN,
     LOGGER,
     LOGIN_BASE_URI,
@@ -28,18 +30,25 @@ from custom_components.mbapi2020.coordinator import MBAPI2020DataUpdateCoordinat
 from custom_components.mbapi2020.errors import WebsocketError
 from custom_components.mbapi2020.helper import LogHelper as loghelper
 from custom_components.mbapi2020.services import setup_services
+from custom_components.mbapi2020.webapi import RESPONSE_CACHE_STORAGE_KEY, RESPONSE_CACHE_STORAGE_VERSION
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryError, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: vol.Schema({})}, extra=vol.ALLOW_EXTRA)
 
+# Seconds the setup waits for the first full update of all cars
+FULL_UPDATE_WAIT_TIMEOUT = 30
+# Features whose options Car.set_attribute marks changed per "group.option" key
+_VALUE_GROUP_NAMES = frozenset(group_name for group_name, _, _ in CAR_VALUE_GROUPS)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up MBAPI2020."""
@@ -71,6 +80,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             LOGGER.error("Authentication failed. Please reauthenticate.")
             raise ConfigEntryAuthFailed
 
+        await coordinator.client.webapi.async_load_cache()
         bff_app_config = await coordinator.client.webapi.get_config()
         masterdata = await coordinator.client.webapi.get_user_info()
         hass.async_add_executor_job(coordinator.client.write_debug_json_output, bff_app_config, "app", True)
@@ -82,6 +92,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             LOGGER.error("No masterdata found. Please check your account/credentials.")
             raise ConfigEntryNotReady("No masterdata found. Please check your account/credentials.")
 
+        fleet_requests = []
         for fleet in masterdata.get("fleets", []):
             company_id = fleet.get("companyId")
             fleet_id = fleet.get("fleetId")
@@ -90,18 +101,15 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
                 fleet.get("fleetName", "unknown fleet name"),
                 fleet.get("companyName", "unknown company"),
             )
-            fleet_info = await coordinator.client.webapi.get_fleet_info(company_id, fleet_id)
-            hass.async_add_executor_job(
-                coordinator.client.write_debug_json_output,
-                fleet_info,
-                f"fleet_{company_id}_{fleet_id}",
-                True,
-            )
+            fleet_requests.append(_async_get_fleet_info(hass, coordinator, company_id, fleet_id))
 
             vehicles.extend(fleet.get("bookedVehicles", []))
 
+        await asyncio.gather(*fleet_requests)
+
         vehicles.extend(masterdata.get("assignedVehicles", []))
 
+        car_masterdata: dict[str, dict[str, Any]] = {}
         for car in vehicles:
             # Check if the car has a separate VIN key, if not, use the FIN.
             vin = car.get("vin")
@@ -116,58 +124,15 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             if vin in config_entry.options.get("excluded_cars", ""):
                 continue
 
-            features: dict[str, bool] = {}
-            vehicle_information: dict = {}
+            car_masterdata[vin] = car
 
-            try:
-                car_capabilities = await coordinator.client.webapi.get_car_capabilities(vin)
-                hass.async_add_executor_job(
-                    coordinator.client.write_debug_json_output,
-                    car_capabilities,
-                    f"cai-{loghelper.Mask_VIN(vin)}-",
-                    True,
-                )
-                if car_capabilities and "features" in car_capabilities:
-                    features.update(car_capabilities["features"])
-                if car_capabilities and "vehicle" in car_capabilities:
-                    vehicle_information = car_capabilities["vehicle"]
-            except aiohttp.ClientError:
-                # For some cars a HTTP401 is raised when asking for capabilities, see github issue #83
-                LOGGER.info(
-                    "Car Capabilities not available for the car with VIN %s.",
-                    loghelper.Mask_VIN(vin),
-                )
+        capability_discovery = CapabilityDiscovery(hass, coordinator.client, config_entry)
+        car_capabilities = await capability_discovery.async_get(car_masterdata)
 
-            try:
-                capabilities = await coordinator.client.webapi.get_car_capabilities_commands(vin)
-                hass.async_add_executor_job(
-                    coordinator.client.write_debug_json_output,
-                    capabilities,
-                    f"ca-{loghelper.Mask_VIN(vin)}-",
-                    True,
-                )
-                if capabilities:
-                    for feature in capabilities.get("commands"):
-                        features[feature.get("commandName")] = bool(feature.get("isAvailable"))
-                        if feature.get("commandName", "") == "ZEV_PRECONDITION_CONFIGURE_SEATS":
-                            capabilityInformation = feature.get("capabilityInformation", None)
-                            if capabilityInformation and len(capabilityInformation) > 0:
-                                features[feature.get("capabilityInformation")[0]] = bool(feature.get("isAvailable"))
-                        if feature.get("commandName", "") == "CHARGE_PROGRAM_CONFIGURE":
-                            max_soc_found = False
-                            parameters = feature.get("parameters", [])
-                            if parameters is not None:
-                                for parameter in parameters:
-                                    if parameter.get("parameterName", "") == "MAX_SOC":
-                                        max_soc_found = True
-                            features["CHARGE_PROGRAM_CONFIGURE"] = max_soc_found
-            except aiohttp.ClientError:
-                # For some cars a HTTP401 is raised when asking for capabilities, see github issue #83
-                # We just ignore the capabilities
-                LOGGER.info(
-                    "Command Capabilities not available for the car with VIN %s. Make sure you disable the capability check in the option of this component.",
-                    loghelper.Mask_VIN(vin),
-                )
+        for vin, car in car_masterdata.items():
+            features = car_capabilities[vin].features
+            vehicle_information = car_capabilities[vin].vehicle_information
+            capabilities = car_capabilities[vin].capabilities
 
             rcp_options = RcpOptions()
             rcp_supported = False  # await coordinator.client.webapi.is_car_rcp_supported(vin)
@@ -226,14 +191,13 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             current_car.last_message_received = int(round(time.time() * 1000))
             current_car.is_owner = car.get("isOwner")
 
-            if config_entry.options.get(CONF_OVERWRITE_PRECONDNOW, False):
-                current_car.features["precondNow"] = True
-
             coordinator.client.cars[vin] = current_car
             # await coordinator.client.update_poll_states(vin)
 
             LOGGER.debug("Init - car added - %s", loghelper.Mask_VIN(current_car.finorvin))
 
+        restored_vins = await coordinator.snapshot.async_restore(coordinator.client.cars)
+
         await coordinator.async_config_entry_first_refresh()
 
         if len(coordinator.client.cars) == 0:
@@ -241,6 +205,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             raise ConfigEntryError("No cars found. Please check your account/credentials or excluded VINs.")
 
         hass.loop.create_task(coordinator.ws_connect())
+        capability_discovery.async_refresh_stale(coordinator.client.cars)
 
     except aiohttp.ClientError as err:
         LOGGER.warning("Can't connect to MB APIs; Retrying in background: %s", err)
@@ -249,28 +214,50 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         LOGGER.error("Websocket error: %s", err)
         raise ConfigEntryNotReady from err
 
-    retry_counter: int = 0
-    while not coordinator.entry_setup_complete:
-        # async websocket data load not complete, wait 0.5 seconds or break up after 60 checks (30sec)
-        if retry_counter == 60 and coordinator.client.websocket.account_blocked:
-            for vin in coordinator.client.cars:
-                await coordinator.client.update_poll_states(vin)
+    coordinator.snapshot.async_start(coordinator.client.cars)
+
+    if restored_vins and restored_vins.issuperset(coordinator.client.cars):
+        # Platforms load from the snapshot, the first live full update of each car reconciles the values
+        LOGGER.info("Car state restored from the last run - start sensor creation")
+        await coordinator.on_dataload_complete()
+        return True
+
+    try:
+        async with asyncio.timeout(FULL_UPDATE_WAIT_TIMEOUT):
+            await coordinator.dataload_complete.wait()
+    except TimeoutError:
+        for vin in coordinator.client.cars:
+            await coordinator.client.update_poll_states(vin)
+        if coordinator.client.websocket.account_blocked:
             LOGGER.warning("Account is blocked. Reload will happen after unblock at midnight (GMT).")
-            break
-        if retry_counter == 60 and not coordinator.client.account_blocked:
-            for vin in coordinator.client.cars:
-                await coordinator.client.update_poll_states(vin)
+        else:
             LOGGER.warning(
                 "No full_update set received via websocket for some/all cars. Not all sensors may be available. Missing sensors will be created after the data will be available."
             )
-            break
-
-        await asyncio.sleep(0.5)
-        retry_counter += 1
 
     return True
 
 
+async def _async_get_fleet_info(
+    hass: HomeAssistant, coordinator: MBAPI2020DataUpdateCoordinator, company_id: str, fleet_id: str
+) -> None:
+    fleet_info = await coordinator.client.webapi.get_fleet_info(company_id, fleet_id)
+    hass.async_add_executor_job(
+        coordinator.client.write_debug_json_output,
+        fleet_info,
+        f"fleet_{company_id}_{fleet_id}",
+        True,
+    )
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Delete the car snapshot, the capability cache and the response cache of a removed config entry."""
+    await CarSnapshotStore(hass, config_entry.entry_id).async_remove()
+    await CapabilityDiscovery(hass, None, config_entry).async_remove()
+    response_cache_key = RESPONSE_CACHE_STORAGE_KEY.format(config_entry.entry_id)
+    await Store(hass, RESPONSE_CACHE_STORAGE_VERSION, response_cache_key).async_remove()
+
+
 async def config_entry_update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Update listener, called when the config entry options are changed."""
     LOGGER.debug("Start config_entry_update async_reload")
@@ -283,6 +270,9 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     unload_ok = False
 
     if len(hass.data[DOMAIN][config_entry.entry_id].client.cars) > 0:
+        hass.data[DOMAIN][config_entry.entry_id].client.cancel_pending_publishes()
+        await hass.data[DOMAIN][config_entry.entry_id].snapshot.async_stop()
+
         # Cancel all watchdogs on final shutdown
         websocket = hass.data[DOMAIN][config_entry.entry_id].client.websocket
         # Mark instance as unloaded so any in-flight shutdown task does not re-arm the
@@ -517,6 +507,19 @@ class MercedesMeEntity(CoordinatorEntity[MBAPI2020DataUpdateCoordinator], Entity
 
         return None
 
+    def _update_listener_attributes(self) -> set[str] | None:
+        """Return the "group.option" keys this entity reads, None if it has to follow every update."""
+        if isinstance(self._sensor_config, EntityDescription) or not self._feature_name or not self._object_name:
+            return None
+
+        attributes = {f"{self._feature_name}.{self._object_name}"}
+        for attrib in self._attributes or ():
+            attributes.add(attrib if "." in attrib else f"{self._feature_name}.{attrib}")
+        # Only value group options are marked changed, entities reading anything else follow every update
+        if any(attribute.partition(".")[0] not in _VALUE_GROUP_NAMES for attribute in attributes):
+            return None
+        return attributes
+
     def pushdata_update_callback(self):
         """Schedule a state update."""
         self.update()
@@ -533,7 +536,7 @@ class MercedesMeEntity(CoordinatorEntity[MBAPI2020DataUpdateCoordinator], Entity
         """
         await super().async_added_to_hass()
         if not self._attr_should_poll:
-            self._car.add_update_listener(self.pushdata_update_callback)
+            self._car.add_update_listener(self.pushdata_update_callback, self._update_listener_attributes())
 
         self.async_schedule_update_ha_state(True)
         self._handle_coordinator_update()
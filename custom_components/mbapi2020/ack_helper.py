@@ -0,0 +1,84 @@
+"""Acknowledge ack-only push messages straight from the wire bytes."""
+
+from __future__ import annotations
+
+from .proto import client_pb2, vehicle_events_pb2
+from .proto_diag import _decode_varint, _skip_field
+
+# PushMessage members that carry nothing but a sequence number to acknowledge,
+# mapped to the ClientMessage member used to ack them (same pairs as Client.on_data).
+_ACK_ONLY_MESSAGES = {
+    "service_status_updates": "acknowledge_service_status_update",
+    "user_data_update": "acknowledge_user_data_update",
+    "user_picture_update": "acknowledge_user_picture_update",
+    "user_pin_update": "acknowledge_user_pin_update",
+    "vehicle_updated": "acknowledge_vehicle_updated",
+    "preferred_dealer_change": "acknowledge_preferred_dealer_change",
+    "data_change_event": "acknowledge_data_change_event",
+}
+
+_PUSH_MESSAGE_DESCRIPTOR = vehicle_events_pb2.PushMessage.DESCRIPTOR
+_MSG_ONEOF_NUMBERS = frozenset(field.number for field in _PUSH_MESSAGE_DESCRIPTOR.oneofs_by_name["msg"].fields)
+
+
+def _build_ack_only_fields() -> dict[int, tuple[str, str, int]]:
+    fields = {}
+    for msg_type, ack_field in _ACK_ONLY_MESSAGES.items():
+        field = _PUSH_MESSAGE_DESCRIPTOR.fields_by_name[msg_type]
+        sequence_field = field.message_type.fields_by_name["sequence_number"]
+        fields[field.number] = (msg_type, ack_field, sequence_field.number)
+    return fields
+
+
+# PushMessage field number -> (msg_type, ack member, sequence_number field number)
+_ACK_ONLY_FIELDS = _build_ack_only_fields()
+
+
+def _read_sequence_number(raw: bytes, pos: int, end: int, field_number: int) -> int:
+    sequence_number = 0
+    while pos < end:
+        tag, pos = _decode_varint(raw, pos)
+        if tag == field_number << 3:
+            sequence_number, pos = _decode_varint(raw, pos)
+        else:
+            pos = _skip_field(raw, pos, tag & 0x7)
+    if pos != end:
+        raise ValueError("truncated message")
+    # int32 values are sign-extended to 64 bit on the wire
+    sequence_number &= 0xFFFFFFFF
+    return sequence_number - (1 << 32) if sequence_number >= 1 << 31 else sequence_number
+
+
+def scan_ack_only(raw: bytes) -> tuple[str, str, int] | None:
+    """Return (msg_type, ack member, sequence_number) if raw is an ack-only PushMessage, else None."""
+    msg_field: tuple[int, int, int] | None = None
+    pos = 0
+    end = len(raw)
+    try:
+        while pos < end:
+            tag, pos = _decode_varint(raw, pos)
+            field_number = tag >> 3
+            wire_type = tag & 0x7
+            if field_number in _MSG_ONEOF_NUMBERS and wire_type == 2:
+                length, pos = _decode_varint(raw, pos)
+                # The last oneof member on the wire wins, as in ParseFromString
+                msg_field = (field_number, pos, pos + length)
+                pos += length
+            else:
+                pos = _skip_field(raw, pos, wire_type)
+        if pos != end or msg_field is None or msg_field[0] not in _ACK_ONLY_FIELDS:
+            return None
+
+        msg_type, ack_field, sequence_field_number = _ACK_ONLY_FIELDS[msg_field[0]]
+        sequence_number = _read_sequence_number(raw, msg_field[1], msg_field[2], sequence_field_number)
+    except ValueError:
+        return None
+
+    return msg_type, ack_field, sequence_number
+
+
+def build_ack(ack_field: str, sequence_number: int) -> client_pb2.ClientMessage:
+    """Return the ClientMessage acknowledging sequence_number with the given ack member."""
+    ack_command = client_pb2.ClientMessage()
+    getattr(ack_command, ack_field).sequence_number = sequence_number
+    return ack_command
@@ -0,0 +1,137 @@
+"""Fixed-size in-memory history of numeric car attributes."""
+
+from __future__ import annotations
+
+from array import array
+import time
+from typing import Any
+
+# "group.option" keys of the recorded attributes
+HISTORY_ATTRIBUTES = (
+    "electric.soc",
+    "electric.rangeelectric",
+    "electric.chargingPower",
+    "odometer.odo",
+    "odometer.rangeliquid",
+    "odometer.tanklevelpercent",
+    "location.positionLat",
+    "location.positionLong",
+)
+
+# A sample is a timestamp and a value, both stored as C doubles
+_DOUBLE_BYTES = array("d").itemsize
+_SAMPLE_BYTES = 2 * _DOUBLE_BYTES
+_MIN_CAPACITY = 2
+# Timestamps above this are milliseconds
+_MILLISECONDS_FROM = 1e11
+
+
+class _Ring:
+    """Ring buffer of (timestamp, value) samples in two preallocated double arrays."""
+
+    __slots__ = ("_next", "count", "times", "values")
+
+    def __init__(self, capacity: int) -> None:
+        self.times = array("d", bytes(capacity * _DOUBLE_BYTES))
+        self.values = array("d", bytes(capacity * _DOUBLE_BYTES))
+        self._next = 0
+        self.count = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        self.times[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+    def samples(self, since: float) -> list[tuple[float, float]]:
+        """Return the samples at or after since, oldest first."""
+        capacity = len(self.times)
+        first = (self._next - self.count) % capacity
+        selected = []
+        for offset in range(self.count):
+            index = (first + offset) % capacity
+            if self.times[index] >= since:
+                selected.append((self.times[index], self.values[index]))
+        return selected
+
+    def last(self) -> tuple[float, float] | None:
+        if not self.count:
+            return None
+        index = (self._next - 1) % len(self.times)
+        return self.times[index], self.values[index]
+
+
+class AttributeHistory:
+    """Recent values of the HISTORY_ATTRIBUTES of one car, within a memory limit.
+
+    The limit is split evenly between the attributes, every attribute keeps its newest samples.
+    """
+
+    def __init__(self, max_bytes: int, attributes: tuple[str, ...] = HISTORY_ATTRIBUTES) -> None:
+        """Initialize the empty buffers."""
+        self.capacity = max(_MIN_CAPACITY, max_bytes // (_SAMPLE_BYTES * len(attributes)))
+        self._attributes = frozenset(attributes)
+        self._rings: dict[str, _Ring] = {}
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if the "group.option" key is recorded."""
+        return key in self._attributes
+
+    def add(self, key: str, value: Any, timestamp: Any = None) -> bool:
+        """Record a value of the "group.option" key, return False if it is not numeric."""
+        if key not in self._attributes or isinstance(value, bool):
+            return False
+        try:
+            number = float(value)
+            stamp = float(timestamp) if timestamp else 0.0
+        except (TypeError, ValueError):
+            return False
+        if stamp <= 0:
+            stamp = time.time()
+        elif stamp >= _MILLISECONDS_FROM:
+            stamp /= 1000
+
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = _Ring(self.capacity)
+        ring.add(stamp, number)
+        return True
+
+    def stats(self, key: str, window: float, now: float | None = None) -> dict[str, Any]:
+        """Return count, min, max, mean and the rate of change per hour of key over the last window seconds."""
+        ring = self._rings.get(key)
+        last = ring.last() if ring else None
+        result: dict[str, Any] = {
+            "attribute": key,
+            "window": window,
+            "count": 0,
+            "last": last[1] if last else None,
+            "last_timestamp": last[0] if last else None,
+        }
+        if ring is None:
+            return result
+
+        samples = ring.samples((now if now is not None else time.time()) - window)
+        if not samples:
+            return result
+
+        values = [value for _, value in samples]
+        span = samples[-1][0] - samples[0][0]
+        result.update(
+            {
+                "count": len(samples),
+                "min": min(values),
+                "max": max(values),
+                "mean": sum(values) / len(values),
+                "rate_per_hour": (values[-1] - values[0]) / span * 3600 if span > 0 else 0.0,
+            }
+        )
+        return result
+
+    def usage(self) -> dict[str, Any]:
+        """Return the buffer capacity, the samples held per attribute and the bytes allocated."""
+        return {
+            "capacity": self.capacity,
+            "samples": {key: ring.count for key, ring in sorted(self._rings.items())},
+            "bytes": len(self._rings) * self.capacity * _SAMPLE_BYTES,
+        }
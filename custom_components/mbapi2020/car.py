@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import collections
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from .attribute_history import AttributeHistory
+
 ODOMETER_OPTIONS = [
     "odo",
     "distanceReset",
@@ -208,8 +211,13 @@ CarAlarm_OPTIONS = [
     "exteriorProtectionSensorStatus",
 ]
 
+RCP_OPTIONS = ["rcp_supported", "rcp_supported_settings"]
+
 GeofenceEvents_OPTIONS = ["last_event_zone", "last_event_timestamp", "last_event_type"]
 
+# Message attributes the option handlers fall back to when a partial update lacks them
+FULL_UPDATE_SNAPSHOT_ATTRIBUTES = ("chargePrograms", "endofChargeTimeWeekday", "endofchargetime")
+
 
 class Car:
     """Car class, stores the car values at runtime."""
@@ -223,6 +231,8 @@ class Car:
         self.licenseplate = ""
         self._is_owner = False
         self.messages_received = collections.Counter(f=0, p=0)
+        # Attribute values not stored: older than the stored one, or unchanged
+        self.attribute_writes_skipped = collections.Counter(stale=0, unchanged=0)
         self._last_message_received = 0
         self._last_command_type = ""
         self._last_command_state = ""
@@ -242,13 +252,15 @@ class Car:
         self.precond = None
         self.electric = None
         self.caralarm = None
-        self.last_full_message = None
+        self.full_update_snapshot: dict[str, Any] | None = None
+        self.attribute_history: AttributeHistory | None = None
         self.geofence_events = GeofenceEvents()
         self.features = {}
         self.masterdata: dict[str, Any] = {}
         self.app_configuration: dict[str, Any] = {}
         self.entry_setup_complete = False
-        self._update_listeners = set()
+        self._update_listeners: dict[Callable[[], None], frozenset[str] | None] = {}
+        self._published_version: int = 0
         self.sensors: set[str] = set()
         self.baumuster_description: str = ""
         self.features: dict[str, bool]
@@ -257,6 +269,8 @@ class Car:
         self.has_geofencing: bool = True
         self._data_collection_mode: str = "push"
         self._data_collection_mode_ts: float = 0
+        self._version: int = 0
+        self._attribute_versions: dict[str, int] = {}
 
     @property
     def is_owner(self):
@@ -277,13 +291,23 @@ class Car:
         """Get number of received partial updates messages."""
         return CarAttribute(self.messages_received["p"], "VALID", None)
 
+    @property
+    def stale_attributes_dropped(self):
+        """Get number of attribute values dropped for being older than the stored value."""
+        return CarAttribute(self.attribute_writes_skipped["stale"], "VALID", None)
+
+    @property
+    def unchanged_attributes_skipped(self):
+        """Get number of attribute values skipped for being unchanged."""
+        return CarAttribute(self.attribute_writes_skipped["unchanged"], "VALID", None)
+
     @property
     def last_message_received(self):
         """Get/Set last message received."""
         if self._last_message_received > 0:
             return CarAttribute(datetime.fromtimestamp(int(round(self._last_message_received / 1000))), "VALID", None)
 
-        return CarAttribute(None, "NOT_RECEIVED", None)
+        return _MESSAGE_NOT_RECEIVED
 
     @last_message_received.setter
     def last_message_received(self, value):
@@ -335,13 +359,45 @@ class Car:
     def last_command_error_message(self, value):
         self._last_command_error_message = value
 
-    def add_update_listener(self, listener):
-        """Add a listener for update notifications."""
-        self._update_listeners.add(listener)
+    @property
+    def version(self) -> int:
+        """Get the change version, raised each time a value group attribute changes."""
+        return self._version
+
+    def set_attribute(self, group_name: str, group, option: str, attribute: CarAttribute) -> bool:
+        """Store an attribute in a value group and record a new version if its state changed."""
+        current = getattr(group, option, None)
+        # Unchanged attributes keep their stored object, identity is the cheapest change check
+        if current is attribute or (isinstance(current, CarAttribute) and current.same_state(attribute)):
+            return False
+
+        setattr(group, option, attribute)
+        self._version += 1
+        self._attribute_versions[f"{group_name}.{option}"] = self._version
+        return True
+
+    def store_full_update(self, car_data: dict[str, Any]) -> None:
+        """Keep the FULL_UPDATE_SNAPSHOT_ATTRIBUTES of a full update, None until the first one."""
+        attributes = car_data.get("attributes") or {}
+        self.full_update_snapshot = {
+            name: attributes[name] for name in FULL_UPDATE_SNAPSHOT_ATTRIBUTES if name in attributes
+        }
+
+    def changed_since(self, version: int) -> set[str]:
+        """Return the "group.option" keys of all attributes changed after the given version."""
+        return {key for key, changed_in in self._attribute_versions.items() if changed_in > version}
+
+    def add_update_listener(self, listener, attributes: Iterable[str] | None = None):
+        """Add a listener for update notifications.
+
+        With attributes ("group.option" keys) the listener is only called when one of them changed,
+        without it is called on every update.
+        """
+        self._update_listeners[listener] = frozenset(attributes) if attributes is not None else None
 
     def remove_update_callback(self, listener):
         """Remove a listener for update notifications."""
-        self._update_listeners.discard(listener)
+        self._update_listeners.pop(listener, None)
 
     def add_sensor(self, unique_id: str):
         """Add a sensor to the car."""
@@ -354,129 +410,199 @@ class Car:
             self.sensors.remove(unique_id)
 
     def publish_updates(self):
-        """Schedule call all registered callbacks."""
-        for callback in self._update_listeners:
-            callback()
+        """Call the registered callbacks interested in the attributes changed since the last publish."""
+        changed = self.changed_since(self._published_version)
+        self._published_version = self._version
+        for callback, attributes in list(self._update_listeners.items()):
+            if attributes is None or not attributes.isdisjoint(changed):
+                callback()
 
     def check_capabilities(self, required_capabilities: list[str]) -> bool:
         """Check if the car has the required capabilities."""
         return any(self.features.get(capability) is True for capability in required_capabilities)
 
 
-@dataclass(init=False)
-class Tires:
+class _ValueGroup:
+    """Base of the value groups: one slot per option, options not received yet stay unset."""
+
+    __slots__ = ()
+    name: str = ""
+
+    def __repr__(self) -> str:
+        """Return the set options."""
+        values = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__ if hasattr(self, slot))
+        return f"{type(self).__name__}({values})"
+
+
+class Tires(_ValueGroup):
     """Stores the Tires values at runtime."""
 
-    name: str = "Tires"
+    __slots__ = tuple(TIRE_OPTIONS)
+    name = "Tires"
 
 
-@dataclass(init=False)
-class Wipers:
+class Wipers(_ValueGroup):
     """Stores the Wiper values at runtime."""
 
-    name: str = "Wipers"
+    __slots__ = tuple(WIPER_OPTIONS)
+    name = "Wipers"
 
 
-@dataclass(init=False)
-class Odometer:
+class Odometer(_ValueGroup):
     """Stores the Odometer values at runtime."""
 
-    name: str = "Odometer"
+    __slots__ = tuple(ODOMETER_OPTIONS)
+    name = "Odometer"
 
 
-@dataclass(init=False)
-class RcpOptions:
+class RcpOptions(_ValueGroup):
     """Stores the RcpOptions values at runtime."""
 
-    name: str = "RCP_Options"
+    __slots__ = tuple(RCP_OPTIONS)
+    name = "RCP_Options"
 
 
-@dataclass(init=False)
-class Windows:
+class Windows(_ValueGroup):
     """Stores the Windows values at runtime."""
 
-    name: str = "Windows"
+    __slots__ = tuple(WINDOW_OPTIONS)
+    name = "Windows"
 
 
-@dataclass(init=False)
-class Doors:
+class Doors(_ValueGroup):
     """Stores the Doors values at runtime."""
 
-    name: str = "Doors"
+    __slots__ = tuple(DOOR_OPTIONS)
+    name = "Doors"
 
 
-@dataclass(init=False)
-class Electric:
+class Electric(_ValueGroup):
     """Stores the Electric values at runtime."""
 
-    name: str = "Electric"
+    __slots__ = tuple(ELECTRIC_OPTIONS)
+    name = "Electric"
 
 
-@dataclass(init=False)
-class Auxheat:
+class Auxheat(_ValueGroup):
     """Stores the Auxheat values at runtime."""
 
-    name: str = "Auxheat"
+    __slots__ = tuple(AUX_HEAT_OPTIONS)
+    name = "Auxheat"
 
 
-@dataclass(init=False)
-class Precond:
+class Precond(_ValueGroup):
     """Stores the Precondining values at runtime."""
 
-    name: str = "Precond"
+    __slots__ = tuple(PRE_COND_OPTIONS)
+    name = "Precond"
 
 
-@dataclass(init=False)
-class BinarySensors:
+class BinarySensors(_ValueGroup):
     """Stores the BinarySensors values at runtime."""
 
-    name: str = "BinarySensors"
+    __slots__ = tuple(BINARY_SENSOR_OPTIONS)
+    name = "BinarySensors"
 
 
-@dataclass(init=False)
-class RemoteStart:
+class RemoteStart(_ValueGroup):
     """Stores the RemoteStart values at runtime."""
 
-    name: str = "RemoteStart"
+    __slots__ = tuple(RemoteStart_OPTIONS)
+    name = "RemoteStart"
 
 
-@dataclass(init=False)
-class CarAlarm:
+class CarAlarm(_ValueGroup):
     """Stores the CarAlarm values at runtime."""
 
-    name: str = "CarAlarm"
+    __slots__ = tuple(CarAlarm_OPTIONS)
+    name = "CarAlarm"
 
 
-@dataclass(init=False)
-class Location:
+class Location(_ValueGroup):
     """Stores the Location values at runtime."""
 
-    name: str = "Location"
+    __slots__ = tuple(LOCATION_OPTIONS)
+    name = "Location"
 
 
-@dataclass(init=False)
-class GeofenceEvents:
+class GeofenceEvents(_ValueGroup):
     """Stores the geofence violation values at runtime."""
 
-    last_event_type: CarAttribute | None = None
-    last_event_timestamp: CarAttribute | None = None
-    last_event_zone: CarAttribute | None = None
-    name: str = "GeofenceEvents"
+    __slots__ = tuple(GeofenceEvents_OPTIONS)
+    name = "GeofenceEvents"
 
-    def __post_init__(self):
-        """Initialize mutable attributes."""
-        self.events = []
+    def __init__(self) -> None:
+        """Initialize the events as not received."""
+        self.last_event_type: CarAttribute | None = None
+        self.last_event_timestamp: CarAttribute | None = None
+        self.last_event_zone: CarAttribute | None = None
 
 
-@dataclass(init=False)
+@dataclass(slots=True)
 class CarAttribute:
     """Stores the CarAttribute values at runtime."""
 
-    def __init__(self, value, retrievalstatus, timestamp, display_value=None, unit=None, sensor_created=False):
-        """Initialize the instance."""
-        self.value = value
-        self.retrievalstatus = retrievalstatus
-        self.timestamp = timestamp
-        self.display_value = display_value
-        self.unit = unit
-        self.sensor_created = sensor_created
+    value: Any
+    retrievalstatus: Any
+    timestamp: Any
+    display_value: Any = None
+    unit: str | None = None
+    sensor_created: bool = False
+
+    def same_state(self, other: CarAttribute) -> bool:
+        """Return True if other holds the same value, status, timestamp, display value and unit."""
+        return (
+            self.value == other.value
+            and self.retrievalstatus == other.retrievalstatus
+            and self.timestamp == other.timestamp
+            and self.display_value == other.display_value
+            and self.unit == other.unit
+        )
+
+
+class _SharedCarAttribute(CarAttribute):
+    """Read-only CarAttribute for placeholder states shared by all cars."""
+
+    __slots__ = ()
+
+    def __init__(self, value, retrievalstatus, timestamp, display_value=None, unit=None) -> None:
+        """Initialize the instance, later assignments raise."""
+        for name, field_value in (
+            ("value", value),
+            ("retrievalstatus", retrievalstatus),
+            ("timestamp", timestamp),
+            ("display_value", display_value),
+            ("unit", unit),
+            ("sensor_created", False),
+        ):
+            object.__setattr__(self, name, field_value)
+
+    def __setattr__(self, name: str, value) -> None:
+        """Refuse changes, the instance is shared."""
+        raise AttributeError(f"{name} of a shared CarAttribute is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse changes, the instance is shared."""
+        raise AttributeError(f"{name} of a shared CarAttribute is read-only")
+
+
+# Placeholders for options a full update does not carry (retrievalstatus 4: not received)
+ATTRIBUTE_NOT_RECEIVED = _SharedCarAttribute(0, 4, 0)
+ATTRIBUTE_NOT_RECEIVED_FALSE = _SharedCarAttribute(False, 4, 0)
+_MESSAGE_NOT_RECEIVED = _SharedCarAttribute(None, "NOT_RECEIVED", None)
+
+
+def reuse_attribute(
+    current: CarAttribute | None, value, retrievalstatus, timestamp, display_value=None, unit=None
+) -> CarAttribute:
+    """Return current if it already holds this state, else a new CarAttribute."""
+    if (
+        current is not None
+        and current.value == value
+        and current.retrievalstatus == retrievalstatus
+        and current.timestamp == timestamp
+        and current.display_value == display_value
+        and current.unit == unit
+    ):
+        return current
+    return CarAttribute(value, retrievalstatus, timestamp, display_value, unit)
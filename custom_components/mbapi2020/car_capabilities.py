@@ -0,0 +1,204 @@
+"""Concurrent discovery of the car capabilities, cached across restarts."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_OVERWRITE_PRECONDNOW, DOMAIN
+from .helper import LogHelper as loghelper
+
+if TYPE_CHECKING:
+    from .car import Car
+    from .client import Client
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.car_capabilities.{{}}"
+# Age from which cached capabilities are used for the setup but refreshed in the background
+CACHE_TTL = timedelta(hours=24)
+# Cars whose capabilities are requested at the same time
+FETCH_CONCURRENCY = 4
+
+
+@dataclass(slots=True)
+class CarCapabilities:
+    """Features, vehicle information and command capabilities of a car."""
+
+    features: dict[str, bool] = field(default_factory=dict)
+    vehicle_information: dict[str, Any] = field(default_factory=dict)
+    capabilities: dict[str, Any] | None = None
+
+
+def masterdata_fingerprint(masterdata: dict[str, Any]) -> str:
+    """Return a hash of the masterdata of a car, cached capabilities of other masterdata are not used."""
+    return hashlib.sha256(json.dumps(masterdata, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CapabilityDiscovery:
+    """Get the capabilities of the cars of a config entry from the cache or the REST API.
+
+    Cars without a cached entry for their masterdata are requested concurrently during the setup,
+    cached entries older than CACHE_TTL are used and refreshed in the background afterwards.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: Client, config_entry: ConfigEntry) -> None:
+        """Initialize the discovery of the config entry."""
+        self._hass = hass
+        self._client = client
+        self._overwrite_precondnow: bool = config_entry.options.get(CONF_OVERWRITE_PRECONDNOW, False)
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(config_entry.entry_id), private=True
+        )
+        self._semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        self._cache: dict[str, dict[str, Any]] = {}
+        self._stale: dict[str, str] = {}
+
+    async def async_get(self, masterdata: dict[str, dict[str, Any]]) -> dict[str, CarCapabilities]:
+        """Return the capabilities of every VIN in masterdata."""
+        try:
+            self._cache = (await self._store.async_load() or {}).get("cars", {})
+        except Exception as err:  # noqa: BLE001
+            LOGGER.warning("Capability cache could not be loaded: %s", err)
+            self._cache = {}
+
+        result: dict[str, CarCapabilities] = {}
+        missing: dict[str, str] = {}
+        now = time.time()
+        for vin, car_masterdata in masterdata.items():
+            fingerprint = masterdata_fingerprint(car_masterdata)
+            cached = self._cache.get(vin)
+            if cached is None or cached.get("fingerprint") != fingerprint:
+                missing[vin] = fingerprint
+                continue
+            result[vin] = CarCapabilities(**copy.deepcopy(cached["data"]))
+            if now - cached.get("fetched_at", 0) > CACHE_TTL.total_seconds():
+                self._stale[vin] = fingerprint
+
+        if missing:
+            LOGGER.debug("Requesting capabilities of %s car(s), %s from cache", len(missing), len(result))
+            fetched = await self._async_fetch_all(missing)
+            result.update({vin: capabilities for vin, (capabilities, _) in fetched.items()})
+        # Drop the entries of removed or excluded cars
+        self._cache = {vin: entry for vin, entry in self._cache.items() if vin in masterdata}
+        await self._store.async_save({"cars": self._cache})
+
+        for capabilities in result.values():
+            if self._overwrite_precondnow:
+                capabilities.features["precondNow"] = True
+        return result
+
+    def async_refresh_stale(self, cars: dict[str, Car]) -> None:
+        """Request the capabilities of the cars with outdated cache entries in the background."""
+        if self._stale:
+            self._hass.async_create_background_task(
+                self._async_refresh(cars, self._stale), f"{DOMAIN} capability refresh"
+            )
+            self._stale = {}
+
+    async def async_remove(self) -> None:
+        """Delete the cached capabilities."""
+        await self._store.async_remove()
+
+    async def _async_refresh(self, cars: dict[str, Car], stale: dict[str, str]) -> None:
+        fetched = await self._async_fetch_all(stale)
+        refreshed = 0
+        for vin, (capabilities, complete) in fetched.items():
+            # A failed request keeps the cached capabilities of the car
+            if not complete or (car := cars.get(vin)) is None:
+                continue
+            if self._overwrite_precondnow:
+                capabilities.features["precondNow"] = True
+            car.features = capabilities.features
+            car.vehicle_information = capabilities.vehicle_information
+            car.capabilities = capabilities.capabilities
+            refreshed += 1
+        await self._store.async_save({"cars": self._cache})
+        LOGGER.debug("Capabilities of %s of %s car(s) refreshed", refreshed, len(fetched))
+
+    async def _async_fetch_all(self, fingerprints: dict[str, str]) -> dict[str, tuple[CarCapabilities, bool]]:
+        vins = list(fingerprints)
+        results = await asyncio.gather(*(self._async_fetch(vin, fingerprints[vin]) for vin in vins))
+        return dict(zip(vins, results, strict=True))
+
+    async def _async_fetch(self, vin: str, fingerprint: str) -> tuple[CarCapabilities, bool]:
+        """Return the capabilities of vin and if both requests succeeded."""
+        async with self._semaphore:
+            result = CarCapabilities()
+            complete = True
+
+            try:
+                car_capabilities = await self._client.webapi.get_car_capabilities(vin)
+                self._hass.async_add_executor_job(
+                    self._client.write_debug_json_output,
+                    car_capabilities,
+                    f"cai-{loghelper.Mask_VIN(vin)}-",
+                    True,
+                )
+                if car_capabilities and "features" in car_capabilities:
+                    result.features.update(car_capabilities["features"])
+                if car_capabilities and "vehicle" in car_capabilities:
+                    result.vehicle_information = car_capabilities["vehicle"]
+            except aiohttp.ClientError:
+                # For some cars a HTTP401 is raised when asking for capabilities, see github issue #83
+                LOGGER.info(
+                    "Car Capabilities not available for the car with VIN %s.",
+                    loghelper.Mask_VIN(vin),
+                )
+                complete = False
+
+            try:
+                capabilities = await self._client.webapi.get_car_capabilities_commands(vin)
+                self._hass.async_add_executor_job(
+                    self._client.write_debug_json_output,
+                    capabilities,
+                    f"ca-{loghelper.Mask_VIN(vin)}-",
+                    True,
+                )
+                result.capabilities = capabilities
+                if capabilities:
+                    _add_command_features(result.features, capabilities)
+            except aiohttp.ClientError:
+                # For some cars a HTTP401 is raised when asking for capabilities, see github issue #83
+                # We just ignore the capabilities
+                LOGGER.info(
+                    "Command Capabilities not available for the car with VIN %s. Make sure you disable the capability check in the option of this component.",
+                    loghelper.Mask_VIN(vin),
+                )
+                complete = False
+
+        # Only complete answers are cached, failed requests are repeated on the next start
+        if complete:
+            self._cache[vin] = {"fingerprint": fingerprint, "fetched_at": time.time(), "data": asdict(result)}
+        return result, complete
+
+
+def _add_command_features(features: dict[str, bool], capabilities: dict[str, Any]) -> None:
+    for feature in capabilities.get("commands"):
+        features[feature.get("commandName")] = bool(feature.get("isAvailable"))
+        if feature.get("commandName", "") == "ZEV_PRECONDITION_CONFIGURE_SEATS":
+            capabilityInformation = feature.get("capabilityInformation", None)
+            if capabilityInformation and len(capabilityInformation) > 0:
+                features[feature.get("capabilityInformation")[0]] = bool(feature.get("isAvailable"))
+        if feature.get("commandName", "") == "CHARGE_PROGRAM_CONFIGURE":
+            max_soc_found = False
+            parameters = feature.get("parameters", [])
+            if parameters is not None:
+                for parameter in parameters:
+                    if parameter.get("parameterName", "") == "MAX_SOC":
+                        max_soc_found = True
+            features["CHARGE_PROGRAM_CONFIGURE"] = max_soc_found
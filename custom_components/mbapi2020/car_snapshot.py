@@ -0,0 +1,179 @@
+"""Persistent snapshot of the car state, used for a warm start after a restart."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .car import ATTRIBUTE_NOT_RECEIVED, ATTRIBUTE_NOT_RECEIVED_FALSE, Car, CarAttribute
+from .client import CAR_VALUE_GROUPS
+from .const import DOMAIN
+from .helper import LogHelper as loghelper
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.car_snapshot.{{}}"
+SAVE_INTERVAL = timedelta(minutes=15)
+
+# Car attributes stored next to the value groups
+_CAR_FIELDS = ("features", "capabilities", "vehicle_information", "masterdata", "full_update_snapshot")
+# Fields taken from the snapshot when the live REST call during setup returned nothing
+_CAR_FALLBACK_FIELDS = ("features", "capabilities", "vehicle_information")
+# Marks an encoded datetime value
+_DATETIME_KEY = "__datetime__"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_KEY in value:
+        return datetime.fromisoformat(value[_DATETIME_KEY])
+    return value
+
+
+def _encode_attribute(attribute: CarAttribute) -> list[Any]:
+    return [
+        _encode_value(attribute.value),
+        attribute.retrievalstatus,
+        attribute.timestamp,
+        attribute.display_value,
+        attribute.unit,
+    ]
+
+
+def _decode_attribute(encoded: list[Any]) -> CarAttribute:
+    value, retrievalstatus, timestamp, display_value, unit = encoded
+    if retrievalstatus == 4 and timestamp == 0 and display_value is None and unit is None:
+        if value is False:
+            return ATTRIBUTE_NOT_RECEIVED_FALSE
+        if value == 0:
+            return ATTRIBUTE_NOT_RECEIVED
+    return CarAttribute(_decode_value(value), retrievalstatus, timestamp, display_value, unit)
+
+
+def dump_car(car: Car) -> dict[str, Any]:
+    """Return the value groups and the car information of car as JSON serializable dict."""
+    groups: dict[str, dict[str, list[Any]]] = {}
+    for group_name, _, options in CAR_VALUE_GROUPS:
+        group = getattr(car, group_name)
+        if group is None:
+            continue
+        groups[group_name] = {
+            option: _encode_attribute(attribute)
+            for option in options
+            if isinstance(attribute := getattr(group, option, None), CarAttribute)
+        }
+
+    data: dict[str, Any] = {field: getattr(car, field) for field in _CAR_FIELDS}
+    data["groups"] = groups
+    return data
+
+
+def restore_car(car: Car, data: dict[str, Any]) -> None:
+    """Fill the value groups of car from a dump_car dict, keep the live car information if present."""
+    for group_name, group_class, options in CAR_VALUE_GROUPS:
+        attributes = data.get("groups", {}).get(group_name)
+        if attributes is None:
+            continue
+        group = getattr(car, group_name) or group_class()
+        for option in options:
+            if option in attributes:
+                setattr(group, option, _decode_attribute(attributes[option]))
+        setattr(car, group_name, group)
+
+    for field in _CAR_FALLBACK_FIELDS:
+        if not getattr(car, field) and data.get(field):
+            setattr(car, field, data[field])
+    if car.full_update_snapshot is None:
+        car.full_update_snapshot = data.get("full_update_snapshot")
+
+
+class CarSnapshotStore:
+    """Save the cars of a config entry to the HA storage and restore them on the next start.
+
+    The snapshot is written every SAVE_INTERVAL and on HA shutdown, the first live full update
+    overwrites the restored values.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of the config entry."""
+        self._hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id), private=True)
+        self._cars: dict[str, Car] = {}
+        self._unsub: list[Callable[[], None]] = []
+
+    async def async_restore(self, cars: dict[str, Car]) -> set[str]:
+        """Restore the stored state into cars, return the VINs of the restored cars."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            LOGGER.warning("Car snapshot could not be loaded: %s", err)
+            return set()
+
+        restored: set[str] = set()
+        for vin, data in ((stored or {}).get("cars") or {}).items():
+            car = cars.get(vin)
+            if car is None:
+                continue
+            try:
+                restore_car(car, data)
+            except (TypeError, ValueError) as err:
+                LOGGER.debug("Car snapshot of %s not restored: %s", loghelper.Mask_VIN(vin), err)
+                continue
+            restored.add(vin)
+
+        if restored:
+            LOGGER.debug("Car state restored from snapshot saved at %s", stored.get("saved_at"))
+        return restored
+
+    @callback
+    def async_start(self, cars: dict[str, Car]) -> None:
+        """Save cars every SAVE_INTERVAL and on HA shutdown."""
+        self._cars = cars
+        self._unsub.append(async_track_time_interval(self._hass, self._async_schedule_save, SAVE_INTERVAL))
+        self._unsub.append(self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_on_stop))
+
+    async def async_stop(self) -> None:
+        """Stop the periodic saves and write the snapshot now."""
+        self._async_cancel_listeners()
+        if self._cars:
+            await self._store.async_save(self._data())
+
+    async def async_remove(self) -> None:
+        """Delete the stored snapshot."""
+        await self._store.async_remove()
+
+    @callback
+    def _async_schedule_save(self, _now: datetime) -> None:
+        self._store.async_delay_save(self._data)
+
+    @callback
+    def _async_on_stop(self, _event: Event) -> None:
+        # async_listen_once has removed the listener already
+        self._unsub.pop()
+        self._async_cancel_listeners()
+        # Written with the final write of the HA storage
+        self._store.async_delay_save(self._data)
+
+    @callback
+    def _async_cancel_listeners(self) -> None:
+        while self._unsub:
+            self._unsub.pop()()
+
+    def _data(self) -> dict[str, Any]:
+        return {
+            "saved_at": datetime.now().isoformat(),
+            "cars": {vin: dump_car(car) for vin, car in self._cars.items()},
+        }
@@ -25,7 +25,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import system_info
 
+from .attribute_history import AttributeHistory
 from .car import (
+    ATTRIBUTE_NOT_RECEIVED,
+    ATTRIBUTE_NOT_RECEIVED_FALSE,
     AUX_HEAT_OPTIONS,
     BINARY_SENSOR_OPTIONS,
     DOOR_OPTIONS,
@@ -51,19 +54,35 @@ from .car import (
     Tires,
     Windows,
     Wipers,
+    reuse_attribute,
 )
 from .const import (
+    CONF_ATTRIBUTE_HISTORY_SIZE,
     CONF_DEBUG_FILE_SAVE,
     CONF_EXCLUDED_CARS,
+    CONF_EXECUTOR_DECODE_MIN_SIZE,
     CONF_FT_DISABLE_CAPABILITY_CHECK,
+    CONF_PERSIST_RESPONSE_CACHE,
     CONF_PIN,
+    CONF_PIPELINE_STATS,
+    CONF_PROTO_DIAG_SAMPLE_RATE,
+    CONF_PUSH_COALESCE_WINDOW,
+    CONF_RECEIVE_QUEUE_SIZE,
+    DEFAULT_ATTRIBUTE_HISTORY_SIZE,
     DEFAULT_CACHE_PATH,
     DEFAULT_DOWNLOAD_PATH,
+    DEFAULT_EXECUTOR_DECODE_MIN_SIZE,
+    DEFAULT_PUSH_COALESCE_WINDOW,
+    DEFAULT_RECEIVE_QUEUE_SIZE,
     DEFAULT_SOCKET_MIN_RETRY,
+    PUSH_COALESCE_MAX_DELAY,
 )
 from .helper import LogHelper as loghelper
 from .oauth import Oauth
-from .vsu_helper import normalize_vsu_car
+from .pipeline_stats import PipelineStats
+from .proto_diag import DEFAULT_SAMPLE_RATE
+from .vep_helper import decode_vep_car, decode_vep_updates
+from .vsu_helper import normalize_vsu_update
 from .webapi import WebApi
 from .websocket import Websocket
 
@@ -72,6 +91,60 @@ LOGGER = logging.getLogger(__name__)
 DEBUG_SIMULATE_PARTIAL_UPDATES_ONLY = False
 GEOFENCING_MAX_RETRIES = 1
 
+# Car attribute name, group class and option list, in the order _build_car fills them
+CAR_VALUE_GROUPS = (
+    ("odometer", Odometer, ODOMETER_OPTIONS),
+    ("tires", Tires, TIRE_OPTIONS),
+    ("wipers", Wipers, WIPER_OPTIONS),
+    ("doors", Doors, DOOR_OPTIONS),
+    ("location", Location, LOCATION_OPTIONS),
+    ("binarysensors", BinarySensors, BINARY_SENSOR_OPTIONS),
+    ("windows", Windows, WINDOW_OPTIONS),
+    ("electric", Electric, ELECTRIC_OPTIONS),
+    ("auxheat", Auxheat, AUX_HEAT_OPTIONS),
+    ("precond", Precond, PRE_COND_OPTIONS),
+    ("caralarm", CarAlarm, CarAlarm_OPTIONS),
+)
+
+# Options whose handler reads other message attributes than the option name itself
+CAR_VALUE_SOURCE_ATTRIBUTES = {
+    "max_soc": ("chargePrograms", "selectedChargeProgram"),
+    "chargeflap": ("chargeFlaps",),
+    "chargeinletcoupler": ("chargeInlets",),
+    "chargeinletlock": ("chargeInlets",),
+    "endofchargetime": ("chargingPredictionMaxSoc", "endofchargetime"),
+    "precondStatus": ("precondNow", "precondActive", "precondOperatingMode"),
+    "temperature_points_frontLeft": ("temperaturePoints",),
+    "temperature_points_frontRight": ("temperaturePoints",),
+    "temperature_points_rearLeft": ("temperaturePoints",),
+    "temperature_points_rearRight": ("temperaturePoints",),
+}
+
+
+def _build_car_value_attribute_index() -> dict[str, tuple[tuple[int, int], ...]]:
+    index: dict[str, list[tuple[int, int]]] = {}
+    for group_index, (_, _, options) in enumerate(CAR_VALUE_GROUPS):
+        for option_index, option in enumerate(options):
+            for attribute in CAR_VALUE_SOURCE_ATTRIBUTES.get(option, (option,)):
+                index.setdefault(attribute, []).append((group_index, option_index))
+    return {attribute: tuple(positions) for attribute, positions in index.items()}
+
+
+# Message attribute name -> (group index, option index) of every option it feeds
+CAR_VALUE_ATTRIBUTE_INDEX = _build_car_value_attribute_index()
+
+# Attribute timestamps from this value on are milliseconds
+_TIMESTAMP_MS_FROM = 1e11
+
+
+def _timestamp_seconds(timestamp) -> float:
+    """Return an attribute timestamp in seconds, 0 if it is missing or not a number."""
+    try:
+        value = float(timestamp or 0)
+    except (TypeError, ValueError):
+        return 0.0
+    return value / 1000 if value >= _TIMESTAMP_MS_FROM else value
+
 
 class Client:
     """define the client."""
@@ -122,6 +195,14 @@ class Client:
             app_version=self.app_version,
         )
         self.webapi.session_id = self.session_id
+        if config_entry and config_entry.options.get(CONF_PERSIST_RESPONSE_CACHE, False):
+            self.webapi.enable_cache_persistence(config_entry.entry_id)
+        self.pipeline_stats = PipelineStats(
+            enabled=bool(config_entry and config_entry.options.get(CONF_PIPELINE_STATS, False))
+        )
+        self._attribute_history_bytes = self.attribute_history_size * 1024
+        # Messages are parsed one by one while they are captured to disk
+        debug_file_save = bool(config_entry and config_entry.options.get(CONF_DEBUG_FILE_SAVE, False))
         self.websocket: Websocket = Websocket(
             hass=self._hass,
             oauth=self.oauth,
@@ -129,9 +210,35 @@ class Client:
             session_id=self.session_id,
             ignition_states=self.ignition_states,
             app_version=self.app_version,
+            executor_decode_min_size=self.executor_decode_min_size,
+            ack_only_fast_path=not debug_file_save,
+            receive_queue_size=self.receive_queue_size,
+            merge_partial_updates=self.receive_queue_size > 0 and not debug_file_save,
+            stats=self.pipeline_stats,
+            proto_diag_sample_rate=self.proto_diag_sample_rate,
         )
 
         self.cars: dict[str, Car] = {}
+        self._publish_handles: dict[str, asyncio.TimerHandle] = {}
+        self._publish_pending_since: dict[str, float] = {}
+
+        # Handlers for options that need more than the generic value extraction
+        self._option_handlers = {
+            "max_soc": self._get_car_values_handle_max_soc,
+            "chargeflap": self._get_car_values_handle_chargeflap,
+            "chargeinletcoupler": self._get_car_values_handle_chargeinletcoupler,
+            "chargeinletlock": self._get_car_values_handle_chargeinletlock,
+            "chargePrograms": self._get_car_values_handle_chargePrograms,
+            "chargingBreakClockTimer": self._get_car_values_handle_charging_break_clock_timer,
+            "chargingPowerRestriction": self._get_car_values_handle_charging_power_restriction,
+            "endofchargetime": self._get_car_values_handle_endofchargetime,
+            "ignitionstate": self._get_car_values_handle_ignitionstate,
+            "precondStatus": self._get_car_values_handle_precond_status,
+            "temperature_points_frontLeft": self._get_car_values_handle_temperature_points,
+            "temperature_points_frontRight": self._get_car_values_handle_temperature_points,
+            "temperature_points_rearLeft": self._get_car_values_handle_temperature_points,
+            "temperature_points_rearRight": self._get_car_values_handle_temperature_points,
+        }
 
     @property
     def pin(self) -> str:
@@ -149,7 +256,104 @@ class Client:
                 return self.config_entry.options.get(CONF_EXCLUDED_CARS, [])
         return []
 
-    def on_data(self, data):
+    @property
+    def push_coalesce_window(self) -> float:
+        """Return the seconds pushed updates of a car are collected before entities are notified."""
+        if self.config_entry and self.config_entry.options:
+            return float(self.config_entry.options.get(CONF_PUSH_COALESCE_WINDOW, DEFAULT_PUSH_COALESCE_WINDOW))
+        return DEFAULT_PUSH_COALESCE_WINDOW
+
+    @property
+    def proto_diag_sample_rate(self) -> float:
+        """Return the share of already known message shapes checked again for unknown proto fields."""
+        if self.config_entry and self.config_entry.options:
+            return float(self.config_entry.options.get(CONF_PROTO_DIAG_SAMPLE_RATE, DEFAULT_SAMPLE_RATE))
+        return DEFAULT_SAMPLE_RATE
+
+    @property
+    def executor_decode_min_size(self) -> int:
+        """Return the payload size from which websocket messages are decoded in the executor."""
+        if self.config_entry and self.config_entry.options:
+            return int(self.config_entry.options.get(CONF_EXECUTOR_DECODE_MIN_SIZE, DEFAULT_EXECUTOR_DECODE_MIN_SIZE))
+        return DEFAULT_EXECUTOR_DECODE_MIN_SIZE
+
+    @property
+    def receive_queue_size(self) -> int:
+        """Return the maximum number of queued websocket frames, 0 for an unbounded queue."""
+        if self.config_entry and self.config_entry.options:
+            return int(self.config_entry.options.get(CONF_RECEIVE_QUEUE_SIZE, DEFAULT_RECEIVE_QUEUE_SIZE))
+        return DEFAULT_RECEIVE_QUEUE_SIZE
+
+    @property
+    def attribute_history_size(self) -> int:
+        """Return the KiB per car kept for the numeric attribute history, 0 if disabled."""
+        if self.config_entry and self.config_entry.options:
+            return int(self.config_entry.options.get(CONF_ATTRIBUTE_HISTORY_SIZE, DEFAULT_ATTRIBUTE_HISTORY_SIZE))
+        return DEFAULT_ATTRIBUTE_HISTORY_SIZE
+
+    def _schedule_car_publish(self, vin: str) -> None:
+        """Publish pushed updates of a car, merging bursts into one notification.
+
+        Every new update restarts the window, but a change is never held back longer than
+        PUSH_COALESCE_MAX_DELAY after the first update of the burst.
+        """
+        window = self.push_coalesce_window
+        if window <= 0:
+            self._publish_car_updates(vin)
+            return
+
+        now = time.monotonic()
+        first_update = self._publish_pending_since.setdefault(vin, now)
+        if handle := self._publish_handles.pop(vin, None):
+            handle.cancel()
+
+        delay = max(0.0, min(window, first_update + PUSH_COALESCE_MAX_DELAY - now))
+        self._publish_handles[vin] = self._hass.loop.call_later(delay, self._publish_car_updates, vin)
+
+    def _publish_car_updates(self, vin: str) -> None:
+        self._publish_handles.pop(vin, None)
+        self._publish_pending_since.pop(vin, None)
+
+        current_car = self.cars.get(vin)
+        if not current_car:
+            return
+
+        started = self.pipeline_stats.start()
+        current_car.publish_updates()
+        self.pipeline_stats.stop("publish", "push", started)
+
+        # Check for newly available sensors after the update
+        if self._coordinator_ref:
+            self._hass.async_create_task(self._coordinator_ref.check_missing_sensors_for_vin(vin))
+
+    def cancel_pending_publishes(self) -> None:
+        """Drop all scheduled car publishes."""
+        for handle in self._publish_handles.values():
+            handle.cancel()
+        self._publish_handles.clear()
+        self._publish_pending_since.clear()
+
+    def prepare_data(self, data) -> dict[str, dict] | None:
+        """Decode the car payloads of a push message.
+
+        Touches no client state, so the websocket may run it on a worker thread.
+        """
+        msg_type = data.WhichOneof("msg")
+        excluded_cars = self.excluded_cars
+
+        if msg_type == "vepUpdates":
+            return {vin: car for vin, car in decode_vep_updates(data.vepUpdates).items() if vin not in excluded_cars}
+
+        if msg_type == "vehicle_status_updates":
+            return {
+                vin: normalize_vsu_update(vsu_car)
+                for vin, vsu_car in data.vehicle_status_updates.vehicle_status_updates.items()
+                if vin not in excluded_cars
+            }
+
+        return None
+
+    def on_data(self, data, prepared: dict[str, dict] | None = None):
         """Define a handler to fire when the data is received."""
 
         msg_type = data.WhichOneof("msg")
@@ -163,7 +367,7 @@ class Client:
             return None
 
         if msg_type == "vepUpdates":  # VEPUpdatesByVIN
-            self._process_vep_updates(data)
+            self._process_vep_updates(data, prepared)
 
             sequence_number = data.vepUpdates.sequence_number
             LOGGER.debug("vepUpdates Sequence: %s", sequence_number)
@@ -265,7 +469,7 @@ class Client:
             return ack_command
 
         if msg_type == "vehicle_status_updates":
-            self._process_vehicle_status_updates(data)
+            self._process_vehicle_status_updates(data, prepared)
 
             sequence_number = data.vehicle_status_updates.sequence_number
             LOGGER.debug("vehicle_status_updates Sequence: %s", sequence_number)
@@ -284,13 +488,15 @@ class Client:
 
         self._on_dataload_complete = callback_dataload_complete
         self._coordinator_ref = coordinator_ref
-        await self.websocket.async_connect(self.on_data)
+        await self.websocket.async_connect(self.on_data, self.prepare_data)
 
     def _build_car(self, received_car_data, update_mode, is_rest_data=False):
         if received_car_data.get("vin") in self.excluded_cars:
             LOGGER.debug("CAR excluded: %s", loghelper.Mask_VIN(received_car_data.get("vin")))
             return
 
+        started = self.pipeline_stats.start()
+
         if received_car_data.get("vin") not in self.cars:
             LOGGER.info(
                 "Flow Problem - VepUpdate for unknown car: %s",
@@ -307,7 +513,7 @@ class Client:
         car.last_message_received = int(round(time.time() * 1000))
 
         if not update_mode:
-            car.last_full_message = received_car_data
+            car.store_full_update(received_car_data)
 
         # Set data collection mode based on data source
         if is_rest_data:
@@ -320,146 +526,94 @@ class Client:
             if "windowStatusOverall" not in received_car_data["attributes"]:
                 self._create_synthetic_window_status_overall(received_car_data, car.finorvin)
 
-        car.odometer = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Odometer() if not car.odometer else car.odometer,
-            ODOMETER_OPTIONS,
-            update_mode,
-        )
+        groups = []
+        for group_name, group_class, _ in CAR_VALUE_GROUPS:
+            group = getattr(car, group_name) or group_class()
+            setattr(car, group_name, group)
+            groups.append(group)
 
-        car.tires = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Tires() if not car.tires else car.tires,
-            TIRE_OPTIONS,
-            update_mode,
-        )
-
-        car.wipers = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Wipers() if not car.wipers else car.wipers,
-            WIPER_OPTIONS,
-            update_mode,
-        )
-
-        car.doors = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Doors() if not car.doors else car.doors,
-            DOOR_OPTIONS,
-            update_mode,
-        )
-
-        car.location = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Location() if not car.location else car.location,
-            LOCATION_OPTIONS,
-            update_mode,
-        )
-
-        car.binarysensors = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            BinarySensors() if not car.binarysensors else car.binarysensors,
-            BINARY_SENSOR_OPTIONS,
-            update_mode,
-        )
-
-        car.windows = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Windows() if not car.windows else car.windows,
-            WINDOW_OPTIONS,
-            update_mode,
-        )
-
-        car.electric = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Electric() if not car.electric else car.electric,
-            ELECTRIC_OPTIONS,
-            update_mode,
-        )
-
-        car.auxheat = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Auxheat() if not car.auxheat else car.auxheat,
-            AUX_HEAT_OPTIONS,
-            update_mode,
-        )
-
-        car.precond = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            Precond() if not car.precond else car.precond,
-            PRE_COND_OPTIONS,
-            update_mode,
-        )
-
-        car.caralarm = self._get_car_values(
-            received_car_data,
-            car.finorvin,
-            CarAlarm() if not car.caralarm else car.caralarm,
-            CarAlarm_OPTIONS,
-            update_mode,
-        )
+        if not received_car_data.get("attributes"):
+            LOGGER.debug(
+                "get_car_values %s has incomplete update data – attributes not found",
+                loghelper.Mask_VIN(car.finorvin),
+            )
+        elif update_mode:
+            # Partial update: only visit the options fed by the keys the message carries,
+            # in the same group/option order a full pass would use.
+            positions = sorted(
+                {
+                    position
+                    for key in received_car_data["attributes"]
+                    for position in CAR_VALUE_ATTRIBUTE_INDEX.get(key, ())
+                }
+            )
+            for group_index, option_index in positions:
+                group_name, _, options = CAR_VALUE_GROUPS[group_index]
+                self._set_car_value(
+                    received_car_data,
+                    car,
+                    group_name,
+                    groups[group_index],
+                    options[option_index],
+                    update_mode,
+                )
+        else:
+            for group, (group_name, _, options) in zip(groups, CAR_VALUE_GROUPS, strict=True):
+                self._get_car_values(received_car_data, car, group_name, group, options, update_mode)
 
         if not update_mode:
             car.entry_setup_complete = True
 
         self.cars[car.finorvin] = car
+        self.pipeline_stats.stop("build_car", "rest" if is_rest_data else "partial" if update_mode else "full", started)
 
-    def _get_car_values(self, car_detail, vin, class_instance, options, update):
-        # Define handlers for specific options and the generic case
-        option_handlers = {
-            "max_soc": self._get_car_values_handle_max_soc,
-            "chargeflap": self._get_car_values_handle_chargeflap,
-            "chargeinletcoupler": self._get_car_values_handle_chargeinletcoupler,
-            "chargeinletlock": self._get_car_values_handle_chargeinletlock,
-            "chargePrograms": self._get_car_values_handle_chargePrograms,
-            "chargingBreakClockTimer": self._get_car_values_handle_charging_break_clock_timer,
-            "chargingPowerRestriction": self._get_car_values_handle_charging_power_restriction,
-            "endofchargetime": self._get_car_values_handle_endofchargetime,
-            "ignitionstate": self._get_car_values_handle_ignitionstate,
-            "precondStatus": self._get_car_values_handle_precond_status,
-            "temperature_points_frontLeft": self._get_car_values_handle_temperature_points,
-            "temperature_points_frontRight": self._get_car_values_handle_temperature_points,
-            "temperature_points_rearLeft": self._get_car_values_handle_temperature_points,
-            "temperature_points_rearRight": self._get_car_values_handle_temperature_points,
-        }
-
+    def _get_car_values(self, car_detail, car: Car, group_name, class_instance, options, update):
         if car_detail is None or not car_detail.get("attributes"):
             LOGGER.debug(
                 "get_car_values %s has incomplete update data – attributes not found",
-                loghelper.Mask_VIN(vin),
+                loghelper.Mask_VIN(car.finorvin),
             )
             return class_instance
 
         for option in options:
-            # Select the specific handler or the generic handler
-            handler = option_handlers.get(option, self._get_car_values_handle_generic)
+            self._set_car_value(car_detail, car, group_name, class_instance, option, update)
+        return class_instance
 
-            curr_status = handler(car_detail, class_instance, option, update, vin)
-            if curr_status is None:
-                continue
+    def _set_car_value(self, car_detail, car: Car, group_name, class_instance, option, update):
+        # Select the specific handler or the generic handler
+        handler = self._option_handlers.get(option, self._get_car_values_handle_generic)
 
-            # Set the value only if the timestamp is newer
-            # curr_timestamp = float(curr_status.timestamp or 0)
-            # car_value_timestamp = float(self._get_car_value(class_instance, option, "ts", 0))
-            # if curr_timestamp > car_value_timestamp:
-            #     setattr(class_instance, option, curr_status)
-            # elif curr_timestamp < car_value_timestamp:
-            #     LOGGER.warning(
-            #         "get_car_values %s received older attribute data for %s. Ignoring value.",
-            #         loghelper.Mask_VIN(vin),
-            #         option,
-            #     )
-            setattr(class_instance, option, curr_status)
-        return class_instance
+        curr_status = handler(car_detail, class_instance, option, update, car.finorvin)
+        if curr_status is None:
+            return
+
+        # Replayed or out-of-order values must not roll back a newer one. Missing timestamps
+        # (placeholders) never count as older. Options derived from other attributes (max_soc from the
+        # full update snapshot, the computed endofchargetime, ...) carry no timestamp of their own and are not checked.
+        current = getattr(class_instance, option, None)
+        if option not in CAR_VALUE_SOURCE_ATTRIBUTES and current is not None and current is not curr_status:
+            received = _timestamp_seconds(curr_status.timestamp)
+            if 0 < received < _timestamp_seconds(current.timestamp):
+                car.attribute_writes_skipped["stale"] += 1
+                LOGGER.debug(
+                    "get_car_values %s received older attribute data for %s. Ignoring value.",
+                    loghelper.Mask_VIN(car.finorvin),
+                    option,
+                )
+                return
+
+        if not car.set_attribute(group_name, class_instance, option, curr_status):
+            car.attribute_writes_skipped["unchanged"] += 1
+        elif self._attribute_history_bytes:
+            self._record_history(car, f"{group_name}.{option}", curr_status)
+
+    def _record_history(self, car: Car, key: str, attribute: CarAttribute) -> None:
+        """Add a changed attribute to the history of the car, placeholders are skipped."""
+        if attribute is ATTRIBUTE_NOT_RECEIVED or attribute is ATTRIBUTE_NOT_RECEIVED_FALSE:
+            return
+        if car.attribute_history is None:
+            car.attribute_history = AttributeHistory(self._attribute_history_bytes)
+        car.attribute_history.add(key, attribute.value, attribute.timestamp)
 
     def _get_car_values_handle_generic(self, car_detail, class_instance, option, update, vin: str):
         curr = car_detail.get("attributes", {}).get(option)
@@ -485,7 +639,8 @@ class Client:
             ]
             unit = next((curr[key] for key in unit_keys if key in curr), None)
 
-            return CarAttribute(
+            return reuse_attribute(
+                getattr(class_instance, option, None),
                 value=value,
                 retrievalstatus=status,
                 timestamp=time_stamp,
@@ -495,15 +650,15 @@ class Client:
 
         if not update:
             # Set status for non-existing values when no update occurs
-            return CarAttribute(0, 4, 0)
+            return ATTRIBUTE_NOT_RECEIVED
 
         return None
 
     def _get_car_values_handle_max_soc(
-        self, car_detail, class_instance, option, update, vin: str, use_last_full_message: bool = False
+        self, car_detail, class_instance, option, update, vin: str, use_full_update_snapshot: bool = False
     ):
         # Handle the case when the selected charge program changed but chargePrograms is not available in the update message.
-        if not use_last_full_message:
+        if not use_full_update_snapshot:
             attributes = car_detail.get("attributes", {})
             charge_programs = attributes.get("chargePrograms")
             if not charge_programs:
@@ -511,19 +666,17 @@ class Client:
                     return None
 
                 return self._get_car_values_handle_max_soc(
-                    car_detail, class_instance, option, update, vin, use_last_full_message=True
+                    car_detail, class_instance, option, update, vin, use_full_update_snapshot=True
                 )
         else:
             current_car = self.cars.get(vin)
-            if not current_car or not current_car.last_full_message:
+            if not current_car or current_car.full_update_snapshot is None:
                 LOGGER.debug(
-                    "get_car_values_handle_max_soc - No last_full_message found for car %s",
+                    "get_car_values_handle_max_soc - No full update received for car %s",
                     loghelper.Mask_VIN(vin),
                 )
                 return None
-            car_detail = current_car.last_full_message or car_detail
-            attributes = car_detail.get("attributes", {})
-            charge_programs = attributes.get("chargePrograms")
+            charge_programs = current_car.full_update_snapshot.get("chargePrograms")
             if not charge_programs:
                 return None
 
@@ -755,8 +908,8 @@ class Client:
             current_car = self.cars.get(vin)
             if not attributes.get("endofchargetime") and not (
                 current_car
-                and current_car.last_full_message
-                and current_car.last_full_message.get("attributes", {}).get("endofchargetime")
+                and current_car.full_update_snapshot
+                and current_car.full_update_snapshot.get("endofchargetime")
             ):
                 return CarAttribute(
                     value=STATE_UNKNOWN,
@@ -794,14 +947,13 @@ class Client:
             # endofChargeTimeWeekday is sometimes not present in the update message, we need to get it from the last full message then
             if "endofChargeTimeWeekday" not in attributes:
                 current_car = self.cars.get(vin)
-                if not current_car or not current_car.last_full_message:
+                if not current_car or current_car.full_update_snapshot is None:
                     LOGGER.debug(
-                        "get_car_values_handle_endofchargetime - No last_full_message found for car %s",
+                        "get_car_values_handle_endofchargetime - No full update received for car %s",
                         loghelper.Mask_VIN(vin),
                     )
                     return None
-                car_detail = current_car.last_full_message
-                attributes = car_detail.get("attributes", {})
+                attributes = current_car.full_update_snapshot
 
             local_tz = dt.datetime.now().astimezone().tzinfo
             end_weekday_attr = attributes.get("endofChargeTimeWeekday", {})
@@ -916,7 +1068,7 @@ class Client:
 
         if not update:
             # Set status for non-existing values when no update occurs
-            return CarAttribute(False, 4, 0)
+            return ATTRIBUTE_NOT_RECEIVED_FALSE
 
         return None
 
@@ -1047,8 +1199,7 @@ class Client:
         LOGGER.debug("Start _process_rest_vep_update")
 
         self._write_debug_output(data, "rfu")
-        # Don't understand the protobuf dict errors --> convert to json
-        vep_json = json.loads(MessageToJson(data, preserving_proto_field_name=True))
+        vep_json = decode_vep_car(data)
 
         # Check if this is a nested vepUpdates structure or a direct VIN structure
         if "vepUpdates" in vep_json and "updates" in vep_json["vepUpdates"]:
@@ -1099,14 +1250,13 @@ class Client:
                 self._hass.async_create_task(self._on_dataload_complete())
                 self._dataload_complete_fired = True
 
-    def _process_vep_updates(self, data):
+    def _process_vep_updates(self, data, cars: dict[str, dict] | None = None):
         LOGGER.debug("Start _process_vep_updates")
 
         self._write_debug_output(data, "vep")
 
-        # Don't understand the protobuf dict errors --> convert to json
-        vep_json = json.loads(MessageToJson(data, preserving_proto_field_name=True))
-        cars = vep_json["vepUpdates"]["updates"]
+        if cars is None:
+            cars = self.prepare_data(data)
 
         if not self._first_vepupdates_processed:
             self._vepupdates_time_first_message = datetime.now()
@@ -1149,11 +1299,7 @@ class Client:
                 current_car.data_collection_mode = "push"
 
                 if current_car:
-                    current_car.publish_updates()
-
-                    # Check for newly available sensors after vep_update
-                    if self._coordinator_ref:
-                        self._hass.async_create_task(self._coordinator_ref.check_missing_sensors_for_vin(vin))
+                    self._schedule_car_publish(vin)
 
         if not self._dataload_complete_fired:
             fire_complete_event: bool = True
@@ -1171,13 +1317,13 @@ class Client:
                 self._hass.async_create_task(self._on_dataload_complete())
                 self._dataload_complete_fired = True
 
-    def _process_vehicle_status_updates(self, data):
+    def _process_vehicle_status_updates(self, data, cars: dict[str, dict] | None = None):
         LOGGER.debug("Start _process_vehicle_status_updates")
 
         self._write_debug_output(data, "vsu")
 
-        vsu_json = json.loads(MessageToJson(data, preserving_proto_field_name=True))
-        cars = vsu_json.get("vehicle_status_updates", {}).get("vehicle_status_updates", {})
+        if cars is None:
+            cars = self.prepare_data(data)
 
         if not self._first_vepupdates_processed:
             self._vepupdates_time_first_message = datetime.now()
@@ -1186,12 +1332,10 @@ class Client:
                 30, lambda: self._hass.async_add_executor_job(self._safe_create_on_dataload_complete_task)
             )
 
-        for vin, vsu_car in cars.items():
+        for vin, current_car in cars.items():
             if vin in self.excluded_cars:
                 continue
 
-            current_car = normalize_vsu_car(vsu_car)
-
             if DEBUG_SIMULATE_PARTIAL_UPDATES_ONLY and current_car.get("full_update", False) is True:
                 current_car["full_update"] = False
                 LOGGER.debug(
@@ -1219,10 +1363,7 @@ class Client:
                 current_car_obj = self.cars.get(vin)
                 if current_car_obj:
                     current_car_obj.data_collection_mode = "push"
-                    current_car_obj.publish_updates()
-
-                    if self._coordinator_ref:
-                        self._hass.async_create_task(self._coordinator_ref.check_missing_sensors_for_vin(vin))
+                    self._schedule_car_publish(vin)
 
         if not self._dataload_complete_fired:
             fire_complete_event: bool = True
@@ -18,21 +18,34 @@ from homeassistant.helpers.storage import STORAGE_DIR
 from .client import Client
 from .const import (
     CONF_ALLOWED_REGIONS,
+    CONF_ATTRIBUTE_HISTORY_SIZE,
     CONF_DEBUG_FILE_SAVE,
     CONF_DELETE_AUTH_FILE,
     CONF_ENABLE_CHINA_GCJ_02,
     CONF_EXCLUDED_CARS,
+    CONF_EXECUTOR_DECODE_MIN_SIZE,
     CONF_FT_DISABLE_CAPABILITY_CHECK,
     CONF_OVERWRITE_PRECONDNOW,
+    CONF_PERSIST_RESPONSE_CACHE,
     CONF_PIN,
+    CONF_PIPELINE_STATS,
+    CONF_PROTO_DIAG_SAMPLE_RATE,
+    CONF_PUSH_COALESCE_WINDOW,
+    CONF_RECEIVE_QUEUE_SIZE,
     CONF_REGION,
+    DEFAULT_ATTRIBUTE_HISTORY_SIZE,
+    DEFAULT_EXECUTOR_DECODE_MIN_SIZE,
+    DEFAULT_PUSH_COALESCE_WINDOW,
+    DEFAULT_RECEIVE_QUEUE_SIZE,
     DOMAIN,
     LOGGER,
+    PUSH_COALESCE_MAX_DELAY,
     REGION_CHINA,
     TOKEN_FILE_PREFIX,
     VERIFY_SSL,
 )
 from .errors import MbapiError, MBAuth2FAError, MBAuthError, MBLegalTermsError
+from .proto_diag import DEFAULT_SAMPLE_RATE
 
 AUTH_METHOD_TOKEN = "token"
 AUTH_METHOD_USERPASS = "userpass"
@@ -279,6 +292,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         save_debug_files = self.options.get(CONF_DEBUG_FILE_SAVE, False)
         enable_china_gcj_02 = self.options.get(CONF_ENABLE_CHINA_GCJ_02, False)
         overwrite_cap_precondnow = self.options.get(CONF_OVERWRITE_PRECONDNOW, False)
+        push_coalesce_window = self.options.get(CONF_PUSH_COALESCE_WINDOW, DEFAULT_PUSH_COALESCE_WINDOW)
+        executor_decode_min_size = self.options.get(CONF_EXECUTOR_DECODE_MIN_SIZE, DEFAULT_EXECUTOR_DECODE_MIN_SIZE)
+        receive_queue_size = self.options.get(CONF_RECEIVE_QUEUE_SIZE, DEFAULT_RECEIVE_QUEUE_SIZE)
+        proto_diag_sample_rate = self.options.get(CONF_PROTO_DIAG_SAMPLE_RATE, DEFAULT_SAMPLE_RATE)
+        pipeline_stats = self.options.get(CONF_PIPELINE_STATS, False)
+        attribute_history_size = self.options.get(CONF_ATTRIBUTE_HISTORY_SIZE, DEFAULT_ATTRIBUTE_HISTORY_SIZE)
+        persist_response_cache = self.options.get(CONF_PERSIST_RESPONSE_CACHE, False)
 
         return self.async_show_form(
             step_id="init",
@@ -291,6 +311,23 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(CONF_DELETE_AUTH_FILE, default=False): bool,
                     vol.Optional(CONF_ENABLE_CHINA_GCJ_02, default=enable_china_gcj_02): bool,
                     vol.Optional(CONF_OVERWRITE_PRECONDNOW, default=overwrite_cap_precondnow): bool,
+                    vol.Optional(CONF_PUSH_COALESCE_WINDOW, default=push_coalesce_window): vol.All(
+                        vol.Coerce(float), vol.Range(min=0, max=PUSH_COALESCE_MAX_DELAY)
+                    ),
+                    vol.Optional(CONF_EXECUTOR_DECODE_MIN_SIZE, default=executor_decode_min_size): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                    vol.Optional(CONF_RECEIVE_QUEUE_SIZE, default=receive_queue_size): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                    vol.Optional(CONF_PROTO_DIAG_SAMPLE_RATE, default=proto_diag_sample_rate): vol.All(
+                        vol.Coerce(float), vol.Range(min=0, max=1)
+                    ),
+                    vol.Optional(CONF_PIPELINE_STATS, default=pipeline_stats): bool,
+                    vol.Optional(CONF_ATTRIBUTE_HISTORY_SIZE, default=attribute_history_size): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    ),
+                    vol.Optional(CONF_PERSIST_RESPONSE_CACHE, default=persist_response_cache): bool,
                 }
             ),
         )
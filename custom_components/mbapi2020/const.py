@@ -26,6 +26,8 @@ from homeassistant.const import (
 )
 from homeassistant.helpers import config_validation as cv
 
+from .attribute_history import HISTORY_ATTRIBUTES
+
 MERCEDESME_COMPONENTS = [
     Platform.SENSOR,
     Platform.LOCK,
@@ -56,6 +58,13 @@ CONF_AUTH_METHOD = "auth_method"
 CONF_ACCESS_TOKEN = "access_token"
 CONF_REFRESH_TOKEN = "refresh_token"
 CONF_OVERWRITE_PRECONDNOW = "overwrite_cap_precondnow"
+CONF_PUSH_COALESCE_WINDOW = "push_coalesce_window"
+CONF_EXECUTOR_DECODE_MIN_SIZE = "executor_decode_min_size"
+CONF_RECEIVE_QUEUE_SIZE = "receive_queue_size"
+CONF_PROTO_DIAG_SAMPLE_RATE = "proto_diag_sample_rate"
+CONF_PIPELINE_STATS = "pipeline_stats"
+CONF_ATTRIBUTE_HISTORY_SIZE = "attribute_history_size"
+CONF_PERSIST_RESPONSE_CACHE = "persist_response_cache"
 
 DOMAIN = "mbapi2020"
 LOGGER = logging.getLogger(__package__)
@@ -91,6 +100,7 @@ JSON_EXPORT_IGNORED_KEYS = (
     "id_token",
     "password",
     "title",
+    "attribute_history",
 )
 
 
@@ -142,6 +152,17 @@ WIDGET_API_BASE_NA = "https://widget.amap-prod.mobilesdk.mercedes-benz.com"
 WIDGET_API_BASE_PA = "https://widget.amap-prod.mobilesdk.mercedes-benz.com"
 WIDGET_API_BASE_CN = "https://widget.cn-prod.mobilesdk.mercedes-benz.com"
 DEFAULT_SOCKET_MIN_RETRY = 15
+# Seconds pushed updates of one car are collected before entities are notified, 0 notifies them right away
+DEFAULT_PUSH_COALESCE_WINDOW = 0
+# Upper bound in seconds a pushed change can be held back by a continuous burst
+PUSH_COALESCE_MAX_DELAY = 2.0
+# Websocket payloads of at least this many bytes are decoded in the executor, 0 keeps all on the event loop
+DEFAULT_EXECUTOR_DECODE_MIN_SIZE = 0
+# Websocket frames buffered before reading pauses; queued partial updates of a car are merged. 0 = unbounded.
+# While reading is paused the watchdog stays armed as long as the queue drains, so the backlog is kept
+DEFAULT_RECEIVE_QUEUE_SIZE = 0
+# KiB per car for the numeric attribute history, 0 disables it
+DEFAULT_ATTRIBUTE_HISTORY_SIZE = 0
 
 SERVICE_AUXHEAT_CONFIGURE = "auxheat_configure"
 SERVICE_AUXHEAT_START = "auxheat_start"
@@ -171,6 +192,8 @@ SERVICE_PRECONDITIONING_CONFIGURE_SEATS = "preconditioning_configure_seats"
 SERVICE_TEMPERATURE_CONFIGURE = "temperature_configure"
 SERVICE_HV_BATTERY_START_CONDITIONING = "hv_battery_start_conditioning"
 SERVICE_HV_BATTERY_STOP_CONDITIONING = "hv_battery_stop_conditioning"
+SERVICE_PIPELINE_STATS = "pipeline_stats"
+SERVICE_ATTRIBUTE_HISTORY = "attribute_history"
 
 SERVICE_AUXHEAT_CONFIGURE_SCHEMA = vol.Schema(
     {
@@ -222,6 +245,19 @@ SERVICE_BATTERY_MAX_SOC_CONFIGURE_SCHEMA = vol.Schema(
         vol.Optional("charge_program", default=0): vol.All(vol.Coerce(int), vol.In([0, 2, 3])),
     }
 )
+SERVICE_PIPELINE_STATS_SCHEMA = vol.Schema(
+    {
+        vol.Required("enabled"): cv.boolean,
+        vol.Optional("reset", default=False): cv.boolean,
+    }
+)
+SERVICE_ATTRIBUTE_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_VIN): cv.string,
+        vol.Required("attribute"): vol.In(HISTORY_ATTRIBUTES),
+        vol.Optional("window", default=3600): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
 SERVICE_VIN_SCHEMA = vol.Schema({vol.Required(CONF_VIN): cv.string})
 SERVICE_VIN_PIN_SCHEMA = vol.Schema(
     {
@@ -857,6 +893,8 @@ SENSORS = {
         None,
         {
             "partital_updatemessages_received",
+            "stale_attributes_dropped",
+            "unchanged_attributes_skipped",
             "last_message_received",
             "last_command_type",
             "last_command_state",
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -15,6 +16,7 @@ from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .car import Car
+from .car_snapshot import CarSnapshotStore
 from .client import Client
 from .const import CONF_REGION, DOMAIN, MERCEDESME_COMPONENTS, UPDATE_INTERVAL, VERIFY_SSL
 from .errors import MbapiError
@@ -37,6 +39,9 @@ class MBAPI2020DataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.config_entry: ConfigEntry = config_entry
         self.initialized: bool = False
         self.entry_setup_complete: bool = False
+        # Set once the platforms are set up, from the first full updates or the restored snapshot
+        self.dataload_complete = asyncio.Event()
+        self.snapshot = CarSnapshotStore(hass, config_entry.entry_id)
         session = async_get_clientsession(hass, VERIFY_SSL)
 
         # Find the right way to migrate old configs
@@ -66,12 +71,16 @@ class MBAPI2020DataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     @callback
     async def on_dataload_complete(self):
         """Create sensors after the web_socket initial data is complete."""
-        if not self.entry_setup_complete:
+        # Flags are set before forwarding, a restored snapshot and the first full updates can both end up here
+        forward_setups = not self.entry_setup_complete
+        self.entry_setup_complete = True
+        self.client._dataload_complete_fired = True
+
+        if forward_setups:
             LOGGER.info("Car Load complete - start sensor creation")
             await self.hass.config_entries.async_forward_entry_setups(self.config_entry, MERCEDESME_COMPONENTS)
 
-        self.entry_setup_complete = True
-        self.client._dataload_complete_fired = True
+        self.dataload_complete.set()
 
     async def ws_connect(self):
         """Register handlers and connect to the websocket."""
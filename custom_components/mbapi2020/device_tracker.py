@@ -76,6 +76,12 @@ class MercedesMEDeviceTracker(MercedesMeEntity, TrackerEntity, RestoreEntity):
 
         return lng or None
 
+    def _update_listener_attributes(self) -> set[str] | None:
+        attributes = super()._update_listener_attributes()
+        if attributes is not None:
+            attributes.update(("location.positionLat", "location.positionLong"))
+        return attributes
+
     @property
     def source_type(self):
         """Return the source type, eg gps or router, of the device."""
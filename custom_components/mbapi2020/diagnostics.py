@@ -11,6 +11,7 @@ from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, JSON_EXPORT_IGNORED_KEYS
 from .helper import LogHelper as loghelper, MBJSONEncoder
+from .proto_diag import shape_cache_stats
 
 
 async def async_get_config_entry_diagnostics(
@@ -25,4 +26,17 @@ async def async_get_config_entry_diagnostics(
     for car in domain.client.cars.values():
         data["cars"].append({loghelper.Mask_VIN(car.finorvin): json.loads(json.dumps(car, cls=MBJSONEncoder))})
 
+    if domain.client.websocket:
+        data["websocket"] = domain.client.websocket.queue_statistics()
+
+    data["proto_diag"] = {**shape_cache_stats(), "sample_rate": domain.client.proto_diag_sample_rate}
+    data["pipeline_stats"] = domain.client.pipeline_stats.snapshot()
+    data["response_cache"] = domain.client.webapi.response_cache.snapshot()
+    data["coalesced_requests"] = domain.client.webapi.coalesced_requests
+    data["attribute_history_usage"] = {
+        loghelper.Mask_VIN(car.finorvin): car.attribute_history.usage()
+        for car in domain.client.cars.values()
+        if car.attribute_history is not None
+    }
+
     return async_redact_data(data, JSON_EXPORT_IGNORED_KEYS)
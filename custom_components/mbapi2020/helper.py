@@ -222,8 +222,22 @@ class CoordinatesHelper:
 
 
 def get_class_property_names(obj: object):
-    """Return the names of all properties of a class."""
-    return [p[0] for p in inspect.getmembers(type(obj), inspect.isdatadescriptor) if not p[0].startswith("_")]
+    """Return the names of all properties of a class, slots excluded."""
+    return [
+        name
+        for name, member in inspect.getmembers(type(obj), inspect.isdatadescriptor)
+        if not name.startswith("_") and not inspect.ismemberdescriptor(member)
+    ]
+
+
+def _instance_values(obj: object) -> dict | None:
+    """Return a copy of the instance attributes of obj, from __dict__ or the set __slots__."""
+    if hasattr(obj, "__dict__") and isinstance(obj.__dict__, dict):
+        return dict(obj.__dict__)
+    slots = [slot for cls in type(obj).__mro__ for slot in cls.__dict__.get("__slots__", ())]
+    if not slots:
+        return None
+    return {slot: getattr(obj, slot) for slot in slots if hasattr(obj, slot)}
 
 
 class MBJSONEncoder(json.JSONEncoder):
@@ -232,8 +246,7 @@ class MBJSONEncoder(json.JSONEncoder):
     def default(self, o) -> str | dict:  # noqa: D102
         if isinstance(o, (datetime.datetime, datetime.date, datetime.time)):
             return o.isoformat()
-        if not isinstance(o, Enum) and hasattr(o, "__dict__") and isinstance(o.__dict__, dict):
-            retval: dict = o.__dict__
+        if not isinstance(o, Enum) and (retval := _instance_values(o)) is not None:
             retval.update({p: getattr(o, p) for p in get_class_property_names(o)})
             return {k: v for k, v in retval.items() if k not in JSON_EXPORT_IGNORED_KEYS}
         return str(o)
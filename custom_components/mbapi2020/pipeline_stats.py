@@ -0,0 +1,178 @@
+"""Rolling latency histograms for the stages of the websocket push pipeline."""
+
+from __future__ import annotations
+
+from collections import deque
+import threading
+import time
+from typing import Any
+
+# Stages in pipeline order: frame enqueued, PushMessage parsed, unknown field scan, car payload
+# decode, Client.on_data, Client._build_car, Car.publish_updates, ack sent
+STAGES = ("receive", "parse", "diagnose", "prepare", "on_data", "build_car", "publish", "ack")
+
+# Upper bucket bounds in milliseconds, the last bucket takes everything above
+_BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+_BUCKET_LABELS = (*(f"<={bound}ms" for bound in _BUCKET_BOUNDS_MS), f">{_BUCKET_BOUNDS_MS[-1]}ms")
+
+# Samples kept per stage and message type for percentiles, buckets and throughput
+DEFAULT_WINDOW = 256
+
+
+def _percentile(ordered: list[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+class _Histogram:
+    """Durations of one stage and message type: running totals plus a window of recent samples."""
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._durations: deque[float] = deque(maxlen=window)
+        self._times: deque[float] = deque(maxlen=window)
+
+    def add(self, duration: float, now: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self._durations.append(duration)
+        self._times.append(now)
+
+    def snapshot(self) -> dict[str, Any]:
+        ordered = sorted(self._durations)
+        buckets = dict.fromkeys(_BUCKET_LABELS, 0)
+        for duration in ordered:
+            milliseconds = duration * 1000
+            for bound, label in zip(_BUCKET_BOUNDS_MS, _BUCKET_LABELS[:-1], strict=True):
+                if milliseconds <= bound:
+                    buckets[label] += 1
+                    break
+            else:
+                buckets[_BUCKET_LABELS[-1]] += 1
+
+        times = list(self._times)
+        span = times[-1] - times[0] if len(times) > 1 else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "window": len(ordered),
+            "p50_ms": round(_percentile(ordered, 0.5) * 1000, 3) if ordered else 0.0,
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3) if ordered else 0.0,
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3) if ordered else 0.0,
+            "per_second": round((len(times) - 1) / span, 2) if span > 0 else 0.0,
+            "buckets": {label: count for label, count in buckets.items() if count},
+        }
+
+
+class _Gauge:
+    """Sampled fill level of a queue."""
+
+    def __init__(self, window: int) -> None:
+        self.current = 0
+        self.max = 0
+        self._samples: deque[int] = deque(maxlen=window)
+
+    def add(self, value: int) -> None:
+        self.current = value
+        self.max = max(self.max, value)
+        self._samples.append(value)
+
+    def snapshot(self) -> dict[str, Any]:
+        samples = list(self._samples)
+        return {
+            "current": self.current,
+            "max": self.max,
+            "mean": round(sum(samples) / len(samples), 2) if samples else 0.0,
+        }
+
+
+class PipelineStats:
+    """Timing probes for the push pipeline, switchable at runtime.
+
+    A probe is start() before a stage and stop() after it. While disabled start() returns None
+    and stop() returns right away, so the probes cost one call each. Probes of the parse stages
+    may run on executor threads, so recording, reset and the snapshots share one lock.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize the probes."""
+        self.enabled = enabled
+        self._window = window
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._gauges: dict[str, _Gauge] = {}
+        self._since = time.monotonic()
+        self._lock = threading.Lock()
+
+    def start(self) -> float | None:
+        """Return the start time of a stage, None while disabled."""
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, stage: str, msg_type: str | None, started: float | None) -> None:
+        """Record the duration of a stage started with start()."""
+        if started is None:
+            return
+        now = time.perf_counter()
+        key = (stage, msg_type or "unknown")
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self._window)
+            histogram.add(now - started, now)
+
+    def depth(self, queue: str, value: int) -> None:
+        """Record the fill level of a queue."""
+        if not self.enabled:
+            return
+        with self._lock:
+            gauge = self._gauges.get(queue)
+            if gauge is None:
+                gauge = self._gauges[queue] = _Gauge(self._window)
+            gauge.add(value)
+
+    def reset(self) -> None:
+        """Drop all recorded samples."""
+        with self._lock:
+            self._histograms = {}
+            self._gauges = {}
+            self._since = time.monotonic()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the histograms per stage and message type, and the queue gauges."""
+        stages: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for (stage, msg_type), histogram in sorted(
+                self._histograms.items(), key=lambda item: (STAGES.index(item[0][0]), item[0][1])
+            ):
+                stages.setdefault(stage, {})[msg_type] = histogram.snapshot()
+            queues = {queue: gauge.snapshot() for queue, gauge in sorted(self._gauges.items())}
+            since = self._since
+        return {
+            "enabled": self.enabled,
+            "seconds_recorded": round(time.monotonic() - since),
+            "stages": stages,
+            "queues": queues,
+        }
+
+    def summary(self) -> dict[str, str]:
+        """Return mean/max latency per stage over all message types and the queue depths as text."""
+        latencies = []
+        with self._lock:
+            histograms = [
+                (stage, histogram.count, histogram.total, histogram.max)
+                for (stage, _), histogram in self._histograms.items()
+            ]
+            depths = [f"{queue} {gauge.current} (max {gauge.max})" for queue, gauge in sorted(self._gauges.items())]
+        for stage in STAGES:
+            selected = [(count, total, peak) for name, count, total, peak in histograms if name == stage]
+            if not (count := sum(item[0] for item in selected)):
+                continue
+            mean = sum(item[1] for item in selected) / count
+            peak = max(item[2] for item in selected)
+            latencies.append(f"{stage} {mean * 1000:.2f}/{peak * 1000:.2f} ms")
+        return {
+            "push_pipeline_latency": ", ".join(latencies) or "-",
+            "push_queue_depth": ", ".join(depths) or "-",
+        }
@@ -5,6 +5,8 @@ from __future__ import annotations
 from collections.abc import Iterator
 import logging
 import os
+import random
+import threading
 
 from google.protobuf import descriptor_pb2
 
@@ -12,6 +14,13 @@ LOGGER = logging.getLogger(__name__)
 
 _WIRE_TYPES = {0: "varint", 1: "fixed64", 2: "length-delimited", 5: "fixed32"}
 
+# Share of messages with an already checked shape that are diagnosed again anyway
+DEFAULT_SAMPLE_RATE = 0.02
+# Nesting depth the shape fingerprint looks at: 3 reaches the attributes of a vehicle update, drift inside
+# a single attribute message is left to sampling
+_SHAPE_DEPTH = 3
+_SHAPE_CACHE_MAX = 1024
+
 
 def _probe_unknown_fields_api() -> bool:
     """Verify that UnknownFields() is actually callable on a real message.
@@ -144,61 +153,114 @@ def _decode_varint(buf: bytes, pos: int) -> tuple[int, int]:
     raise ValueError("varint truncated")
 
 
-def _iter_unknown_fields_wire(raw: bytes, descriptor, path: str) -> Iterator[tuple[str, int, str, bytes | int | None]]:
-    """Walk ``raw`` bytes against ``descriptor``; yield (path, field_number, wire_type, sample)."""
-    pos = 0
-    end = len(raw)
-    fields_by_number = {f.number: f for f in descriptor.fields} if descriptor else {}
+def _skip_field(buf: bytes, pos: int, wire_type: int) -> int:
+    """Skip the value of a field with ``wire_type`` starting at ``pos``; return the new position."""
+    if wire_type == 0:
+        return _decode_varint(buf, pos)[1]
+    if wire_type == 1:
+        return pos + 8
+    if wire_type == 2:
+        length, pos = _decode_varint(buf, pos)
+        return pos + length
+    if wire_type == 5:
+        return pos + 4
+    raise ValueError(f"unsupported wire type {wire_type}")
+
+
+_FIELD_INDEX: dict[str, dict[int, object]] = {}
+
+
+def _fields_by_number(descriptor) -> dict[int, object]:
+    """Return the cached field-number index of ``descriptor``."""
+    if descriptor is None:
+        return {}
+    index = _FIELD_INDEX.get(descriptor.full_name)
+    if index is None:
+        index = _FIELD_INDEX[descriptor.full_name] = {f.number: f for f in descriptor.fields}
+    return index
+
 
+def _read_varint(buf, pos: int, end: int) -> tuple[int, int]:
+    """Decode a varint from ``buf`` within ``end``; same rules as _decode_varint."""
+    result = 0
+    shift = 0
     while pos < end:
-        try:
-            tag, pos = _decode_varint(raw, pos)
-        except ValueError:
-            return
-        field_number = tag >> 3
-        wire_type = tag & 0x7
-
-        payload: bytes | None = None
-        scalar_sample: int | None = None
-        if wire_type == 0:  # varint
-            try:
-                scalar_sample, pos = _decode_varint(raw, pos)
-            except ValueError:
-                return
-        elif wire_type == 1:  # fixed64
-            pos += 8
-        elif wire_type == 2:  # length-delimited
-            try:
-                length, pos = _decode_varint(raw, pos)
-            except ValueError:
-                return
-            payload = raw[pos : pos + length]
-            pos += length
-        elif wire_type == 5:  # fixed32
-            pos += 4
-        else:
-            # groups (3/4) are obsolete in proto3 — bail out instead of guessing
-            return
-
-        field = fields_by_number.get(field_number)
-        if field is None:
-            sample = payload if payload is not None else scalar_sample
-            yield (
-                path or descriptor.full_name,
-                field_number,
-                _WIRE_TYPES.get(wire_type, str(wire_type)),
-                sample,
-            )
-            continue
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not (byte & 0x80):
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("varint too long")
+    raise ValueError("varint truncated")
+
 
-        if (
-            wire_type == 2
-            and payload is not None
-            and field.type == field.TYPE_MESSAGE
-            and field.message_type is not None
-        ):
-            sub_path = f"{path}.{field.name}" if path else f"{descriptor.full_name}.{field.name}"
-            yield from _iter_unknown_fields_wire(payload, field.message_type, sub_path)
+def _iter_unknown_fields_wire(raw: bytes, descriptor, path: str) -> Iterator[tuple[str, int, str, bytes | int | None]]:
+    """Walk ``raw`` bytes against ``descriptor``; yield (path, field_number, wire_type, sample).
+
+    Nested messages are bounded views into the one buffer and walked with an
+    explicit stack in wire order; only the payload of an unknown field is copied.
+    """
+    buf = raw if isinstance(raw, memoryview) else memoryview(raw)
+    # (pos, end, fields_by_number, path)
+    stack = [(0, len(buf), _fields_by_number(descriptor), path or descriptor.full_name)]
+
+    while stack:
+        pos, end, fields_by_number, here = stack.pop()
+
+        while pos < end:
+            # Tags below 128 are a single byte — skip the varint loop for them
+            tag = buf[pos]
+            if tag < 0x80:
+                pos += 1
+            else:
+                try:
+                    tag, pos = _read_varint(buf, pos, end)
+                except ValueError:
+                    break
+            field_number = tag >> 3
+            wire_type = tag & 0x7
+
+            payload_start = payload_end = -1
+            scalar_sample: int | None = None
+            if wire_type == 0:  # varint
+                try:
+                    scalar_sample, pos = _read_varint(buf, pos, end)
+                except ValueError:
+                    break
+            elif wire_type == 1:  # fixed64
+                pos += 8
+            elif wire_type == 2:  # length-delimited
+                if pos < end and buf[pos] < 0x80:
+                    length = buf[pos]
+                    pos += 1
+                else:
+                    try:
+                        length, pos = _read_varint(buf, pos, end)
+                    except ValueError:
+                        break
+                payload_start, payload_end = pos, min(pos + length, end)
+                pos += length
+            elif wire_type == 5:  # fixed32
+                pos += 4
+            else:
+                # groups (3/4) are obsolete in proto3 — bail out instead of guessing
+                break
+
+            field = fields_by_number.get(field_number)
+            if field is None:
+                sample = bytes(buf[payload_start:payload_end]) if payload_start >= 0 else scalar_sample
+                yield (here, field_number, _WIRE_TYPES.get(wire_type, str(wire_type)), sample)
+                continue
+
+            if payload_start >= 0 and field.type == field.TYPE_MESSAGE and field.message_type is not None:
+                # Resume this message after the nested one, which is walked first
+                stack.append((pos, end, fields_by_number, here))
+                stack.append(
+                    (payload_start, payload_end, _fields_by_number(field.message_type), f"{here}.{field.name}")
+                )
+                break
 
 
 def _format_sample(sample: bytes | int | None) -> str:
@@ -231,14 +293,122 @@ def warn_on_unknown_fields_from_bytes(raw: bytes, descriptor, *, label: str) ->
     return found
 
 
-def diagnose_proto_message(message, raw_bytes: bytes, descriptor, *, label: str) -> None:
+# --- Shape cache ---------------------------------------------------------
+#
+# Full scans are only needed for message shapes not seen before. The shape is
+# the set of (parent field path, tag) pairs down to _SHAPE_DEPTH, which changes
+# when the server starts sending a new attribute or field. A sampled share of
+# known shapes is still scanned to catch drift deeper in the message; the
+# sampling draw comes first, so sampled messages are not fingerprinted.
+#
+# The cache and counters are shared with the executor decode threads and are
+# only changed under _shape_lock. The sample rate is passed by the websocket of
+# each config entry.
+
+_checked_shapes: set[tuple[str, int]] = set()
+_shape_stats = {"scanned": 0, "skipped": 0}
+_shape_lock = threading.Lock()
+# (parent path id, field number) -> path id, path id 0 is the top-level message
+_path_ids: dict[tuple[int, int], int] = {}
+
+
+def shape_cache_stats() -> dict[str, int | float]:
+    """Return counters of the shape cache."""
+    with _shape_lock:
+        return {**_shape_stats, "known_shapes": len(_checked_shapes)}
+
+
+def _new_path_id(key: tuple[int, int]) -> int:
+    with _shape_lock:
+        return _path_ids.setdefault(key, len(_path_ids) + 1)
+
+
+def _shape_fingerprint(raw: bytes, descriptor) -> int:
+    """Hash the (parent field path, tag) pairs of ``raw`` down to _SHAPE_DEPTH nested message levels.
+
+    A field number is told apart by the path of the message it appears in, so a new field in one
+    sub-message is not hidden by a sibling message that already uses the number.
+    """
+    tags: set[tuple[int, int]] = set()
+    add = tags.add
+    path_ids = _path_ids
+    stack = [(0, len(raw), descriptor, 0, 0)]
+    while stack:
+        pos, end, current, depth, path = stack.pop()
+        fields_by_number = _fields_by_number(current) if depth < _SHAPE_DEPTH else {}
+        while pos < end:
+            tag = raw[pos]
+            if tag < 0x80:
+                pos += 1
+            else:
+                tag, pos = _read_varint(raw, pos, end)
+            add((path, tag))
+            wire_type = tag & 0x7
+            if wire_type == 0:
+                while raw[pos] & 0x80:
+                    pos += 1
+                pos += 1
+                continue
+            if wire_type == 1:
+                pos += 8
+                continue
+            if wire_type == 5:
+                pos += 4
+                continue
+            if wire_type != 2:
+                raise ValueError(f"unsupported wire type {wire_type}")
+            length = raw[pos]
+            if length < 0x80:
+                pos += 1
+            else:
+                length, pos = _read_varint(raw, pos, end)
+            field = fields_by_number.get(tag >> 3)
+            if field is not None and field.type == field.TYPE_MESSAGE:
+                key = (path, tag >> 3)
+                path_id = path_ids.get(key)
+                if path_id is None:
+                    path_id = _new_path_id(key)
+                stack.append((pos, pos + length, field.message_type, depth + 1, path_id))
+            pos += length
+    return hash(frozenset(tags))
+
+
+def _needs_diagnosis(raw_bytes: bytes, descriptor, sample_rate: float) -> bool:
+    if sample_rate and random.random() < sample_rate:
+        return True
+    try:
+        shape = (descriptor.full_name, _shape_fingerprint(raw_bytes, descriptor))
+    except (ValueError, IndexError):
+        # Malformed wire data — let the full scan report what it can
+        return True
+
+    with _shape_lock:
+        if shape in _checked_shapes:
+            return False
+        if len(_checked_shapes) >= _SHAPE_CACHE_MAX:
+            _checked_shapes.clear()
+        _checked_shapes.add(shape)
+    return True
+
+
+def diagnose_proto_message(
+    message, raw_bytes: bytes, descriptor, *, label: str, sample_rate: float = DEFAULT_SAMPLE_RATE
+) -> None:
     """Run scanner + roundtrip together; roundtrip stays DEBUG when scanner is clean.
 
     Rationale: a roundtrip size mismatch without an unknown-field finding is
     almost always proto3 default-omission (server sends ``value: 0`` explicitly,
     re-serialization drops it). That's cosmetic — surfacing it as WARNING just
     adds noise once the descriptor is actually complete.
+
+    Messages whose shape was already checked are only diagnosed at sample_rate (0..1).
     """
+    needed = _needs_diagnosis(raw_bytes, descriptor, sample_rate)
+    with _shape_lock:
+        _shape_stats["scanned" if needed else "skipped"] += 1
+    if not needed:
+        return
+
     unknowns = warn_on_unknown_fields_from_bytes(raw_bytes, descriptor, label=label)
 
     try:
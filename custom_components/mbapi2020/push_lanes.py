@@ -0,0 +1,219 @@
+"""Route websocket frames into per-VIN lanes worked off by a bounded set of tasks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import logging
+
+from .helper import LogHelper as loghelper
+from .proto import vehicle_events_pb2
+from .proto_diag import _decode_varint, _skip_field
+
+LOGGER = logging.getLogger(__name__)
+
+# PushMessage members holding a map keyed by VIN; their frames can be routed to a car lane.
+_VIN_MAP_MESSAGES = {
+    "vepUpdates": "updates",
+    "vehicle_status_updates": "vehicle_status_updates",
+    "apptwin_command_status_updates_by_vin": "updates_by_vin",
+}
+
+_PUSH_MESSAGE_DESCRIPTOR = vehicle_events_pb2.PushMessage.DESCRIPTOR
+_MSG_ONEOF_NUMBERS = frozenset(field.number for field in _PUSH_MESSAGE_DESCRIPTOR.oneofs_by_name["msg"].fields)
+
+
+def _vin_map_fields() -> dict[int, int]:
+    """Return PushMessage field number -> number of the VIN keyed map field in that member."""
+    vin_map_fields = {}
+    for msg_type, map_field in _VIN_MAP_MESSAGES.items():
+        field = _PUSH_MESSAGE_DESCRIPTOR.fields_by_name[msg_type]
+        vin_map_fields[field.number] = field.message_type.fields_by_name[map_field].number
+    return vin_map_fields
+
+
+_VIN_MAP_FIELDS = _vin_map_fields()
+
+
+def _iter_length_delimited(raw: bytes, pos: int, end: int, field_number: int):
+    """Yield (start, end) of every length-delimited field_number between pos and end."""
+    while pos < end:
+        tag, pos = _decode_varint(raw, pos)
+        if tag == (field_number << 3) | 2:
+            length, pos = _decode_varint(raw, pos)
+            yield pos, pos + length
+            pos += length
+        else:
+            pos = _skip_field(raw, pos, tag & 0x7)
+    if pos != end:
+        raise ValueError("truncated message")
+
+
+def route_vin(raw: bytes) -> str | None:
+    """Return the VIN a PushMessage frame belongs to, None for account-level or multi-car frames."""
+    msg_field: tuple[int, int, int] | None = None
+    pos = 0
+    end = len(raw)
+    try:
+        while pos < end:
+            tag, pos = _decode_varint(raw, pos)
+            field_number = tag >> 3
+            if field_number in _MSG_ONEOF_NUMBERS and tag & 0x7 == 2:
+                length, pos = _decode_varint(raw, pos)
+                msg_field = (field_number, pos, pos + length)
+                pos += length
+            else:
+                pos = _skip_field(raw, pos, tag & 0x7)
+        if pos != end or msg_field is None or msg_field[0] not in _VIN_MAP_FIELDS:
+            return None
+
+        vins = set()
+        for entry_start, entry_end in _iter_length_delimited(
+            raw, msg_field[1], msg_field[2], _VIN_MAP_FIELDS[msg_field[0]]
+        ):
+            # Map entries carry the key as field 1
+            for key_start, key_end in _iter_length_delimited(raw, entry_start, entry_end, 1):
+                vins.add(raw[key_start:key_end])
+    except ValueError:
+        return None
+
+    if len(vins) != 1:
+        return None
+    return vins.pop().decode("utf-8", errors="replace")
+
+
+def _attribute_time(attribute: dict) -> int:
+    if timestamp_in_ms := attribute.get("timestamp_in_ms"):
+        return int(timestamp_in_ms)
+    return int(attribute.get("timestamp") or 0) * 1000
+
+
+def merge_car_updates(updates: list[dict]) -> dict:
+    """Merge partial car updates (oldest first) into one, keeping the newest value of each attribute.
+
+    Attributes are compared by timestamp; on a tie the later update wins. Everything else is taken
+    from the last update.
+    """
+    attributes: dict[str, dict] = {}
+    for update in updates:
+        for name, attribute in update.get("attributes", {}).items():
+            current = attributes.get(name)
+            if current is None or _attribute_time(attribute) >= _attribute_time(current):
+                attributes[name] = attribute
+
+    merged = dict(updates[-1])
+    merged["attributes"] = attributes
+    return merged
+
+
+class PushLanes:
+    """Process frames of one car in order, different cars concurrently.
+
+    Each VIN gets a FIFO lane. A lane is handed to at most one worker at a time and goes back to the
+    end of the ready queue after each frame, so a car with a backlog cannot starve the others.
+    Frames without a single VIN wait until all lanes are drained and keep their global position.
+
+    With process_batch set, a worker hands all frames queued on a lane to it at once so they can be
+    merged. With max_pending set, dispatch waits while that many frames are queued.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[bytes], Awaitable[None]],
+        workers: int,
+        name: str = "mbapi2020",
+        process_batch: Callable[[list[bytes]], Awaitable[None]] | None = None,
+        max_pending: int = 0,
+    ) -> None:
+        """Initialize the lanes."""
+        self._process = process
+        self._process_batch = process_batch
+        self._worker_count = max(1, workers)
+        self._name = name
+        self._max_pending = max_pending
+        self._pending = 0
+        self._lanes: dict[str, deque[bytes]] = {}
+        self._ready: asyncio.Queue[str] = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        """Return the number of frames waiting in the lanes."""
+        return self._pending
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self._name}.lane{index}") for index in range(self._worker_count)
+        ]
+
+    async def stop(self) -> int:
+        """Cancel the workers and drop all queued frames; return the number of dropped frames."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        dropped = self._pending
+        self._pending = 0
+        self._lanes.clear()
+        self._ready = asyncio.Queue()
+        self._idle.set()
+        self._space.set()
+        return dropped
+
+    async def dispatch(self, frame: bytes) -> None:
+        """Queue a frame on its car lane, or process it in place once all lanes are drained."""
+        vin = route_vin(frame)
+        if vin is None:
+            await self._idle.wait()
+            await self._process(frame)
+            return
+
+        while self._max_pending and self._pending >= self._max_pending:
+            self._space.clear()
+            await self._space.wait()
+
+        self._pending += 1
+        if (lane := self._lanes.get(vin)) is not None:
+            # Lane is queued or being worked on, the worker reschedules it
+            lane.append(frame)
+            return
+
+        self._lanes[vin] = deque((frame,))
+        self._idle.clear()
+        self._ready.put_nowait(vin)
+
+    async def _worker(self) -> None:
+        while True:
+            vin = await self._ready.get()
+            lane = self._lanes[vin]
+            if self._process_batch and len(lane) > 1:
+                frames = list(lane)
+                lane.clear()
+            else:
+                frames = [lane.popleft()]
+            self._pending -= len(frames)
+            self._space.set()
+            try:
+                if len(frames) > 1:
+                    await self._process_batch(frames)
+                else:
+                    await self._process(frames[0])
+            except Exception as err:  # noqa: BLE001 - one bad frame must not stop the lane
+                LOGGER.error("Error processing frame for lane %s: %s", loghelper.Mask_VIN(vin), err)
+            finally:
+                if lane:
+                    self._ready.put_nowait(vin)
+                else:
+                    del self._lanes[vin]
+                    if not self._lanes:
+                        self._idle.set()
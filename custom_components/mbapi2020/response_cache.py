@@ -0,0 +1,109 @@
+"""Bounded cache of REST responses with a lifetime per entry and HTTP validators."""
+
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+import copy
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import time
+from typing import Any
+
+# Cached responses kept at most, the least recently used one is dropped first
+DEFAULT_MAX_ENTRIES = 128
+# Seconds after a change before the persisted cache is written
+CACHE_SAVE_DELAY = 30
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    expires: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ResponseCache:
+    """Responses by URL, valid for the lifetime given when stored.
+
+    Expired entries are kept for a conditional request: if the server answers 304, the entry is
+    valid for another lifetime. Values are returned as copies, callers may change them.
+    """
+
+    MISSING = _MISSING
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.counters = Counter(hits=0, misses=0, revalidated=0, stored=0, evicted=0)
+
+    def get(self, key: str) -> Any:
+        """Return the valid value of key or MISSING."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= time.time():
+            self.counters["misses"] += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.counters["hits"] += 1
+        return copy.deepcopy(entry.value)
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Return the conditional request headers for the stored value of key."""
+        entry = self._entries.get(key)
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidate(self, key: str, ttl: timedelta) -> Any:
+        """Keep the stored value of key for another ttl after a 304 answer and return it, MISSING if dropped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        entry.expires = time.time() + ttl.total_seconds()
+        self._entries.move_to_end(key)
+        self.counters["revalidated"] += 1
+        return copy.deepcopy(entry.value)
+
+    def store(
+        self,
+        key: str,
+        value: Any,
+        ttl: timedelta,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store value for ttl with the validators of the response."""
+        self._entries[key] = _CacheEntry(copy.deepcopy(value), time.time() + ttl.total_seconds(), etag, last_modified)
+        self._entries.move_to_end(key)
+        self.counters["stored"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evicted"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters, the hit ratio and the number of entries."""
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    def dump(self) -> dict[str, Any]:
+        """Return the entries as JSON serializable dict."""
+        return {"entries": {key: asdict(entry) for key, entry in self._entries.items()}}
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Add the entries of a dump, oldest first."""
+        for key, entry in (data.get("entries") or {}).items():
+            self._entries[key] = _CacheEntry(**entry)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
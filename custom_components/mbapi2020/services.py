@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
@@ -12,6 +12,8 @@ from .const import (
     CONF_VIN,
     DOMAIN,
     LOGGER,
+    SERVICE_ATTRIBUTE_HISTORY,
+    SERVICE_ATTRIBUTE_HISTORY_SCHEMA,
     SERVICE_AUXHEAT_CONFIGURE,
     SERVICE_AUXHEAT_CONFIGURE_SCHEMA,
     SERVICE_AUXHEAT_START,
@@ -26,6 +28,8 @@ from .const import (
     SERVICE_DOWNLOAD_IMAGES,
     SERVICE_ENGINE_START,
     SERVICE_ENGINE_STOP,
+    SERVICE_PIPELINE_STATS,
+    SERVICE_PIPELINE_STATS_SCHEMA,
     SERVICE_PRECONDITIONING_CONFIGURE,
     SERVICE_PRECONDITIONING_CONFIGURE_SCHEMA,
     SERVICE_PRECONDITIONING_CONFIGURE_SEATS,
@@ -243,6 +247,29 @@ def setup_services(hass: HomeAssistant) -> None:
     async def download_images(call) -> None:
         await domain[_get_config_entryid(call.data.get(CONF_VIN))].client.download_images(call.data.get(CONF_VIN))
 
+    async def pipeline_stats(call) -> None:
+        for key in iter(domain):
+            if isinstance(domain[key], DataUpdateCoordinator) and domain[key].client:
+                stats = domain[key].client.pipeline_stats
+                stats.enabled = call.data.get("enabled")
+                if call.data.get("reset"):
+                    stats.reset()
+
+    async def attribute_history(call: ServiceCall) -> ServiceResponse:
+        vin = call.data.get(CONF_VIN)
+        for key in iter(domain):
+            if isinstance(domain[key], DataUpdateCoordinator) and domain[key].client and vin in domain[key].client.cars:
+                history = domain[key].client.cars[vin].attribute_history
+                if history is None:
+                    raise ServiceValidationError(
+                        "No attribute history recorded for this car. Set the history size in the integration options."
+                    )
+                return history.stats(call.data.get("attribute"), call.data.get("window"))
+
+        raise ServiceValidationError(
+            "Given VIN/FIN is not managed by any coordinator or excluded in the integration options."
+        )
+
     # Register all the above services
     service_mapping = [
         (
@@ -268,6 +295,7 @@ def setup_services(hass: HomeAssistant) -> None:
         (SERVICE_DOWNLOAD_IMAGES, download_images, SERVICE_VIN_SCHEMA),
         (SERVICE_ENGINE_START, engine_start, SERVICE_VIN_PIN_SCHEMA),
         (SERVICE_ENGINE_STOP, engine_stop, SERVICE_VIN_SCHEMA),
+        (SERVICE_PIPELINE_STATS, pipeline_stats, SERVICE_PIPELINE_STATS_SCHEMA),
         #        (SERVICE_HV_BATTERY_START_CONDITIONING, hv_battery_start_conditioning, SERVICE_VIN_SCHEMA),
         #        (SERVICE_HV_BATTERY_STOP_CONDITIONING, hv_battery_stop_conditioning, SERVICE_VIN_SCHEMA),
         (
@@ -305,12 +333,20 @@ def setup_services(hass: HomeAssistant) -> None:
 
     for service_name, service_handler, schema in service_mapping:
         hass.services.async_register(DOMAIN, service_name, service_handler, schema=schema)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ATTRIBUTE_HISTORY,
+        attribute_history,
+        schema=SERVICE_ATTRIBUTE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 def remove_services(hass: HomeAssistant) -> None:
     """Remove the services for the MBAPI2020 integration."""
 
     LOGGER.debug("Start unload component. Services")
+    hass.services.async_remove(DOMAIN, SERVICE_ATTRIBUTE_HISTORY)
     hass.services.async_remove(DOMAIN, SERVICE_AUXHEAT_CONFIGURE)
     hass.services.async_remove(DOMAIN, SERVICE_AUXHEAT_START)
     hass.services.async_remove(DOMAIN, SERVICE_AUXHEAT_STOP)
@@ -322,6 +358,7 @@ def remove_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_DOWNLOAD_IMAGES)
     hass.services.async_remove(DOMAIN, SERVICE_ENGINE_START)
     hass.services.async_remove(DOMAIN, SERVICE_ENGINE_STOP)
+    hass.services.async_remove(DOMAIN, SERVICE_PIPELINE_STATS)
     #    hass.services.async_remove(DOMAIN, SERVICE_HV_BATTERY_START_CONDITIONING)
     #    hass.services.async_remove(DOMAIN, SERVICE_HV_BATTERY_STOP_CONDITIONING)
     hass.services.async_remove(DOMAIN, SERVICE_PRECONDITIONING_CONFIGURE)
@@ -40,13 +40,18 @@ async def system_health_info(hass: HomeAssistant):
         else:
             websocket_connection_state = "unknown"
 
-        return {
+        info = {
             "api_endpoint_reachable": system_health.async_check_can_reach_url(hass, REST_API_BASE),
             "websocket_connection_state": websocket_connection_state,
             "cars_connected": used_cars,
-            "version": integration.manifest.get("version"),
         }
 
+        if first_coordinator and first_coordinator.client and first_coordinator.client.pipeline_stats.enabled:
+            info.update(first_coordinator.client.pipeline_stats.summary())
+
+        info["version"] = integration.manifest.get("version")
+        return info
+
     return {
         "status": "Disabled/Deleted",
         "version": integration.manifest.get("version"),
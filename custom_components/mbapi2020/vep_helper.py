@@ -0,0 +1,128 @@
+"""Decode VEPUpdate protobuf messages into the internal vepUpdate format."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import math
+from typing import Any
+
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+
+from .proto import vehicle_events_pb2
+
+# The dict shape produced here is the one ``json.loads(MessageToJson(...,
+# preserving_proto_field_name=True))`` used to return, so every handler in
+# client.py keeps reading the same keys. Walking the typed message directly
+# skips the JSON string that was built only to be parsed again.
+
+_ATTRIBUTE_DESCRIPTOR = vehicle_events_pb2.VehicleAttributeStatus.DESCRIPTOR
+_ONEOF_UNIT = "display_unit"
+_ONEOF_VALUE = "attribute_type"
+
+
+def _convert_int64(value: int) -> str:
+    return str(value)
+
+
+def _convert_double(value: float) -> float | str:
+    if math.isinf(value):
+        return "-Infinity" if value < 0 else "Infinity"
+    if math.isnan(value):
+        return "NaN"
+    return value
+
+
+def _convert_message(value) -> dict[str, Any]:
+    # Nested payloads (charge programs, temperature points, …) are rare and
+    # arbitrarily deep — keep the reference converter for them.
+    return MessageToDict(value, preserving_proto_field_name=True)
+
+
+def _passthrough(value: Any) -> Any:
+    return value
+
+
+def _enum_converter(field: FieldDescriptor) -> Callable[[int], str | int]:
+    names = {number: value.name for number, value in field.enum_type.values_by_number.items()}
+
+    def _convert(value: int) -> str | int:
+        # Unknown enum numbers are kept as int, same as MessageToJson.
+        return names.get(value, value)
+
+    return _convert
+
+
+def json_value_converter(field: FieldDescriptor) -> Callable[[Any], Any]:
+    """Return a converter yielding what MessageToJson emits for one value of ``field``."""
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        return _convert_message
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        return _enum_converter(field)
+    if field.cpp_type in (FieldDescriptor.CPPTYPE_INT64, FieldDescriptor.CPPTYPE_UINT64):
+        return _convert_int64
+    if field.cpp_type in (FieldDescriptor.CPPTYPE_DOUBLE, FieldDescriptor.CPPTYPE_FLOAT):
+        return _convert_double
+    return _passthrough
+
+
+# Built once at import: oneof member name -> converter for its value.
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    field.name: json_value_converter(field)
+    for oneof in (_ONEOF_UNIT, _ONEOF_VALUE)
+    for field in _ATTRIBUTE_DESCRIPTOR.oneofs_by_name[oneof].fields
+}
+
+
+def decode_vep_attribute(attribute) -> dict[str, Any]:
+    """Convert one ``VehicleAttributeStatus`` into a legacy attribute dict."""
+    result: dict[str, Any] = {}
+
+    # Plain proto3 scalars are omitted when they hold their default value.
+    if timestamp := attribute.timestamp:
+        result["timestamp"] = str(timestamp)
+    if changed := attribute.changed:
+        result["changed"] = changed
+    if status := attribute.status:
+        result["status"] = status
+    if timestamp_in_ms := attribute.timestamp_in_ms:
+        result["timestamp_in_ms"] = str(timestamp_in_ms)
+    if display_value := attribute.display_value:
+        result["display_value"] = display_value
+
+    # Oneof members track presence, so they are emitted even when zero/False.
+    if unit := attribute.WhichOneof(_ONEOF_UNIT):
+        result[unit] = _CONVERTERS[unit](getattr(attribute, unit))
+    if kind := attribute.WhichOneof(_ONEOF_VALUE):
+        result[kind] = _CONVERTERS[kind](getattr(attribute, kind))
+
+    return result
+
+
+def decode_vep_car(update) -> dict[str, Any]:
+    """Convert one ``VEPUpdate`` into the dict consumed by ``Client._build_car``.
+
+    Returned shape: ``{"vin": ..., "full_update": ..., "attributes": {...}}``
+    plus the sequence/emit metadata, exactly as the former JSON round trip did.
+    """
+    car: dict[str, Any] = {}
+
+    if sequence_number := update.sequence_number:
+        car["sequence_number"] = sequence_number
+    if vin := update.vin:
+        car["vin"] = vin
+    if emit_timestamp := update.emit_timestamp:
+        car["emit_timestamp"] = str(emit_timestamp)
+    if attributes := update.attributes:
+        car["attributes"] = {key: decode_vep_attribute(value) for key, value in attributes.items()}
+    if emit_timestamp_in_ms := update.emit_timestamp_in_ms:
+        car["emit_timestamp_in_ms"] = str(emit_timestamp_in_ms)
+    if full_update := update.full_update:
+        car["full_update"] = full_update
+
+    return car
+
+
+def decode_vep_updates(updates_by_vin) -> dict[str, dict[str, Any]]:
+    """Convert a ``VEPUpdatesByVIN`` message into ``{vin: car_dict}``."""
+    return {vin: decode_vep_car(update) for vin, update in updates_by_vin.updates.items()}
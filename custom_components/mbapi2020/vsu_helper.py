@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import logging
 from typing import Any
 
+from google.protobuf.descriptor import FieldDescriptor
+
+from .proto import vehicle_events_pb2
+from .vep_helper import json_value_converter
 from .vsu_enums import VSU_ENUM_VALUE_TO_INT
 
 LOGGER = logging.getLogger(__name__)
@@ -100,13 +106,14 @@ def _iso_to_epoch_seconds(iso: str | None) -> int | None:
         return None
 
 
-def _normalize_value(legacy_key: str, value: Any, legacy: dict[str, Any]) -> None:
+def _normalize_value(legacy_key: str, value: Any, legacy: dict[str, Any], typed_keys: bool = True) -> None:
     """Translate the VSU ``value`` payload into the legacy dict in place.
 
     For most attributes the generic handler in client.py picks ``value``
     first, so we can just pass it through. Complex sub-structures
     (charge flaps, charge inlets, charging power restriction) need to be
-    re-nested into the shape the specialized handlers expect.
+    re-nested into the shape the specialized handlers expect. Without
+    typed_keys the legacy int_value/bool_value/double_value keys are left out.
     """
     if value is None:
         return
@@ -154,6 +161,8 @@ def _normalize_value(legacy_key: str, value: Any, legacy: dict[str, Any]) -> Non
             value = mapped
 
     legacy["value"] = value
+    if not typed_keys:
+        return
 
     # A handful of specialised handlers in client.py (endofchargetime,
     # precondStatus, …) still read the typed legacy keys instead of the
@@ -237,3 +246,140 @@ def normalize_vsu_car(vsu_car: dict[str, Any]) -> dict[str, Any]:
         attributes[legacy_key] = legacy_attr
 
     return legacy_car
+
+
+# --- Proto-native ingestion ------------------------------------------------
+#
+# ``normalize_vsu_car`` above works on the MessageToJson dict of a VSU car,
+# which means every attribute is copied three times (JSON string, VSU dict,
+# legacy dict). ``normalize_vsu_update`` reads the typed VehicleStatusUpdate
+# once and fills the legacy dict directly; the re-nesting and enum mapping in
+# ``_normalize_value`` are shared.
+#
+# It still builds one legacy dict per attribute: ``_build_car`` and its
+# specialised handlers read that shape, handing them the typed values would
+# mean rewriting every handler. The dict is kept small instead, the typed
+# legacy keys are only added for _TYPED_VALUE_KEYS and timestamp_in_ms, which
+# no attribute consumer reads, is left out.
+
+_VSU_RESERVED_FIELDS = frozenset({"fin_or_vin", "full_update"})
+# Attributes read through their typed legacy keys by the specialised handlers in client.py,
+# the generic handler only needs ``value``
+_TYPED_VALUE_KEYS = frozenset(
+    {
+        "endofchargetime",
+        "endofChargeTimeWeekday",
+        "precondNow",
+        "precondActive",
+        "precondOperatingMode",
+        "windowstatusfrontleft",
+        "windowstatusfrontright",
+        "windowstatusrearleft",
+        "windowstatusrearright",
+    }
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _VsuField:
+    """Per-field decoding plan, built once from the VehicleStatusUpdate descriptor."""
+
+    legacy_key: str
+    convert_value: Callable[[Any], Any]
+    value_has_presence: bool
+    unit_names: dict[int, str] | None
+    has_display_value: bool
+    typed_keys: bool
+
+
+def _enum_names(enum_type) -> dict[int, str]:
+    return {number: value.name for number, value in enum_type.values_by_number.items()}
+
+
+def _value_converter(field: FieldDescriptor) -> Callable[[Any], Any]:
+    convert = json_value_converter(field)
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        return lambda values: [convert(value) for value in values]
+    return convert
+
+
+def _build_vsu_fields() -> dict[str, _VsuField]:
+    fields: dict[str, _VsuField] = {}
+    for field in vehicle_events_pb2.VehicleStatusUpdate.DESCRIPTOR.fields:
+        if field.name in _VSU_RESERVED_FIELDS or field.message_type is None:
+            continue
+        attribute_fields = field.message_type.fields_by_name
+        value_field = attribute_fields.get("value")
+        if value_field is None:
+            continue
+        unit_field = attribute_fields.get("unit")
+        fields[field.name] = _VsuField(
+            legacy_key=_vsu_key_to_legacy(field.name),
+            convert_value=_value_converter(value_field),
+            value_has_presence=value_field.label != FieldDescriptor.LABEL_REPEATED and value_field.has_presence,
+            unit_names=_enum_names(unit_field.enum_type) if unit_field is not None else None,
+            has_display_value="display_value" in attribute_fields,
+            typed_keys=_vsu_key_to_legacy(field.name) in _TYPED_VALUE_KEYS,
+        )
+    return fields
+
+
+_VSU_FIELDS = _build_vsu_fields()
+_VSU_STATUS_BY_NUMBER: dict[int, str | int] = {
+    number: _VSU_STATUS_TO_LEGACY.get(name, name)
+    for number, name in _enum_names(vehicle_events_pb2.AttributeStatus.DESCRIPTOR).items()
+}
+
+
+def _normalize_attribute_message(plan: _VsuField, vsu_attr) -> dict[str, Any]:
+    """Convert one typed VSU attribute message into a legacy attribute dict."""
+    legacy: dict[str, Any] = {}
+
+    metadata = vsu_attr.metadata
+    if metadata.HasField("timestamp"):
+        legacy["timestamp"] = str(metadata.timestamp.seconds)
+
+    if status := metadata.status:
+        legacy["status"] = _VSU_STATUS_BY_NUMBER.get(status, status)
+
+    if plan.unit_names is not None and (unit := vsu_attr.unit):
+        unit_name = plan.unit_names.get(unit, unit)
+        legacy[_VSU_UNIT_TO_LEGACY_KEY.get(unit_name, "unit")] = unit_name
+
+    if plan.has_display_value and (display_value := vsu_attr.display_value):
+        legacy["display_value"] = display_value
+
+    # Without explicit presence proto3 drops default values on the wire, the
+    # JSON path never saw them either — keep treating them as "no value".
+    if plan.value_has_presence:
+        value = plan.convert_value(vsu_attr.value) if vsu_attr.HasField("value") else None
+    else:
+        raw = vsu_attr.value
+        value = plan.convert_value(raw) if raw else None
+
+    _normalize_value(plan.legacy_key, value, legacy, plan.typed_keys)
+
+    return legacy
+
+
+def normalize_vsu_update(vsu_update) -> dict[str, Any]:
+    """Convert one typed ``VehicleStatusUpdate`` into the ``_build_car`` dict.
+
+    Produces the attributes of ``normalize_vsu_car`` on the MessageToJson
+    output of the message, without the JSON detour and without the legacy keys
+    no handler reads (see the section comment above).
+    """
+    attributes: dict[str, Any] = {}
+    legacy_car: dict[str, Any] = {
+        "vin": vsu_update.fin_or_vin or None,
+        "full_update": vsu_update.full_update,
+        "attributes": attributes,
+    }
+
+    for field, vsu_attr in vsu_update.ListFields():
+        plan = _VSU_FIELDS.get(field.name)
+        if plan is None:
+            continue
+        attributes[plan.legacy_key] = _normalize_attribute_message(plan, vsu_attr)
+
+    return legacy_car
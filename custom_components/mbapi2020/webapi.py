@@ -2,21 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+from datetime import timedelta
+from http import HTTPStatus
 import json
 import logging
 import ssl
 import traceback
 import uuid
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponse, ClientSession
 from aiohttp.client_exceptions import ClientError
 import google.protobuf.message
 
 from custom_components.mbapi2020.app_version import AppVersionManager
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
 from .const import (
+    DOMAIN,
     REGION_CHINA,
     RIS_OS_VERSION,
     SYSTEM_PROXY,
@@ -27,9 +33,19 @@ from .const import (
 from .helper import UrlHelper as helper
 from .oauth import Oauth
 from .proto import vehicle_events_pb2
+from .response_cache import CACHE_SAVE_DELAY, ResponseCache
 
 LOGGER = logging.getLogger(__name__)
 
+RESPONSE_CACHE_STORAGE_VERSION = 1
+RESPONSE_CACHE_STORAGE_KEY = f"{DOMAIN}.response_cache.{{}}"
+
+# Response cache lifetimes of the endpoints with rarely changing data
+CACHE_TTL_CONFIG = timedelta(hours=6)
+CACHE_TTL_VEHICLES = timedelta(minutes=15)
+CACHE_TTL_FLEET = timedelta(hours=1)
+CACHE_TTL_RCP_SETTINGS = timedelta(hours=1)
+
 
 class WebApi:
     """Define the API object."""
@@ -49,6 +65,27 @@ class WebApi:
         self._app_version = app_version
         self.hass = hass
         self.session_id = str(uuid.uuid4()).upper()
+        self.response_cache = ResponseCache()
+        self._response_cache_store: Store[dict] | None = None
+        self._requests_in_flight: dict[tuple, asyncio.Task] = {}
+        # GET requests answered by a request already running for the same URL
+        self.coalesced_requests: int = 0
+
+    def enable_cache_persistence(self, entry_id: str) -> None:
+        """Keep the response cache in the HA storage, load it with async_load_cache."""
+        self._response_cache_store = Store(
+            self.hass, RESPONSE_CACHE_STORAGE_VERSION, RESPONSE_CACHE_STORAGE_KEY.format(entry_id), private=True
+        )
+
+    async def async_load_cache(self) -> None:
+        """Load the persisted response cache, if persistence is enabled."""
+        if self._response_cache_store is None:
+            return
+        try:
+            if data := await self._response_cache_store.async_load():
+                self.response_cache.load(data)
+        except Exception as err:  # noqa: BLE001
+            LOGGER.warning("Response cache could not be loaded: %s", err)
 
     async def _request(
         self,
@@ -57,10 +94,58 @@ class WebApi:
         rcp_headers: bool = False,
         ignore_errors: bool = False,
         return_as_json: bool = True,
+        cache_ttl: timedelta | None = None,
         **kwargs,
     ):
-        """Make a request against the API."""
+        """Make a request against the API.
+
+        GET requests with a cache_ttl are answered from the response cache while the cached value is valid.
+        Identical GET requests running at the same time share one request and its result.
+        """
+
+        if method.lower() != "get" or not set(kwargs) <= {"url"}:
+            return await self._send_request(method, endpoint, rcp_headers, ignore_errors, return_as_json, **kwargs)
+
+        url = kwargs.get("url", f"{helper.Rest_url(self._region)}{endpoint}")
 
+        cache_key = None
+        if cache_ttl and return_as_json:
+            cache_key = url
+            if (cached := self.response_cache.get(cache_key)) is not ResponseCache.MISSING:
+                return cached
+
+        flight_key = (url, rcp_headers, ignore_errors, return_as_json)
+        if (request := self._requests_in_flight.get(flight_key)) is not None:
+            self.coalesced_requests += 1
+        else:
+            request = asyncio.create_task(
+                self._send_request(
+                    method, endpoint, rcp_headers, ignore_errors, return_as_json, cache_key, cache_ttl, **kwargs
+                )
+            )
+            self._requests_in_flight[flight_key] = request
+            request.add_done_callback(lambda _: self._request_done(flight_key, request))
+
+        # Shielded, a cancelled caller does not cancel the request for the others. The task result is
+        # shared, every caller (the first one too) gets its own copy so it may change it.
+        return copy.deepcopy(await asyncio.shield(request))
+
+    def _request_done(self, flight_key: tuple, request: asyncio.Task) -> None:
+        if self._requests_in_flight.get(flight_key) is request:
+            del self._requests_in_flight[flight_key]
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        rcp_headers: bool = False,
+        ignore_errors: bool = False,
+        return_as_json: bool = True,
+        cache_key: str | None = None,
+        cache_ttl: timedelta | None = None,
+        conditional: bool = True,
+        **kwargs,
+    ):
         url = f"{helper.Rest_url(self._region)}{endpoint}"
         kwargs.setdefault("headers", {})
         kwargs.setdefault("proxy", SYSTEM_PROXY)
@@ -89,14 +174,15 @@ class WebApi:
                 "Accept-Language": "de-DE;q=1.0, en-DE;q=0.9",
             }
 
+        if cache_key and conditional:
+            kwargs["headers"].update(self.response_cache.validators(cache_key))
+
+        result = None
         try:
             if "url" in kwargs:
                 async with self._session.request(method, **kwargs) as resp:
                     # resp.raise_for_status()
-                    if return_as_json:
-                        return await resp.json(content_type=None)
-
-                    return await resp.read()
+                    result = await self._read_response(resp, return_as_json, cache_key, cache_ttl)
             else:
                 async with self._session.request(method, url, **kwargs) as resp:
                     if 400 <= resp.status < 500:
@@ -114,10 +200,7 @@ class WebApi:
                     else:
                         resp.raise_for_status()
 
-                    if return_as_json:
-                        return await resp.json(content_type=None)
-
-                    return await resp.read()
+                    result = await self._read_response(resp, return_as_json, cache_key, cache_ttl)
 
         except ClientError as err:
             LOGGER.debug(traceback.format_exc())
@@ -128,9 +211,45 @@ class WebApi:
         except Exception:
             LOGGER.debug(traceback.format_exc())
 
+        if result is ResponseCache.MISSING:
+            if not conditional:
+                return None
+            # 304 for an entry dropped from the cache meanwhile, ask again without the validators
+            LOGGER.debug("Cached response of %s dropped, requesting it again", endpoint)
+            return await self._send_request(
+                method, endpoint, rcp_headers, ignore_errors, return_as_json, cache_key, cache_ttl, False, **kwargs
+            )
+        return result
+
+    async def _read_response(
+        self,
+        resp: ClientResponse,
+        return_as_json: bool,
+        cache_key: str | None,
+        cache_ttl: timedelta | None,
+    ):
+        if cache_key and resp.status == HTTPStatus.NOT_MODIFIED:
+            return self.response_cache.revalidate(cache_key, cache_ttl)
+
+        if not return_as_json:
+            return await resp.read()
+
+        result = await resp.json(content_type=None)
+        if cache_key and result is not None and 200 <= resp.status < 300:
+            self.response_cache.store(
+                cache_key,
+                result,
+                cache_ttl,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+            if self._response_cache_store is not None:
+                self._response_cache_store.async_delay_save(self.response_cache.dump, CACHE_SAVE_DELAY)
+        return result
+
     async def get_config(self):
         """Get standard user information."""
-        return await self._request("get", "/v1/config")
+        return await self._request("get", "/v1/config", cache_ttl=CACHE_TTL_CONFIG)
 
     async def get_user(self):
         """Get standard user information."""
@@ -138,10 +257,11 @@ class WebApi:
 
     async def get_user_info(self):
         """Get all devices associated with an API key."""
-        return await self._request("get", "/v2/vehicles")
+        return await self._request("get", "/v2/vehicles", cache_ttl=CACHE_TTL_VEHICLES)
 
     async def get_car_capabilities(self, vin: str):
         """Get all car capabilities associated with an vin."""
+        # Not cached here, CapabilityDiscovery keeps the capabilities and refreshes them on its own schedule
         return await self._request("get", f"/v1/vehicle/{vin}/capabilities")
 
     async def get_car_capabilities_commands(self, vin: str):
@@ -153,7 +273,7 @@ class WebApi:
         url = f"{helper.RCP_url(self._region)}/api/v1/vehicles/{vin}/settings"
 
         LOGGER.debug("get_car_rcp_supported_settings: %s", url)
-        return await self._request("get", "", url=url, rcp_headers=True)
+        return await self._request("get", "", url=url, rcp_headers=True, cache_ttl=CACHE_TTL_RCP_SETTINGS)
 
     async def get_car_rcp_settings(self, vin: str, setting: str):
         """Get all rcp setting for a car."""
@@ -198,7 +318,7 @@ class WebApi:
     async def get_fleet_info(self, company: str, fleet: str):
         """Get fleet information."""
         url = f"/v1/company/{company}/fleet/{fleet}?size=100&filter="
-        return await self._request("get", url, rcp_headers=False, ignore_errors=True)
+        return await self._request("get", url, rcp_headers=False, ignore_errors=True, cache_ttl=CACHE_TTL_FLEET)
 
     async def is_car_rcp_supported(self, vin: str, **kwargs):
         """Return if is car rcp supported."""
@@ -8,6 +8,7 @@ import contextlib  # NEW
 from datetime import datetime, timezone
 import logging
 import time
+from typing import Any
 import uuid
 
 from aiohttp import ClientSession, WSMsgType, WSServerHandshakeError, client_exceptions
@@ -18,6 +19,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .ack_helper import build_ack, scan_ack_only
 from .const import (
     DOMAIN,
     REGION_CHINA,
@@ -28,7 +30,9 @@ from .const import (
     VERIFY_SSL,
     WEBSOCKET_USER_AGENT,
 )
-from .proto_diag import diagnose_proto_message
+from .pipeline_stats import PipelineStats
+from .proto_diag import DEFAULT_SAMPLE_RATE, diagnose_proto_message
+from .push_lanes import PushLanes, merge_car_updates
 from .helper import LogHelper as loghelper, UrlHelper as helper, Watchdog
 from .oauth import Oauth
 from .proto import vehicle_events_pb2
@@ -38,14 +42,33 @@ DEFAULT_WATCHDOG_TIMEOUT_CARCOMMAND = 180
 INITIAL_WATCHDOG_TIMEOUT = 30
 PING_WATCHDOG_TIMEOUT = 32
 RECONNECT_WATCHDOG_TIMEOUT = 60
+# Seconds between watchdog re-arms while a full receive queue is drained
+QUEUE_FULL_REARM_INTERVAL = 10
 STATE_CONNECTED = "connected"
 STATE_RECONNECTING = "reconnecting"
 INITIATE_RELOGIN_AFTER_429 = True
 MAX_RELOGIN_ATTEMPTS = 3
+QUEUE_LANE_WORKERS = 4
+
+# Push message types whose partial car updates can be merged, with the member used to ack them
+_MERGEABLE_ACK_FIELDS = {
+    "vepUpdates": "acknowledge_vep_updates_by_vin",
+    "vehicle_status_updates": "acknowledge_vehicle_status_updates",
+}
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _mergeable_type(message, prepared) -> str | None:
+    """Return the message type if message is a partial update of a single car, else None."""
+    msg_type = message.WhichOneof("msg") if message is not None else None
+    if msg_type not in _MERGEABLE_ACK_FIELDS or not prepared or len(prepared) != 1:
+        return None
+    if next(iter(prepared.values())).get("full_update"):
+        return None
+    return msg_type
+
+
 class _PrefixAdapter(logging.LoggerAdapter):
     """Logger adapter that prefixes messages with config entry and instance ID."""
 
@@ -67,6 +90,12 @@ class Websocket:
         session_id=str(uuid.uuid4()).upper(),
         ignition_states: dict[str, bool] | None = None,
         app_version: AppVersionManager | None = None,
+        executor_decode_min_size: int = 0,
+        ack_only_fast_path: bool = True,
+        receive_queue_size: int = 0,
+        merge_partial_updates: bool = False,
+        stats: PipelineStats | None = None,
+        proto_diag_sample_rate: float = DEFAULT_SAMPLE_RATE,
     ) -> None:
         """Initialize."""
         Websocket._instance_counter += 1
@@ -78,6 +107,13 @@ class Websocket:
         self._hass: HomeAssistant = hass
         self.is_stopping: bool = False
         self._on_data_received: Callable[..., Awaitable] = None
+        self._on_data_prepare: Callable[..., Any] | None = None
+        self.executor_decode_min_size: int = executor_decode_min_size
+        self.ack_only_fast_path: bool = ack_only_fast_path
+        self.merge_partial_updates: bool = merge_partial_updates
+        self.proto_diag_sample_rate: float = proto_diag_sample_rate
+        self.merged_frames: int = 0
+        self.stats: PipelineStats = stats or PipelineStats()
         self._connection = None
         self._region = region
         self._app_version = app_version or AppVersionManager(region)
@@ -112,8 +148,16 @@ class Websocket:
             Websocket._instance_counter,
             id(self),
         )
-        self._queue = asyncio.Queue()
+        # receive_queue_size bounds the frames waiting in the queue and again in the car lanes (0 = unbounded)
+        self._queue = asyncio.Queue(maxsize=receive_queue_size)
         self._queue_shutdown_sentinel = object()  # Sentinel für graceful shutdown
+        self._lanes = PushLanes(
+            self._process_frame,
+            QUEUE_LANE_WORKERS,
+            name="mbapi2020.queue",
+            process_batch=self._process_frames,
+            max_pending=receive_queue_size,
+        )
         self.session_id = session_id
         self._ignition_states: dict[str, bool] = ignition_states
         self.ws_connect_retry_counter_reseted: bool = False
@@ -173,11 +217,15 @@ class Websocket:
             return True
         return getattr(client, "websocket", None) is not self
 
-    async def async_connect(self, on_data=None) -> None:
-        """Connect to the socket."""
+    async def async_connect(self, on_data=None, on_data_prepare=None) -> None:
+        """Connect to the socket.
+
+        on_data_prepare is called with each parsed message before on_data and must be thread-safe,
+        its result is handed to on_data.
+        """
         # Cancel reconnect watchdog for manual connections
         self._reconnectwatchdog.cancel(graceful=True)
-        await self._async_connect_internal(on_data)
+        await self._async_connect_internal(on_data, on_data_prepare)
 
     async def _force_immediate_reconnect_for_command(self) -> None:
         """Bypass the reconnect cooldown for user-initiated car commands.
@@ -192,7 +240,7 @@ class Websocket:
         self._reconnectwatchdog.cancel(graceful=True)
         self.is_stopping = False
 
-    async def _async_connect_internal(self, on_data=None) -> None:
+    async def _async_connect_internal(self, on_data=None, on_data_prepare=None) -> None:
         """Internal connect method without cancelling reconnect watchdog."""
         if self.is_connecting:
             return
@@ -213,6 +261,8 @@ class Websocket:
 
         if on_data:
             self._on_data_received = on_data
+        if on_data_prepare:
+            self._on_data_prepare = on_data_prepare
 
         self.is_connecting = True
         self.is_stopping = False
@@ -366,7 +416,12 @@ class Websocket:
 
     async def _start_queue_handler(self):
         """Start the queue handler - entry point for the task."""
-        await self._queue_handler()
+        self._lanes.start()
+        try:
+            await self._queue_handler()
+        finally:
+            if dropped := await self._lanes.stop():
+                self._LOGGER.debug("Dropped %d frames queued in car lanes", dropped)
 
     async def _queue_handler(self):
         while not self.is_stopping:
@@ -380,34 +435,25 @@ class Websocket:
                     self._queue.task_done()
                     break
 
-                try:
-                    message = vehicle_events_pb2.PushMessage()
-                    message.ParseFromString(data)
-                except TypeError as err:
-                    self._LOGGER.error("could not decode data (%s) from websocket: %s", data, err)
-                    self._queue.task_done()
-                    continue
-
-                if message is None:
+                # Messages that only need an ack are answered without parsing the PushMessage
+                if self.ack_only_fast_path and (ack_only := scan_ack_only(data)):
+                    msg_type, ack_field, sequence_number = ack_only
+                    self._LOGGER.debug("Got notification: %s (ack only) Sequence: %s", msg_type, sequence_number)
+                    if self.ws_connect_retry_counter > 0:
+                        self.ws_connect_retry_counter = 0
+                        self.ws_connect_retry_counter_reseted = True
+                    try:
+                        started = self.stats.start()
+                        await self.call(build_ack(ack_field, sequence_number).SerializeToString())
+                        self.stats.stop("ack", msg_type, started)
+                    except Exception as err:
+                        self._LOGGER.error("Error processing queue message: %s", err)
                     self._queue.task_done()
                     continue
 
-                msg_type = message.WhichOneof("msg")
-                self._LOGGER.debug("Got notification: %s", msg_type)
-
-                if msg_type == "vehicle_status_updates":
-                    diagnose_proto_message(message, data, message.DESCRIPTOR, label=msg_type)
-
-                try:
-                    ack_message = self._on_data_received(message)
-                    if ack_message:
-                        if isinstance(ack_message, str):
-                            await self.call(bytes.fromhex(ack_message))
-                        else:
-                            await self.call(ack_message.SerializeToString())
-                except Exception as err:
-                    self._LOGGER.error("Error processing queue message: %s", err)
-
+                # Car frames continue on their VIN lane, account-level frames run here in order
+                await self._lanes.dispatch(data)
+                self.stats.depth("car_lanes", self._lanes.pending)
                 self._queue.task_done()
 
             except asyncio.TimeoutError:
@@ -422,6 +468,127 @@ class Websocket:
 
         self._LOGGER.debug("Queue handler stopped")
 
+    def queue_statistics(self) -> dict[str, int]:
+        """Return the fill level of the receive queue and the number of merged frames."""
+        return {
+            "queue_size": self._queue.qsize(),
+            "queue_maxsize": self._queue.maxsize,
+            "lane_pending": self._lanes.pending,
+            "merged_frames": self.merged_frames,
+        }
+
+    async def _decode_frame(self, data: bytes):
+        # Big payloads are decoded on a worker thread. Frames of one car are awaited one
+        # after another, so their processing and ack order stay unchanged.
+        if self.executor_decode_min_size and len(data) >= self.executor_decode_min_size:
+            return await self._hass.async_add_executor_job(self._decode_message, data)
+        return self._decode_message(data)
+
+    async def _process_frame(self, data: bytes) -> None:
+        try:
+            message, prepared = await self._decode_frame(data)
+        except TypeError as err:
+            self._LOGGER.error("could not decode data (%s) from websocket: %s", data, err)
+            return
+
+        await self._handle_message(message, prepared)
+
+    async def _process_frames(self, frames: list[bytes]) -> None:
+        """Process the frames queued for one car, merging consecutive partial updates."""
+        if not self.merge_partial_updates:
+            for data in frames:
+                await self._process_frame(data)
+            return
+
+        run: list[tuple] = []
+        run_type: str | None = None
+        for data in frames:
+            try:
+                message, prepared = await self._decode_frame(data)
+            except TypeError as err:
+                self._LOGGER.error("could not decode data (%s) from websocket: %s", data, err)
+                continue
+
+            msg_type = _mergeable_type(message, prepared)
+            if run and msg_type != run_type:
+                await self._handle_merged(run, run_type)
+                run = []
+            if msg_type is None:
+                await self._handle_message(message, prepared)
+                continue
+            run.append((message, prepared))
+            run_type = msg_type
+
+        if run:
+            await self._handle_merged(run, run_type)
+
+    async def _handle_merged(self, run: list[tuple], msg_type: str) -> None:
+        message, prepared = run[-1]
+        if len(run) == 1:
+            await self._handle_message(message, prepared)
+            return
+
+        vin = next(iter(prepared))
+        merged = merge_car_updates([frame_prepared[vin] for _, frame_prepared in run])
+        # The merged update is applied once, but every sequence number still gets its ack
+        acks = [
+            build_ack(_MERGEABLE_ACK_FIELDS[msg_type], getattr(frame_message, msg_type).sequence_number)
+            for frame_message, _ in run[:-1]
+        ]
+        self.merged_frames += len(run) - 1
+        self._LOGGER.debug("Merged %d partial %s frames for %s", len(run), msg_type, loghelper.Mask_VIN(vin))
+        await self._handle_message(message, {vin: merged}, acks)
+
+    async def _handle_message(self, message, prepared, preceding_acks: list | None = None) -> None:
+        if message is None:
+            return
+
+        msg_type = message.WhichOneof("msg")
+        self._LOGGER.debug("Got notification: %s", msg_type)
+
+        try:
+            started = self.stats.start()
+            ack_message = self._on_data_received(message, prepared)
+            self.stats.stop("on_data", msg_type, started)
+
+            started = self.stats.start()
+            for ack in preceding_acks or ():
+                await self.call(ack.SerializeToString())
+            if ack_message:
+                if isinstance(ack_message, str):
+                    await self.call(bytes.fromhex(ack_message))
+                else:
+                    await self.call(ack_message.SerializeToString())
+            self.stats.stop("ack", msg_type, started)
+        except Exception as err:
+            self._LOGGER.error("Error processing queue message: %s", err)
+
+    def _decode_message(self, data: bytes):
+        """Parse a websocket payload and run the thread-safe preparation of its content."""
+        started = self.stats.start()
+        message = vehicle_events_pb2.PushMessage()
+        message.ParseFromString(data)
+        msg_type = message.WhichOneof("msg")
+        self.stats.stop("parse", msg_type, started)
+
+        if msg_type == "vehicle_status_updates":
+            started = self.stats.start()
+            diagnose_proto_message(
+                message, data, message.DESCRIPTOR, label=msg_type, sample_rate=self.proto_diag_sample_rate
+            )
+            self.stats.stop("diagnose", msg_type, started)
+
+        prepared = None
+        if self._on_data_prepare:
+            try:
+                started = self.stats.start()
+                prepared = self._on_data_prepare(message)
+                self.stats.stop("prepare", msg_type, started)
+            except Exception as err:  # noqa: BLE001 - on_data decodes the message itself then
+                self._LOGGER.debug("Preparing %s message failed: %s", msg_type, err)
+
+        return message, prepared
+
     async def _start_websocket_handler(self, session: ClientSession):
         retry_in: int = 10
 
@@ -537,9 +704,31 @@ class Websocket:
                 self._LOGGER.debug("websocket connection is closing - message type error.")
                 break
             if msg.type == WSMsgType.BINARY:
-                self._queue.put_nowait(msg.data)
+                # A frame arrived, so the connection is alive. Armed before the put, which waits while a
+                # bounded queue is full
                 await self._pingwatchdog.trigger()
                 await self._watchdog.trigger()
+                started = self.stats.start()
+                await self._put_frame(msg.data)
+                self.stats.stop("receive", "frame", started)
+                self.stats.depth("receive_queue", self._queue.qsize())
+
+    async def _put_frame(self, data: bytes) -> None:
+        """Queue a received frame, waiting for space in a bounded queue.
+
+        Reading pauses meanwhile and the server backs off. The watchdog is re-armed while the queue
+        handler drains the queue, a reconnect would drop the queued frames.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._queue.put(data), timeout=QUEUE_FULL_REARM_INTERVAL)
+            except TimeoutError:
+                if self.is_stopping or self._queue_task is None or self._queue_task.done():
+                    return
+                self._LOGGER.debug("Receive queue full (%d frames), reading paused", self._queue.qsize())
+                await self._watchdog.trigger()
+            else:
+                return
 
     async def _websocket_connection_headers(self):
         session = async_get_clientsession(self._hass, VERIFY_SSL)
@@ -0,0 +1,273 @@
+"""Benchmark the push ingest hot paths: throughput and allocations.
+
+Covers Client.on_data per message type, Client._build_car for full and partial updates,
+the VSU normalizers, the proto_diag and wire scanners and CoordinatesHelper.wgs84_to_gcj02.
+Runs on synthetic payloads with every attribute set and a fake hass: no network, no
+Home Assistant instance. If homeassistant, aiohttp or voluptuous are not installed, common.py
+stubs the parts the client modules import, so every section runs in a plain venv.
+
+Recorded frames (the files written by the debug file capture option) can be added with
+--messages; they are grouped by message type and fed to Client.on_data.
+
+Usage: python scripts/benchmarks/bench_ingest.py [--messages DIR] [--number N] [--only SECTION]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+from pathlib import Path
+import threading
+
+from common import FakeConfigEntry, FakeHass, allocations, load_component, ops_per_second, report
+
+load_component()
+
+from bench_proto_diag import build_synthetic_vsu  # noqa: E402
+from google.protobuf.json_format import MessageToJson, ParseDict  # noqa: E402
+
+from custom_components.mbapi2020 import proto_diag, vsu_helper  # noqa: E402
+from custom_components.mbapi2020.ack_helper import scan_ack_only  # noqa: E402
+from custom_components.mbapi2020.proto import acp_pb2, vehicle_events_pb2  # noqa: E402
+from custom_components.mbapi2020.vsu_helper import normalize_vsu_car, normalize_vsu_update  # noqa: E402
+
+SECTIONS = ("on_data", "build_car", "vsu", "proto_diag", "gcj02")
+VIN = "W1K00000000000001"
+# Attributes of a typical partial update: position, odometer and a door
+PARTIAL_ATTRIBUTES = ("positionLat", "positionLong", "odo", "doorstatusfrontleft")
+LISTENERS_WITHOUT_FILTER = 5
+
+
+def vsu_message(full_update: bool) -> vehicle_events_pb2.PushMessage:
+    """Return a vehicle_status_updates message, the partial one with PARTIAL_ATTRIBUTES only."""
+    message = vehicle_events_pb2.PushMessage()
+    message.ParseFromString(build_synthetic_vsu())
+    update = message.vehicle_status_updates.vehicle_status_updates[VIN]
+    update.full_update = full_update
+    # The synthetic value is no valid clock time, take 10:00 (minutes after midnight)
+    update.endofchargetime.value = 600
+    if not full_update:
+        for field, _ in update.ListFields():
+            plan = vsu_helper._VSU_FIELDS.get(field.name)
+            if plan is not None and plan.legacy_key not in PARTIAL_ATTRIBUTES:
+                update.ClearField(field.name)
+    return message
+
+
+def vep_message(full_update: bool) -> vehicle_events_pb2.PushMessage:
+    """Return a vepUpdates message carrying the attributes of the synthetic VSU."""
+    update_vsu = vsu_message(True).vehicle_status_updates.vehicle_status_updates[VIN]
+    # The JSON path keeps the typed legacy keys of every attribute, the VEP fields need them
+    vsu_car = json.loads(MessageToJson(update_vsu, preserving_proto_field_name=True))
+    attributes = normalize_vsu_car(vsu_car)["attributes"]
+    if not full_update:
+        attributes = {name: attributes[name] for name in PARTIAL_ATTRIBUTES if name in attributes}
+
+    message = vehicle_events_pb2.PushMessage()
+    message.vepUpdates.sequence_number = 1
+    update = message.vepUpdates.updates[VIN]
+    update.vin = VIN
+    update.full_update = full_update
+    update.emit_timestamp_in_ms = 1_700_000_000_000
+    for name, attribute in attributes.items():
+        # the VSU normalizer adds a plain "value" next to the typed one, VEP has no such field
+        ParseDict(attribute, update.attributes[name], ignore_unknown_fields=True)
+    return message
+
+
+def account_messages() -> dict[str, vehicle_events_pb2.PushMessage]:
+    """Return one message of each account-level type handled by on_data."""
+    messages = {}
+
+    message = vehicle_events_pb2.PushMessage()
+    message.service_status_updates.sequence_number = 7
+    messages["service_status_updates"] = message
+
+    message = vehicle_events_pb2.PushMessage()
+    message.data_change_event.sequence_number = 7
+    messages["data_change_event"] = message
+
+    message = vehicle_events_pb2.PushMessage()
+    message.debugMessage.message = "benchmark"
+    messages["debugMessage"] = message
+
+    message = vehicle_events_pb2.PushMessage()
+    message.apptwin_command_status_updates_by_vin.sequence_number = 7
+    by_vin = message.apptwin_command_status_updates_by_vin.updates_by_vin[VIN]
+    by_vin.vin = VIN
+    status = by_vin.updates_by_pid[1]
+    status.process_id = 1
+    status.state = acp_pb2.VehicleAPI.CommandState.FINISHED
+    status.timestamp_in_ms = 1_700_000_000_000
+    messages["apptwin_command_status_updates_by_vin"] = message
+
+    return messages
+
+
+def load_recorded(folder: Path) -> dict[str, list[vehicle_events_pb2.PushMessage]]:
+    """Return the recorded frames in folder grouped by message type."""
+    recorded: dict[str, list[vehicle_events_pb2.PushMessage]] = {}
+    for path in sorted(folder.iterdir()):
+        if not path.is_file() or path.suffix == ".json":
+            continue
+        message = vehicle_events_pb2.PushMessage()
+        try:
+            message.ParseFromString(path.read_bytes())
+        except Exception:  # noqa: BLE001 - not a captured frame
+            continue
+        if msg_type := message.WhichOneof("msg"):
+            recorded.setdefault(msg_type, []).append(message)
+    return recorded
+
+
+async def _dataload_complete() -> None:
+    """Stand-in for the coordinator callback fired after the first full update."""
+
+
+def create_client(hass: FakeHass):
+    """Return a client set up like after the first full update, with entity-like listeners."""
+    from custom_components.mbapi2020.client import Client  # noqa: PLC0415 - imports homeassistant
+
+    # Publish right away so the entity notification is part of on_data
+    client = Client(hass, session=None, config_entry=FakeConfigEntry({"push_coalesce_window": 0}), region="Europe")
+    client._Client__lock = threading.RLock()  # as set up outside of WSL
+    client._on_dataload_complete = _dataload_complete
+    client.on_data(vep_message(True))
+
+    car = client.cars[VIN]
+    for key in sorted(car.changed_since(0)):
+        car.add_update_listener(lambda: None, {key})
+    for _ in range(LISTENERS_WITHOUT_FILTER):
+        car.add_update_listener(lambda: None)
+    return client
+
+
+def measure(name: str, func, number: int) -> None:
+    """Time func and report it with its allocations."""
+    report(name, ops_per_second(func, number=number), memory=allocations(func, number=max(1, number // 10)))
+
+
+def bench_on_data(hass: FakeHass, number: int, recorded: dict[str, list]) -> None:
+    """Client.on_data per message type, including decoding and the entity notification."""
+    client = create_client(hass)
+    cases = {
+        "vepUpdates full": vep_message(True),
+        "vepUpdates partial": vep_message(False),
+        "vehicle_status_updates full": vsu_message(True),
+        "vehicle_status_updates partial": vsu_message(False),
+        **account_messages(),
+    }
+    for name, message in cases.items():
+        measure(f"on_data {name}", lambda m=message: client.on_data(m), number)
+
+    for msg_type, messages in sorted(recorded.items()):
+
+        def run(messages=messages) -> None:
+            for message in messages:
+                client.on_data(message)
+
+        measure(f"on_data recorded {msg_type} ({len(messages)} frames)", run, max(1, number // len(messages)))
+
+
+def bench_build_car(hass: FakeHass, number: int) -> None:
+    """Client._build_car on decoded car dicts."""
+    client = create_client(hass)
+    for name, message in (
+        ("vep full", vep_message(True)),
+        ("vep partial", vep_message(False)),
+        ("vsu full", vsu_message(True)),
+        ("vsu partial", vsu_message(False)),
+    ):
+        car = client.prepare_data(message)[VIN]
+        update_mode = not car.get("full_update")
+        # _build_car keeps a reference to full updates, hand it a fresh dict each time
+        measure(
+            f"_build_car {name}",
+            lambda c=car, u=update_mode: client._build_car(copy.copy(c), update_mode=u),
+            number,
+        )
+
+
+def bench_vsu(number: int) -> None:
+    """VSU normalizers, from the MessageToJson dict and from the typed message.
+
+    The JSON path is measured with and without the MessageToJson step it replaced.
+    """
+    for name, full_update in (("full", True), ("partial", False)):
+        message = vsu_message(full_update)
+        update = message.vehicle_status_updates.vehicle_status_updates[VIN]
+        vsu_car = json.loads(MessageToJson(update, preserving_proto_field_name=True))
+        measure(f"normalize_vsu_car {name}", lambda c=vsu_car: normalize_vsu_car(c), number)
+        measure(
+            f"MessageToJson + normalize_vsu_car {name}",
+            lambda u=update: normalize_vsu_car(json.loads(MessageToJson(u, preserving_proto_field_name=True))),
+            number,
+        )
+        measure(f"normalize_vsu_update {name}", lambda u=update: normalize_vsu_update(u), number)
+
+
+def bench_proto_diag(number: int) -> None:
+    """Unknown field scanners and the frame scanners of the receive path."""
+    raw = build_synthetic_vsu()
+    message = vehicle_events_pb2.PushMessage()
+    message.ParseFromString(raw)
+    descriptor = message.DESCRIPTOR
+
+    measure(
+        "proto_diag wire scan (vsu full)",
+        lambda: list(proto_diag._iter_unknown_fields_wire(raw, descriptor, "")),
+        number,
+    )
+    measure("proto_diag shape fingerprint (vsu full)", lambda: proto_diag._shape_fingerprint(raw, descriptor), number)
+    measure(
+        "diagnose_proto_message (known shape)",
+        lambda: proto_diag.diagnose_proto_message(
+            message, raw, descriptor, label="vehicle_status_updates", sample_rate=0
+        ),
+        number,
+    )
+
+    ack_only = account_messages()["service_status_updates"].SerializeToString()
+    measure("scan_ack_only (ack only frame)", lambda: scan_ack_only(ack_only), number * 10)
+    measure("scan_ack_only (vsu full)", lambda: scan_ack_only(raw), number)
+
+
+def bench_gcj02(number: int) -> None:
+    """WGS-84 to GCJ-02 conversion of the China region."""
+    from custom_components.mbapi2020.helper import CoordinatesHelper  # noqa: PLC0415 - imports homeassistant
+
+    measure("wgs84_to_gcj02", lambda: CoordinatesHelper.wgs84_to_gcj02(116.397, 39.909), number * 100)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the selected sections."""
+    sections = args.only or SECTIONS
+    hass = FakeHass()
+    recorded = load_recorded(args.messages) if args.messages else {}
+
+    if "on_data" in sections:
+        bench_on_data(hass, args.number, recorded)
+    if "build_car" in sections:
+        bench_build_car(hass, args.number)
+    if "vsu" in sections:
+        bench_vsu(args.number)
+    if "proto_diag" in sections:
+        bench_proto_diag(args.number)
+    if "gcj02" in sections:
+        bench_gcj02(args.number)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=Path, help="folder with recorded frames")
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    parser.add_argument("--only", action="append", choices=SECTIONS, help="run only this section (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Benchmark the proto_diag wire scanner against the former recursive implementation.
+
+Recorded payloads are the ``vsu<timestamp>`` files written by the debug file
+capture option (custom_components/mbapi2020/messages in the HA config folder).
+Without a folder a synthetic VSU covering every attribute is used, with unknown fields added at
+every nesting level so the findings of both scanners are compared on real work.
+
+Usage: python scripts/benchmarks/bench_proto_diag.py [--messages DIR] [--limit N]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from pathlib import Path
+
+from common import load_component, ops_per_second, report
+
+load_component()
+
+from google.protobuf.descriptor import FieldDescriptor  # noqa: E402
+
+from custom_components.mbapi2020 import proto_diag  # noqa: E402
+from custom_components.mbapi2020.proto import vehicle_events_pb2  # noqa: E402
+
+
+def legacy_iter_unknown_fields_wire(raw: bytes, descriptor, path: str) -> Iterator[tuple]:
+    """Recursive scanner as proto_diag shipped it before the stack-based rewrite."""
+    pos = 0
+    end = len(raw)
+    fields_by_number = {f.number: f for f in descriptor.fields} if descriptor else {}
+
+    while pos < end:
+        try:
+            tag, pos = proto_diag._decode_varint(raw, pos)
+        except ValueError:
+            return
+        field_number = tag >> 3
+        wire_type = tag & 0x7
+
+        payload = None
+        scalar_sample = None
+        if wire_type == 0:
+            try:
+                scalar_sample, pos = proto_diag._decode_varint(raw, pos)
+            except ValueError:
+                return
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            try:
+                length, pos = proto_diag._decode_varint(raw, pos)
+            except ValueError:
+                return
+            payload = raw[pos : pos + length]
+            pos += length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            return
+
+        field = fields_by_number.get(field_number)
+        if field is None:
+            sample = payload if payload is not None else scalar_sample
+            yield (path or descriptor.full_name, field_number, proto_diag._WIRE_TYPES.get(wire_type), sample)
+            continue
+
+        if wire_type == 2 and payload is not None and field.type == field.TYPE_MESSAGE and field.message_type:
+            sub_path = f"{path}.{field.name}" if path else f"{descriptor.full_name}.{field.name}"
+            yield from legacy_iter_unknown_fields_wire(payload, field.message_type, sub_path)
+
+
+def _set_sample_value(message, field: FieldDescriptor) -> None:
+    if field.type == FieldDescriptor.TYPE_MESSAGE:
+        target = getattr(message, field.name)
+        if field.label == FieldDescriptor.LABEL_REPEATED:
+            target.add()
+        else:
+            target.SetInParent()
+        return
+
+    if field.type == FieldDescriptor.TYPE_ENUM:
+        value = field.enum_type.values[-1].number
+    elif field.type == FieldDescriptor.TYPE_BOOL:
+        value = True
+    elif field.type == FieldDescriptor.TYPE_STRING:
+        value = "sample"
+    elif field.type == FieldDescriptor.TYPE_BYTES:
+        value = b"sample"
+    elif field.cpp_type in (FieldDescriptor.CPPTYPE_DOUBLE, FieldDescriptor.CPPTYPE_FLOAT):
+        value = 12.5
+    else:
+        value = 1_700_000_000
+
+    if field.label == FieldDescriptor.LABEL_REPEATED:
+        getattr(message, field.name).append(value)
+    else:
+        setattr(message, field.name, value)
+
+
+# Field numbers no message of the proto files uses
+_UNKNOWN_FIELD_NUMBERS = (999, 1000, 1001)
+
+
+def _encode_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _add_unknown_fields(message) -> None:
+    """Add an unknown varint, length-delimited and fixed32 field to message."""
+    varint, delimited, fixed32 = _UNKNOWN_FIELD_NUMBERS
+    message.MergeFromString(
+        _encode_varint(varint << 3 | 0)
+        + _encode_varint(42)
+        + _encode_varint(delimited << 3 | 2)
+        + _encode_varint(3)
+        + b"new"
+        + _encode_varint(fixed32 << 3 | 5)
+        + (1234).to_bytes(4, "little")
+    )
+
+
+def build_synthetic_vsu(unknown_fields: bool = False) -> bytes:
+    """Build a vehicle_status_updates frame with every attribute set, optionally with unknown fields on every level."""
+    message = vehicle_events_pb2.PushMessage()
+    message.vehicle_status_updates.sequence_number = 1
+    update = message.vehicle_status_updates.vehicle_status_updates["W1K00000000000001"]
+    update.fin_or_vin = "W1K00000000000001"
+    update.full_update = True
+    for field in update.DESCRIPTOR.fields:
+        if field.type != FieldDescriptor.TYPE_MESSAGE:
+            continue
+        attribute = getattr(update, field.name)
+        attribute.metadata.timestamp.seconds = 1_700_000_000
+        attribute.metadata.timestamp.nanos = 500_000_000
+        for attribute_field in attribute.DESCRIPTOR.fields:
+            if attribute_field.name != "metadata":
+                _set_sample_value(attribute, attribute_field)
+        if unknown_fields:
+            _add_unknown_fields(attribute)
+            _add_unknown_fields(attribute.metadata)
+            _add_unknown_fields(attribute.metadata.timestamp)
+    if unknown_fields:
+        _add_unknown_fields(update)
+        _add_unknown_fields(message.vehicle_status_updates)
+        _add_unknown_fields(message)
+    return message.SerializeToString()
+
+
+def load_payloads(folder: Path | None, limit: int) -> list[bytes]:
+    """Return recorded vsu payloads from ``folder``, or one synthetic payload."""
+    if folder is None:
+        return [build_synthetic_vsu(unknown_fields=True)]
+    files = sorted(path for path in folder.glob("vsu*") if path.suffix != ".json")[:limit]
+    if not files:
+        raise SystemExit(f"No recorded vsu payloads found in {folder}")
+    return [path.read_bytes() for path in files]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=Path, help="folder with recorded vsu<timestamp> files")
+    parser.add_argument("--limit", type=int, default=200, help="maximum number of recorded payloads")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.messages, args.limit)
+    descriptor = vehicle_events_pb2.PushMessage.DESCRIPTOR
+    total_size = sum(len(raw) for raw in payloads)
+
+    for raw in payloads:
+        legacy = list(legacy_iter_unknown_fields_wire(raw, descriptor, ""))
+        current = list(proto_diag._iter_unknown_fields_wire(raw, descriptor, ""))
+        assert legacy == current, "scanner findings differ"
+    if args.messages is None:
+        depths = {path.count(".") for path, *_ in current}
+        assert len(depths) > 3, "synthetic payload has too few unknown fields"
+
+    print(f"{len(payloads)} payload(s), {total_size:,} bytes in total")  # noqa: T201
+
+    def run_legacy() -> None:
+        for raw in payloads:
+            for _ in legacy_iter_unknown_fields_wire(raw, descriptor, ""):
+                pass
+
+    def run_current() -> None:
+        for raw in payloads:
+            for _ in proto_diag._iter_unknown_fields_wire(raw, descriptor, ""):
+                pass
+
+    number = max(1, args.number // len(payloads))
+    baseline = ops_per_second(run_legacy, number=number)
+    report("wire scan (recursive, slicing)", baseline)
+    report("wire scan (stack, memoryview, cached index)", ops_per_second(run_current, number=number), baseline)
+
+
+if __name__ == "__main__":
+    main()
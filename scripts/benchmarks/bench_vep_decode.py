@@ -0,0 +1,84 @@
+"""Benchmark the vepUpdates decoding against the former MessageToJson/json.loads path.
+
+Usage: python scripts/benchmarks/bench_vep_decode.py [--cars N] [--attributes M]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from common import load_component, ops_per_second, report
+
+load_component()
+
+from google.protobuf.json_format import MessageToJson  # noqa: E402
+
+from custom_components.mbapi2020.proto import vehicle_events_pb2  # noqa: E402
+from custom_components.mbapi2020.vep_helper import decode_vep_updates  # noqa: E402
+
+
+def build_message(cars: int, attributes: int, full_update: bool) -> vehicle_events_pb2.PushMessage:
+    """Build a vepUpdates push message with a typical attribute mix."""
+    message = vehicle_events_pb2.PushMessage()
+    message.vepUpdates.sequence_number = 1
+    for car_index in range(cars):
+        vin = f"W1K00000000{car_index:06d}"
+        update = message.vepUpdates.updates[vin]
+        update.vin = vin
+        update.full_update = full_update
+        update.emit_timestamp_in_ms = 1_700_000_000_000
+        for index in range(attributes):
+            attribute = update.attributes[f"attribute{index}"]
+            attribute.timestamp = 1_700_000_000
+            attribute.timestamp_in_ms = 1_700_000_000_000 + index
+            match index % 4:
+                case 0:
+                    attribute.int_value = index
+                    attribute.distance_unit = vehicle_events_pb2.VehicleAttributeStatus.KILOMETERS
+                    attribute.display_value = str(index)
+                case 1:
+                    attribute.double_value = index / 3
+                    attribute.ratio_unit = vehicle_events_pb2.VehicleAttributeStatus.PERCENT
+                case 2:
+                    attribute.bool_value = bool(index % 3)
+                case _:
+                    attribute.status = 4
+                    attribute.nil_value = True
+        points = update.attributes["temperaturePoints"].temperature_points_value.temperature_points
+        for zone in ("frontLeft", "frontRight"):
+            point = points.add()
+            point.zone = zone
+            point.temperature = 21.5
+    return message
+
+
+def legacy_decode(message: vehicle_events_pb2.PushMessage) -> dict:
+    """Decode the way client.py did before vep_helper existed."""
+    return json.loads(MessageToJson(message, preserving_proto_field_name=True))["vepUpdates"]["updates"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cars", type=int, default=3)
+    parser.add_argument("--attributes", type=int, default=150)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    for label, full_update, attributes in (
+        ("full", True, args.attributes),
+        ("partial", False, 3),
+    ):
+        message = build_message(args.cars, attributes, full_update)
+        if legacy_decode(message) != decode_vep_updates(message.vepUpdates):
+            raise SystemExit(f"{label}: decoded output differs from the MessageToJson path")
+
+        legacy = ops_per_second(lambda m=message: legacy_decode(m), number=args.number)
+        native = ops_per_second(lambda m=message: decode_vep_updates(m.vepUpdates), number=args.number)
+        report(f"vepUpdates {label} MessageToJson+json.loads", legacy)
+        report(f"vepUpdates {label} vep_helper", native, legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Shared helpers for the offline benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import gc
+import importlib.util
+from pathlib import Path
+import sys
+import timeit
+import tracemalloc
+import types
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+COMPONENT_PATH = REPO_ROOT / "custom_components" / "mbapi2020"
+
+
+class _Names:
+    """Enum stand-in, every member is its lower case name."""
+
+    def __init__(self, *_args: Any, **_kwargs: Any) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> str:
+        return name.lower()
+
+
+def _anything(*_args: Any, **_kwargs: Any) -> Callable[..., Any]:
+    """Stand-in for schema builders and validators, accepts any arguments."""
+    return _anything
+
+
+def _stub_module(name: str, **attributes: Any) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__path__ = []
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    if "." in name:
+        parent, _, child = name.rpartition(".")
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def _missing(name: str) -> bool:
+    return name not in sys.modules and importlib.util.find_spec(name) is None
+
+
+def _stub_dependencies() -> None:
+    """Register the parts of homeassistant, aiohttp and voluptuous the client modules import.
+
+    Only packages that are not installed are stubbed. The stubs are enough to import and run
+    the push ingest path; nothing that talks to Home Assistant or the network works with them.
+    """
+    if _missing("aiohttp"):
+        client_error = type("ClientError", (Exception,), {})
+        exceptions = {
+            "ClientError": client_error,
+            "InvalidURL": type("InvalidURL", (client_error,), {}),
+            "WSServerHandshakeError": type("WSServerHandshakeError", (client_error,), {}),
+        }
+        _stub_module(
+            "aiohttp",
+            **exceptions,
+            ClientResponse=object,
+            ClientSession=object,
+            CookieJar=_anything,
+            FormData=_anything,
+            WSMsgType=_Names(),
+        )
+        _stub_module("aiohttp.client_exceptions", **exceptions)
+
+    if _missing("voluptuous"):
+        _stub_module("voluptuous").__getattr__ = lambda name: _anything
+
+    if _missing("homeassistant"):
+        home_assistant_error = type("HomeAssistantError", (Exception,), {})
+        _stub_module("homeassistant")
+        _stub_module("homeassistant.components")
+        _stub_module("homeassistant.components.binary_sensor", BinarySensorDeviceClass=_Names())
+        _stub_module("homeassistant.components.sensor", SensorDeviceClass=_Names(), SensorStateClass=_Names())
+        _stub_module("homeassistant.config_entries", ConfigEntry=object)
+        _stub_module(
+            "homeassistant.const",
+            EVENT_HOMEASSISTANT_STOP="homeassistant_stop",
+            PERCENTAGE="%",
+            STATE_UNKNOWN="unknown",
+            EntityCategory=_Names(),
+            Platform=_Names(),
+        ).__getattr__ = lambda name: _Names()
+        _stub_module("homeassistant.core", Event=object, HomeAssistant=object, callback=lambda func: func)
+        _stub_module(
+            "homeassistant.exceptions",
+            HomeAssistantError=home_assistant_error,
+            ConfigEntryAuthFailed=type("ConfigEntryAuthFailed", (home_assistant_error,), {}),
+            ServiceValidationError=type("ServiceValidationError", (home_assistant_error,), {}),
+        )
+        _stub_module("homeassistant.helpers")
+        _stub_module(
+            "homeassistant.helpers.aiohttp_client",
+            async_create_clientsession=_anything,
+            async_get_clientsession=_anything,
+        )
+        _stub_module("homeassistant.helpers.config_validation").__getattr__ = lambda name: _anything
+        _stub_module("homeassistant.helpers.storage", Store=_anything)
+        _stub_module("homeassistant.helpers.system_info", async_get_system_info=_anything)
+
+
+def load_component() -> None:
+    """Make the integration modules importable without running its package __init__.
+
+    custom_components/mbapi2020/__init__.py pulls in Home Assistant. The benchmarked
+    modules do not need a running instance, so the two packages are registered with
+    their search path only and submodules are imported on demand. Home Assistant,
+    aiohttp and voluptuous are stubbed if they are not installed.
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    _stub_dependencies()
+
+    for name, path in (
+        ("custom_components", COMPONENT_PATH.parent),
+        ("custom_components.mbapi2020", COMPONENT_PATH),
+    ):
+        if name in sys.modules:
+            continue
+        module = types.ModuleType(name)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
+
+
+def ops_per_second(func: Callable[[], object], *, number: int = 1000, repeat: int = 5) -> float:
+    """Return the best-of-``repeat`` throughput of ``func`` in calls per second."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return number / best if best else float("inf")
+
+
+def allocations(func: Callable[[], object], *, number: int = 50) -> tuple[int, float]:
+    """Return the peak bytes allocated by one call of ``func`` and the bytes kept per call.
+
+    Measured with tracemalloc after a warm-up call, so import time caches are not counted.
+    """
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            func()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start, (after - before) / number
+
+
+def report(name: str, ops: float, baseline: float | None = None, memory: tuple[int, float] | None = None) -> None:
+    """Print one result line, optionally with the speed-up against ``baseline`` and the allocations."""
+    line = f"{name:<48} {ops:>14,.0f} ops/s"
+    if baseline:
+        line += f"   x{ops / baseline:.2f}"
+    if memory:
+        line += f"   peak {memory[0] / 1024:>9,.1f} KiB   kept {memory[1]:>8,.0f} B/op"
+    print(line)  # noqa: T201
+
+
+class FakeConfigEntry:
+    """The parts of a ConfigEntry read by the client."""
+
+    def __init__(self, options: dict[str, Any] | None = None, entry_id: str = "benchmark") -> None:
+        """Initialize the entry."""
+        self.entry_id = entry_id
+        self.data: dict[str, Any] = {}
+        self.options: dict[str, Any] = options or {}
+
+
+class FakeHass:
+    """The parts of HomeAssistant used while push messages are processed.
+
+    Tasks and executor jobs are not run: the benchmarks time the synchronous ingest path only.
+    Must be created inside a running event loop.
+    """
+
+    def __init__(self, config_dir: Path | None = None) -> None:
+        """Initialize the fake instance."""
+        self.loop = asyncio.get_running_loop()
+        self.data: dict[str, Any] = {}
+        self.config = types.SimpleNamespace(path=lambda *parts: str(Path(config_dir or REPO_ROOT, *parts)))
+        self.bus = types.SimpleNamespace(async_listen_once=lambda *args: None)
+        self.created_tasks = 0
+
+    def async_create_task(self, target, *args, **kwargs) -> None:
+        """Drop the coroutine."""
+        self.created_tasks += 1
+        if asyncio.iscoroutine(target):
+            target.close()
+
+    def async_add_executor_job(self, target, *args) -> asyncio.Future:
+        """Return a future that never runs the job."""
+        return self.loop.create_future()
@@ -0,0 +1,351 @@
+"""Generate synthetic vepUpdates / vehicle_status_updates traffic for N cars and M attributes.
+
+Values are built from the vehicle_events_pb2 descriptors: enum attributes take states the
+integration knows from vsu_enums, numeric attributes stay in plausible ranges and the car
+position drifts. Every car starts with a full update; after that each message is a full update
+with probability --full-ratio, otherwise a partial update of --partial-size changed attributes.
+
+The messages can be written as capture files (the format of the debug file capture option,
+readable by bench_ingest.py --messages and bench_proto_diag.py --messages) or fed in-process
+to Client.on_data (homeassistant is stubbed by common.py if it is not installed).
+
+Usage: python scripts/benchmarks/push_generator.py [--cars N] [--attributes M] [--count C]
+       [--rate R] [--full-ratio F] [--partial-size K] [--type TYPE] (--out DIR | --feed)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator
+import inspect
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any
+
+from common import FakeConfigEntry, FakeHass, load_component
+
+load_component()
+
+from google.protobuf.descriptor import Descriptor, FieldDescriptor  # noqa: E402
+from google.protobuf.json_format import ParseDict, ParseError  # noqa: E402
+
+from custom_components.mbapi2020.proto import vehicle_events_pb2  # noqa: E402
+from custom_components.mbapi2020.vsu_enums import VSU_ENUM_VALUE_TO_INT  # noqa: E402
+from custom_components.mbapi2020.vsu_helper import _VSU_FIELDS, normalize_vsu_update  # noqa: E402
+
+MESSAGE_TYPES = ("vepUpdates", "vehicle_status_updates")
+# File name prefixes used by Client._write_debug_output
+CAPTURE_PREFIXES = {"vepUpdates": "vep", "vehicle_status_updates": "vsu"}
+
+_VSU_DESCRIPTOR = vehicle_events_pb2.VehicleStatusUpdate.DESCRIPTOR
+_REPEATED = FieldDescriptor.LABEL_REPEATED
+
+# Legacy attribute name -> (low, high) for numeric values
+VALUE_RANGES: dict[str, tuple[float, float]] = {
+    "soc": (5, 100),
+    "tanklevelpercent": (5, 100),
+    "gasTankLevelPercent": (5, 100),
+    "rangeelectric": (10, 550),
+    "rangeliquid": (10, 900),
+    "positionHeading": (0, 359),
+    "endofchargetime": (0, 1439),
+    "auxheattime1": (0, 1439),
+    "auxheattime2": (0, 1439),
+    "auxheattime3": (0, 1439),
+    "precondDuration": (0, 60),
+    "tirepressureFrontLeft": (200, 300),
+    "tirepressureFrontRight": (200, 300),
+    "tirepressureRearLeft": (200, 300),
+    "tirepressureRearRight": (200, 300),
+}
+DEFAULT_INT_RANGE = (0, 100)
+DEFAULT_DOUBLE_RANGE = (0.0, 100.0)
+# Attributes every generated car carries, whatever the mix
+CORE_ATTRIBUTES = ("odo", "positionLat", "positionLong", "soc", "doorlockstatusvehicle", "ignitionstate")
+_NESTED_DEPTH = 3
+
+
+def _known_enum_numbers(enum_type) -> list[int]:
+    """Return the enum numbers the integration maps by name, else all but the unspecified default."""
+    known = [value.number for value in enum_type.values if VSU_ENUM_VALUE_TO_INT.get(value.name) == value.number]
+    if any(known):
+        return known
+    return [value.number for value in enum_type.values if value.number] or [0]
+
+
+class CarState:
+    """Latest status of one simulated car."""
+
+    def __init__(self, vin: str, attributes: list[str], rnd: random.Random) -> None:
+        """Initialize the car with a value for every attribute."""
+        self.vin = vin
+        self.attributes = attributes
+        self.odo = rnd.randint(1_000, 150_000)
+        self.position = (48.7 + rnd.uniform(-0.5, 0.5), 9.1 + rnd.uniform(-0.5, 0.5))
+        self.update = vehicle_events_pb2.VehicleStatusUpdate(fin_or_vin=vin)
+
+
+class PushGenerator:
+    """Build a reproducible stream of push messages for a fleet of simulated cars."""
+
+    def __init__(
+        self,
+        cars: int = 1,
+        *,
+        attributes: int | list[str] | None = None,
+        partial_size: int = 4,
+        full_ratio: float = 0.02,
+        msg_type: str = "vehicle_status_updates",
+        rate: float = 10.0,
+        seed: int | None = 0,
+        start_ms: int | None = None,
+    ) -> None:
+        """Initialize the fleet.
+
+        attributes is the number of attributes per car (a random mix that always contains
+        CORE_ATTRIBUTES) or a list of legacy attribute names; None takes all of them.
+        msg_type is one of MESSAGE_TYPES or "mixed". rate is messages per second and drives
+        the timestamps in the messages.
+        """
+        if msg_type not in (*MESSAGE_TYPES, "mixed"):
+            raise ValueError(f"unknown message type {msg_type}")
+        self._rnd = random.Random(seed)
+        self._partial_size = max(1, partial_size)
+        self._full_ratio = full_ratio
+        self._msg_type = msg_type
+        self._interval_ms = 1000 / rate if rate > 0 else 0
+        self._clock_ms = float(start_ms if start_ms is not None else int(time.time() * 1000))
+        self._sequence_numbers = dict.fromkeys(MESSAGE_TYPES, 0)
+        # legacy attribute name -> VehicleStatusUpdate field
+        self._fields = {plan.legacy_key: _VSU_DESCRIPTOR.fields_by_name[name] for name, plan in _VSU_FIELDS.items()}
+
+        self.cars: list[CarState] = []
+        for index in range(cars):
+            car = CarState(f"W1KSIM{index:011d}", self._attribute_mix(attributes), self._rnd)
+            self._set_attributes(car, car.attributes)
+            self.cars.append(car)
+        self._started: set[str] = set()
+
+    def _attribute_mix(self, attributes: int | list[str] | None) -> list[str]:
+        names = sorted(self._fields)
+        if attributes is None:
+            return names
+        if isinstance(attributes, list):
+            unknown = set(attributes) - set(self._fields)
+            if unknown:
+                raise ValueError(f"unknown attributes: {', '.join(sorted(unknown))}")
+            return attributes
+        core = [name for name in CORE_ATTRIBUTES if name in self._fields]
+        others = [name for name in names if name not in core]
+        return core + self._rnd.sample(others, max(0, min(len(others), attributes - len(core))))
+
+    def _scalar(self, field: FieldDescriptor, legacy_key: str) -> Any:
+        if field.type == FieldDescriptor.TYPE_ENUM:
+            return self._rnd.choice(_known_enum_numbers(field.enum_type))
+        if field.type == FieldDescriptor.TYPE_BOOL:
+            return self._rnd.random() < 0.5
+        if field.type == FieldDescriptor.TYPE_STRING:
+            return f"{legacy_key}-{self._rnd.randint(0, 9)}"
+        if field.type == FieldDescriptor.TYPE_BYTES:
+            return b"\x00"
+        low, high = VALUE_RANGES.get(legacy_key, DEFAULT_DOUBLE_RANGE)
+        if field.cpp_type in (FieldDescriptor.CPPTYPE_DOUBLE, FieldDescriptor.CPPTYPE_FLOAT):
+            return round(self._rnd.uniform(low, high), 1)
+        low, high = VALUE_RANGES.get(legacy_key, DEFAULT_INT_RANGE)
+        return self._rnd.randint(int(low), int(high))
+
+    def _fill(self, message, descriptor: Descriptor, legacy_key: str, depth: int) -> None:
+        """Set every field of a nested value message."""
+        for field in descriptor.fields:
+            if field.message_type is not None:
+                if field.message_type.GetOptions().map_entry or depth >= _NESTED_DEPTH:
+                    continue
+                if field.message_type.full_name == "google.protobuf.Timestamp":
+                    getattr(message, field.name).FromMilliseconds(int(self._clock_ms))
+                elif field.label == _REPEATED:
+                    for _ in range(self._rnd.randint(1, 2)):
+                        self._fill(getattr(message, field.name).add(), field.message_type, legacy_key, depth + 1)
+                else:
+                    self._fill(getattr(message, field.name), field.message_type, legacy_key, depth + 1)
+            elif field.label == _REPEATED:
+                getattr(message, field.name).extend(
+                    self._scalar(field, legacy_key) for _ in range(self._rnd.randint(1, 2))
+                )
+            else:
+                setattr(message, field.name, self._scalar(field, legacy_key))
+
+    def _value(self, car: CarState, legacy_key: str, value_field: FieldDescriptor) -> Any:
+        match legacy_key:
+            case "odo":
+                car.odo += self._rnd.randint(0, 3)
+                return car.odo
+            case "positionLat" | "positionLong":
+                lat, lon = car.position
+                car.position = (lat + self._rnd.uniform(-0.001, 0.001), lon + self._rnd.uniform(-0.001, 0.001))
+                return round(car.position[0] if legacy_key == "positionLat" else car.position[1], 6)
+        return self._scalar(value_field, legacy_key)
+
+    def _set_attributes(self, car: CarState, names: list[str]) -> None:
+        """Give the attributes a new value and timestamp in the car state."""
+        timestamp_ms = int(self._clock_ms)
+        for name in names:
+            field = self._fields[name]
+            attribute = getattr(car.update, field.name)
+            attribute.Clear()
+            attribute.metadata.timestamp.FromMilliseconds(timestamp_ms)
+            value_field = field.message_type.fields_by_name["value"]
+            if value_field.message_type is not None:
+                if value_field.label == _REPEATED:
+                    for _ in range(self._rnd.randint(1, 2)):
+                        self._fill(attribute.value.add(), value_field.message_type, name, 1)
+                else:
+                    self._fill(attribute.value, value_field.message_type, name, 1)
+            elif value_field.label == _REPEATED:
+                attribute.value.extend(self._scalar(value_field, name) for _ in range(self._rnd.randint(1, 2)))
+            else:
+                attribute.value = self._value(car, name, value_field)
+            if "unit" in field.message_type.fields_by_name:
+                attribute.unit = self._scalar(field.message_type.fields_by_name["unit"], name)
+            if "display_value" in field.message_type.fields_by_name and value_field.message_type is None:
+                attribute.display_value = str(attribute.value) if value_field.label != _REPEATED else ""
+
+    def _car_update(self, car: CarState, full_update: bool) -> vehicle_events_pb2.VehicleStatusUpdate:
+        if full_update:
+            update = vehicle_events_pb2.VehicleStatusUpdate()
+            update.CopyFrom(car.update)
+        else:
+            changed = self._rnd.sample(car.attributes, min(self._partial_size, len(car.attributes)))
+            self._set_attributes(car, changed)
+            update = vehicle_events_pb2.VehicleStatusUpdate(fin_or_vin=car.vin)
+            for name in changed:
+                field = self._fields[name]
+                getattr(update, field.name).CopyFrom(getattr(car.update, field.name))
+        update.full_update = full_update
+        return update
+
+    def _build_message(self, msg_type: str, updates: list[vehicle_events_pb2.VehicleStatusUpdate]):
+        self._sequence_numbers[msg_type] += 1
+        message = vehicle_events_pb2.PushMessage()
+        if msg_type == "vehicle_status_updates":
+            message.vehicle_status_updates.sequence_number = self._sequence_numbers[msg_type]
+            for update in updates:
+                message.vehicle_status_updates.vehicle_status_updates[update.fin_or_vin].CopyFrom(update)
+            return message
+
+        message.vepUpdates.sequence_number = self._sequence_numbers[msg_type]
+        for update in updates:
+            vep_update = message.vepUpdates.updates[update.fin_or_vin]
+            vep_update.vin = update.fin_or_vin
+            vep_update.full_update = update.full_update
+            vep_update.sequence_number = self._sequence_numbers[msg_type]
+            vep_update.emit_timestamp_in_ms = int(self._clock_ms)
+            for name, attribute in normalize_vsu_update(update)["attributes"].items():
+                # the VSU normalizer adds a plain "value" next to the typed one, VEP has no such field
+                try:
+                    ParseDict(attribute, vep_update.attributes[name], ignore_unknown_fields=True)
+                except ParseError:
+                    # a few nested values (temperature points) are shaped differently in VEP
+                    del vep_update.attributes[name]
+        return message
+
+    def messages(self, count: int) -> Iterator[tuple[float, vehicle_events_pb2.PushMessage]]:
+        """Yield (seconds since the first message, message) for count messages."""
+        first_ms = self._clock_ms
+        for _ in range(count):
+            car = self._rnd.choice(self.cars)
+            full_update = car.vin not in self._started or self._rnd.random() < self._full_ratio
+            self._started.add(car.vin)
+            msg_type = self._msg_type if self._msg_type != "mixed" else self._rnd.choice(MESSAGE_TYPES)
+            message = self._build_message(msg_type, [self._car_update(car, full_update)])
+            yield (self._clock_ms - first_ms) / 1000, message
+            self._clock_ms += self._interval_ms
+
+    def write_captures(self, folder: Path, count: int) -> int:
+        """Write count messages as capture files named like the debug file capture; return the bytes written."""
+        folder.mkdir(parents=True, exist_ok=True)
+        written = 0
+        last_name = None
+        for _, message in self.messages(count):
+            stamp = int(self._clock_ms)
+            name = f"{CAPTURE_PREFIXES[message.WhichOneof('msg')]}{stamp}"
+            while name == last_name or (folder / name).exists():
+                stamp += 1
+                name = f"{CAPTURE_PREFIXES[message.WhichOneof('msg')]}{stamp}"
+            last_name = name
+            data = message.SerializeToString()
+            (folder / name).write_bytes(data)
+            written += len(data)
+        return written
+
+    async def feed(self, handler: Callable[[Any], Any], count: int, realtime: bool = False) -> None:
+        """Hand count messages to handler (awaited if it returns an awaitable), paced by rate if realtime."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for offset, message in self.messages(count):
+            if realtime and (delay := started + offset - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            result = handler(message)
+            if inspect.isawaitable(result):
+                await result
+
+
+async def _feed_client(generator: PushGenerator, count: int, realtime: bool) -> None:
+    """Feed the messages to Client.on_data and print throughput and stage timings."""
+    from custom_components.mbapi2020.client import Client  # noqa: PLC0415 - imports homeassistant
+
+    async def _dataload_complete() -> None:
+        pass
+
+    hass = FakeHass()
+    client = Client(hass, session=None, config_entry=FakeConfigEntry({"push_coalesce_window": 0}), region="Europe")
+    client._Client__lock = threading.RLock()  # as set up outside of WSL
+    client._on_dataload_complete = _dataload_complete
+    client.pipeline_stats.enabled = True
+
+    started = time.perf_counter()
+    await generator.feed(client.on_data, count, realtime)
+    elapsed = time.perf_counter() - started
+
+    print(f"{count} messages for {len(client.cars)} cars in {elapsed:.2f} s: {count / elapsed:,.0f} msg/s")  # noqa: T201
+    for name, line in client.pipeline_stats.summary().items():
+        print(f"{name}: {line}")  # noqa: T201
+
+
+def main() -> None:
+    """Generate messages."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cars", type=int, default=3)
+    parser.add_argument("--attributes", type=int, help="attributes per car (default: all)")
+    parser.add_argument("--count", type=int, default=1000, help="number of messages")
+    parser.add_argument("--rate", type=float, default=10.0, help="messages per second")
+    parser.add_argument("--full-ratio", type=float, default=0.02, help="share of full updates after the first")
+    parser.add_argument("--partial-size", type=int, default=4, help="changed attributes per partial update")
+    parser.add_argument("--type", choices=(*MESSAGE_TYPES, "mixed"), default="vehicle_status_updates")
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", type=Path, help="write capture files to this folder")
+    target.add_argument("--feed", action="store_true", help="feed the messages to Client.on_data")
+    parser.add_argument("--realtime", action="store_true", help="with --feed, pace the messages by --rate")
+    args = parser.parse_args()
+
+    generator = PushGenerator(
+        cars=args.cars,
+        attributes=args.attributes,
+        partial_size=args.partial_size,
+        full_ratio=args.full_ratio,
+        msg_type=args.type,
+        rate=args.rate,
+        seed=args.seed,
+    )
+    if args.out:
+        written = generator.write_captures(args.out, args.count)
+        print(f"{args.count} messages, {written:,} bytes written to {args.out}")  # noqa: T201
+    else:
+        asyncio.run(_feed_client(generator, args.count, args.realtime))
+
+
+if __name__ == "__main__":
+    main()
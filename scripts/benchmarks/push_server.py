@@ -0,0 +1,484 @@
+"""Local stand-in for the push websocket endpoint (/v2/ws) with acks, resends and faults.
+
+Completes the websocket handshake and streams binary PushMessages from push_generator at
+--rate messages per second (0: as fast as the client takes them). Every frame stays in flight
+until the client acks its sequence number; frames not acked within --ack-timeout are sent
+again, up to --max-resends times, after that they count as lost. Frames in flight when a
+connection drops are resent on the next one, as the backend redelivers them.
+
+Faults: --disconnect-every drops the connection (TCP abort or close frame), --stall-every and
+--stall-for stop frames and pongs for a while, --block-429 answers the first handshakes and
+those after each dropped connection with HTTP 429. --max-in-flight limits the unacked frames
+(a slow consumer), with --drop-slow-consumer the client is disconnected instead of waited for.
+
+Every --report-every seconds and on exit the server logs throughput, ack latency, resends,
+lost frames and the reconnect latency (connection lost until the next successful handshake).
+
+Point the integration at the server with the burp redirector (--cert/--key for wss, as
+https-ws-case-429.py) or by setting WEBSOCKET_API_BASE in const.py to ws://127.0.0.1:8001/v2/ws.
+
+Usage: python scripts/benchmarks/push_server.py [--port P] [--cars N] [--rate R] [--duration S]
+       [--disconnect-every S] [--stall-every S --stall-for S] [--block-429 N] [--max-in-flight N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+from collections import deque
+import contextlib
+import hashlib
+import logging
+import random
+import ssl
+import struct
+import sys
+import time
+
+from common import load_component
+
+load_component()
+
+from push_generator import MESSAGE_TYPES, PushGenerator  # noqa: E402
+
+from custom_components.mbapi2020.proto import client_pb2, vehicle_events_pb2  # noqa: E402
+
+HTTP_SERVER_IP = "0.0.0.0"
+HTTP_SERVER_PORT = 8001
+WS_PATH = "/v2/ws"
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+LOGGER = logging.getLogger(__package__)
+
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# ClientMessage member acknowledging each streamed message type
+ACK_FIELDS = {
+    "vepUpdates": "acknowledge_vep_updates_by_vin",
+    "vehicle_status_updates": "acknowledge_vehicle_status_updates",
+    "service_status_updates": "acknowledge_service_status_update",
+}
+_ACK_TYPES = {ack_field: msg_type for msg_type, ack_field in ACK_FIELDS.items()}
+
+
+class ConnectionDropped(Exception):
+    """A fault ended the connection."""
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Read one websocket frame and return (opcode, unmasked payload)."""
+    head = await reader.readexactly(2)
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if head[1] & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask and length:
+        key = (mask * (length // 4 + 1))[:length]
+        payload = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+    return opcode, payload
+
+
+def encode_frame(opcode: int, payload: bytes) -> bytes:
+    """Return an unmasked server frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _percentile(ordered: list[float], share: float) -> float:
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+class InFlight:
+    """A frame waiting for its ack."""
+
+    def __init__(self, data: bytes, sent: float) -> None:
+        """Initialize the frame sent at sent."""
+        self.data = data
+        self.first_sent = sent
+        self.last_sent = sent
+        self.resends = 0
+
+
+class Stats:
+    """Counters of the whole run, plus a window of ack latencies."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.started = time.monotonic()
+        self.connections = 0
+        self.blocked = 0
+        self.disconnects: dict[str, int] = {}
+        self.sent = 0
+        self.resent = 0
+        self.acked = 0
+        self.duplicate_acks = 0
+        self.unknown_acks = 0
+        self.lost = 0
+        self.peak_in_flight = 0
+        self.ack_latencies: deque[float] = deque(maxlen=4096)
+        self.reconnect_latencies: list[float] = []
+        self.disconnected_at: float | None = None
+        self._last_report = (self.started, 0)
+
+    def line(self, in_flight: int) -> str:
+        """Return the counters as one log line, with the ack rate since the last line."""
+        now = time.monotonic()
+        since, acked_before = self._last_report
+        self._last_report = (now, self.acked)
+        rate = (self.acked - acked_before) / (now - since) if now > since else 0.0
+        ordered = sorted(self.ack_latencies)
+        reconnect = (
+            f"reconnect last {self.reconnect_latencies[-1]:.2f} s max {max(self.reconnect_latencies):.2f} s"
+            if self.reconnect_latencies
+            else "reconnect -"
+        )
+        return (
+            f"connections {self.connections} (429: {self.blocked}) | sent {self.sent} resent {self.resent} "
+            f"acked {self.acked} in flight {in_flight} lost {self.lost} | {rate:,.1f} acks/s | "
+            f"ack p50 {_percentile(ordered, 0.5) * 1000:.1f} ms p95 {_percentile(ordered, 0.95) * 1000:.1f} ms | "
+            f"{reconnect}"
+        )
+
+    def summary(self, in_flight: int) -> str:
+        """Return the totals of the run."""
+        elapsed = time.monotonic() - self.started
+        disconnects = ", ".join(f"{reason} {count}" for reason, count in sorted(self.disconnects.items())) or "-"
+        reconnects = sorted(self.reconnect_latencies)
+        return (
+            f"{elapsed:.1f} s: {self.acked / elapsed if elapsed else 0:,.1f} acked msg/s sustained, "
+            f"{self.sent} sent, {self.resent} resent, {self.acked} acked, {self.lost} lost, "
+            f"{in_flight} unacked at exit, {self.duplicate_acks} duplicate and {self.unknown_acks} unknown acks, "
+            f"peak in flight {self.peak_in_flight} | disconnects: {disconnects} | "
+            f"reconnect p50 {_percentile(reconnects, 0.5):.2f} s max {reconnects[-1] if reconnects else 0:.2f} s"
+        )
+
+
+class PushServer:
+    """Serves one push stream; a reconnecting client continues where the last connection stopped."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize the stream and the fault settings."""
+        self.args = args
+        self.stats = Stats()
+        self.generator = PushGenerator(
+            cars=args.cars,
+            attributes=args.attributes,
+            partial_size=args.partial_size,
+            full_ratio=args.full_ratio,
+            msg_type=args.type,
+            rate=args.rate,
+            seed=args.seed,
+        )
+        self._messages = self.generator.messages(sys.maxsize)
+        self._rnd = random.Random(args.seed)
+        self._ack_only_sequence = 0
+        # (ack member, sequence number) -> frame, in send order
+        self.in_flight: dict[tuple[str, int], InFlight] = {}
+        self._block_remaining = args.block_429
+        self._stalled = False
+        self._active: asyncio.StreamWriter | None = None
+
+    def _next_frame(self) -> tuple[tuple[str, int], bytes]:
+        if self.args.ack_only_ratio and self._rnd.random() < self.args.ack_only_ratio:
+            self._ack_only_sequence += 1
+            message = vehicle_events_pb2.PushMessage()
+            message.service_status_updates.sequence_number = self._ack_only_sequence
+        else:
+            _, message = next(self._messages)
+        msg_type = message.WhichOneof("msg")
+        key = (ACK_FIELDS[msg_type], getattr(message, msg_type).sequence_number)
+        return key, message.SerializeToString()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the handshake and run the connection until it ends."""
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        path = lines[0].split(" ")[1] if len(lines[0].split(" ")) > 1 else ""
+        headers = {
+            name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:])
+        }
+
+        if path.split("?")[0] != WS_PATH or "sec-websocket-key" not in headers:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await self._close(writer)
+            return
+        if self._block_remaining > 0:
+            self._block_remaining -= 1
+            self.stats.blocked += 1
+            LOGGER.info("Answering handshake with 429 (%s more)", self._block_remaining)
+            writer.write(b"HTTP/1.1 429 Too Many Requests\r\nContent-Length: 0\r\n\r\n")
+            await self._close(writer)
+            return
+
+        accept = base64.b64encode(hashlib.sha1((headers["sec-websocket-key"] + WS_GUID).encode()).digest()).decode()
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+
+        if self._active is not None:
+            LOGGER.warning("New connection replaces the active one")
+            self._active.transport.abort()
+        self._active = writer
+        self.stats.connections += 1
+        if self.stats.disconnected_at is not None:
+            self.stats.reconnect_latencies.append(time.monotonic() - self.stats.disconnected_at)
+            self.stats.disconnected_at = None
+        LOGGER.info("Client connected (%s, %d frames to resend)", headers.get("user-agent", "-"), len(self.in_flight))
+
+        tasks = [
+            asyncio.create_task(self._receive(reader, writer)),
+            asyncio.create_task(self._send(writer)),
+            asyncio.create_task(self._faults(writer)),
+        ]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        reason = "client"
+        for task in done:
+            if isinstance(error := task.exception(), ConnectionDropped):
+                reason = str(error)
+            elif error is not None and not isinstance(error, (ConnectionError, asyncio.IncompleteReadError)):
+                LOGGER.error("Connection failed: %s (%s)", error, type(error).__name__)
+                reason = "error"
+        self.stats.disconnects[reason] = self.stats.disconnects.get(reason, 0) + 1
+        if self._active is writer:
+            self._active = None
+            self.stats.disconnected_at = time.monotonic()
+            if reason != "client":
+                self._block_remaining = self.args.block_429
+        LOGGER.info("Connection ended (%s), %d frames in flight", reason, len(self.in_flight))
+        if not writer.is_closing():
+            await self._close(writer)
+
+    async def _close(self, writer: asyncio.StreamWriter) -> None:
+        with contextlib.suppress(ConnectionError, ssl.SSLError):
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+    async def _receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read client frames: acks, pings and the close handshake."""
+        while True:
+            opcode, payload = await read_frame(reader)
+            if opcode == OP_CLOSE:
+                writer.write(encode_frame(OP_CLOSE, payload[:2]))
+                await writer.drain()
+                return
+            if opcode == OP_PING:
+                # a stalled server does not answer pings either
+                while self._stalled:
+                    await asyncio.sleep(0.05)
+                writer.write(encode_frame(OP_PONG, payload))
+            elif opcode == OP_BINARY:
+                self._ack(payload)
+
+    def _ack(self, payload: bytes) -> None:
+        message = client_pb2.ClientMessage()
+        try:
+            message.ParseFromString(payload)
+        except Exception:  # noqa: BLE001 - count it, the client sent something else
+            self.stats.unknown_acks += 1
+            return
+        member = message.WhichOneof("msg")
+        if member not in _ACK_TYPES:
+            LOGGER.debug("Client message %s", member)
+            return
+        key = (member, getattr(message, member).sequence_number)
+        if (frame := self.in_flight.pop(key, None)) is None:
+            self.stats.duplicate_acks += 1
+            return
+        self.stats.acked += 1
+        self.stats.ack_latencies.append(time.monotonic() - frame.first_sent)
+
+    async def _send(self, writer: asyncio.StreamWriter) -> None:
+        """Resend what the last connection left unacked, then stream new frames at --rate."""
+        args = self.args
+        loop = asyncio.get_running_loop()
+        for frame in list(self.in_flight.values()):
+            await self._write(writer, frame, resend=True)
+
+        interval = 1 / args.rate if args.rate > 0 else 0
+        next_send = loop.time()
+        while True:
+            while self._stalled:
+                await asyncio.sleep(0.05)
+                next_send = loop.time()
+            await self._resend_expired(writer)
+
+            if args.max_in_flight and len(self.in_flight) >= args.max_in_flight:
+                if args.drop_slow_consumer:
+                    raise ConnectionDropped("slow consumer")
+                await asyncio.sleep(0.01)
+                continue
+
+            key, data = self._next_frame()
+            frame = InFlight(data, time.monotonic())
+            self.in_flight[key] = frame
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, len(self.in_flight))
+            await self._write(writer, frame)
+
+            next_send += interval
+            if (delay := next_send - loop.time()) > 0:
+                await asyncio.sleep(delay)
+            else:
+                # keep the acks flowing when the client falls behind the rate
+                next_send = loop.time()
+                await asyncio.sleep(0)
+
+    async def _resend_expired(self, writer: asyncio.StreamWriter) -> None:
+        now = time.monotonic()
+        expired = [
+            (key, frame) for key, frame in self.in_flight.items() if now - frame.last_sent >= self.args.ack_timeout
+        ]
+        for key, frame in expired:
+            if frame.resends >= self.args.max_resends:
+                del self.in_flight[key]
+                self.stats.lost += 1
+                LOGGER.warning("Frame %s %s not acked after %d resends, lost", *key, frame.resends)
+                continue
+            await self._write(writer, frame, resend=True)
+
+    async def _write(self, writer: asyncio.StreamWriter, frame: InFlight, resend: bool = False) -> None:
+        if resend:
+            frame.resends += 1
+            frame.last_sent = time.monotonic()
+            self.stats.resent += 1
+        else:
+            self.stats.sent += 1
+        writer.write(encode_frame(OP_BINARY, frame.data))
+        await writer.drain()
+
+    async def _faults(self, writer: asyncio.StreamWriter) -> None:
+        """Stall and drop the connection on the configured schedule."""
+        args = self.args
+        loop = asyncio.get_running_loop()
+        connected = loop.time()
+        next_stall = connected + args.stall_every if args.stall_every else None
+        disconnect_at = connected + args.disconnect_every if args.disconnect_every else None
+        while True:
+            await asyncio.sleep(0.1)
+            now = loop.time()
+            if next_stall is not None and now >= next_stall:
+                LOGGER.info("Stalling for %.1f s", args.stall_for)
+                self._stalled = True
+                try:
+                    await asyncio.sleep(args.stall_for)
+                finally:
+                    self._stalled = False
+                next_stall = loop.time() + args.stall_every
+            if disconnect_at is not None and now >= disconnect_at:
+                if args.disconnect_mode == "close":
+                    writer.write(encode_frame(OP_CLOSE, struct.pack("!H", 1001)))
+                    await writer.drain()
+                else:
+                    writer.transport.abort()
+                raise ConnectionDropped(f"disconnect ({args.disconnect_mode})")
+
+
+async def report(server: PushServer, every: float) -> None:
+    """Log the counters periodically."""
+    while True:
+        await asyncio.sleep(every)
+        LOGGER.info(server.stats.line(len(server.in_flight)))
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Serve until --duration has passed or the task is cancelled."""
+    context = None
+    if args.cert:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile=args.cert, keyfile=args.key)
+
+    server = PushServer(args)
+    tcp_server = await asyncio.start_server(server.handle, args.host, args.port, ssl=context)
+    LOGGER.debug("Server started %s://%s:%s%s", "wss" if context else "ws", args.host, args.port, WS_PATH)
+    reporter = asyncio.create_task(report(server, args.report_every))
+    try:
+        async with tcp_server:
+            if args.duration:
+                await asyncio.sleep(args.duration)
+            else:
+                await tcp_server.serve_forever()
+    finally:
+        reporter.cancel()
+        if server._active is not None:
+            server._active.transport.abort()
+        LOGGER.info(server.stats.summary(len(server.in_flight)))
+
+
+def set_logger():
+    """Set Logger properties."""
+
+    fmt = "%(asctime)s.%(msecs)03d %(levelname)s (%(threadName)s) [%(name)s] %(message)s"
+    LOGGER.setLevel(logging.DEBUG)
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(logging.DEBUG)
+    formatter = logging.Formatter(fmt)
+    handler.setFormatter(formatter)
+    LOGGER.addHandler(handler)
+
+
+def main() -> None:
+    """Run the server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HTTP_SERVER_IP)
+    parser.add_argument("--port", type=int, default=HTTP_SERVER_PORT)
+    parser.add_argument("--cert", help="certificate for wss, e.g. ../local/selfsigned.crt")
+    parser.add_argument("--key", help="key of --cert")
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run, 0 runs until interrupted")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between counter lines")
+    stream = parser.add_argument_group("stream")
+    stream.add_argument("--cars", type=int, default=3)
+    stream.add_argument("--attributes", type=int, help="attributes per car (default: all)")
+    stream.add_argument("--rate", type=float, default=10.0, help="messages per second, 0 sends as fast as possible")
+    stream.add_argument("--full-ratio", type=float, default=0.02, help="share of full updates after the first")
+    stream.add_argument("--partial-size", type=int, default=4, help="changed attributes per partial update")
+    stream.add_argument("--type", choices=(*MESSAGE_TYPES, "mixed"), default="vehicle_status_updates")
+    stream.add_argument("--ack-only-ratio", type=float, default=0.0, help="share of service_status_updates frames")
+    stream.add_argument("--seed", type=int, default=0)
+    acks = parser.add_argument_group("acks")
+    acks.add_argument("--ack-timeout", type=float, default=5.0, help="seconds until an unacked frame is resent")
+    acks.add_argument("--max-resends", type=int, default=3, help="resends before a frame counts as lost")
+    acks.add_argument("--max-in-flight", type=int, default=0, help="unacked frames before sending pauses, 0: no limit")
+    acks.add_argument("--drop-slow-consumer", action="store_true", help="disconnect at --max-in-flight instead")
+    faults = parser.add_argument_group("faults")
+    faults.add_argument("--disconnect-every", type=float, default=0, help="seconds per connection, 0: never")
+    faults.add_argument("--disconnect-mode", choices=("abort", "close"), default="abort")
+    faults.add_argument("--stall-every", type=float, default=0, help="seconds between stalls, 0: never")
+    faults.add_argument("--stall-for", type=float, default=30.0, help="length of a stall in seconds")
+    faults.add_argument("--block-429", type=int, default=0, help="handshakes answered with 429 after a fault")
+    args = parser.parse_args()
+    if args.cert and not args.key:
+        parser.error("--cert needs --key")
+
+    set_logger()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()